@@ -3,19 +3,23 @@
 from . import (
     breaker_critic,
     breaker_placer,
+    bundle_expander,
     cover_tab_writer,
     doc_lint_guard,
     enclosure_solver,
     estimate_formatter,
     evidence,
+    pricing,
 )
 
 __all__ = [
     "breaker_critic",
     "breaker_placer",
+    "bundle_expander",
     "cover_tab_writer",
     "doc_lint_guard",
     "enclosure_solver",
     "estimate_formatter",
     "evidence",
+    "pricing",
 ]
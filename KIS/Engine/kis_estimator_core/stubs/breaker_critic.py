@@ -6,12 +6,14 @@ from typing import Any, Dict, List
 
 import polars as pl
 
+from ..util import profiling
 from . import evidence
 
 
 THRESHOLD_BALANCE = 0.05
 
 
+@profiling.profiled("breaker_critic")
 def review(placement_result: Dict[str, Any], case_id: str = evidence.CASE_DEFAULT) -> Dict[str, Any]:
     if "placements" not in placement_result:
         raise ValueError("Breaker placements missing 'placements'")
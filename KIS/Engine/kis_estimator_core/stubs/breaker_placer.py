@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Mapping
 import polars as pl
 from ortools.sat.python import cp_model
 
+from ..util import profiling
 from . import evidence
 
 
@@ -155,6 +156,7 @@ def _check_clearance(layout: List[Dict[str, Any]]) -> int:
     return violations
 
 
+@profiling.profiled("breaker_placer")
 def place(plan: Dict[str, Any], request: Mapping[str, Any], case_id: str = evidence.CASE_DEFAULT) -> Dict[str, Any]:
     if "slot_unit" not in plan:
         raise ValueError("Enclosure plan missing 'slot_unit'")
@@ -0,0 +1,181 @@
+"""Bundle expansion stage applying ``rules.bundles`` to a bill of materials."""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import polars as pl
+
+from ..util import guard, profiling, rules_snapshot
+from . import evidence
+
+_INDEX_LOCK = threading.Lock()
+_INDEX_CACHE: Dict[Path | None, Tuple[object, "BundleIndex"]] = {}
+
+
+@dataclass(frozen=True)
+class Addition:
+    """One auxiliary item a trigger category pulls in, with the rule chain that led to it."""
+
+    item_id: str
+    qty: float  # per trigger unit, multiplied along nested bundles
+    rule_id: str
+    chain: Tuple[str, ...]
+    flags: Tuple[str, ...]
+
+
+class BundleCycleError(ValueError):
+    """Raised when nested bundles add an item that triggers a bundle already on the path."""
+
+
+class BundleIndex:
+    """Bundle rules keyed by trigger category, with each category's nested expansion flattened once."""
+
+    def __init__(self, rules: Dict[str, Any]) -> None:
+        catalog = rules.get("catalog", {})
+        self.item_category: Dict[str, str] = {}
+        for section in catalog.values():
+            for item in section.get("items", []) if isinstance(section, dict) else []:
+                key = item.get("id") or item.get("model")
+                if key and item.get("category"):
+                    self.item_category[key] = item["category"]
+        self.by_category: Dict[str, List[Dict[str, Any]]] = {}
+        for rule in rules.get("rules", {}).get("bundles", []):
+            self.by_category.setdefault(rule["if_item_category"], []).append(rule)
+        self.rules_by_id = {rule["id"]: rule for bundle in self.by_category.values() for rule in bundle}
+        self._closure: Dict[str, List[Addition]] = {}
+        self.labor_per_unit: Dict[str, float] = {}
+        for category in self.by_category:
+            self.closure(category)  # [REAL-LOGIC] flatten and cycle-check every trigger up front
+
+    def closure(self, category: str, path: Tuple[str, ...] = ()) -> List[Addition]:
+        """Every addition one unit of ``category`` implies, nested bundles included."""
+        cached = self._closure.get(category)
+        if cached is not None:
+            return cached
+        if category in path:
+            cycle = " -> ".join(path[path.index(category):] + (category,))
+            raise BundleCycleError(f"Bundle cycle through categories: {cycle}")
+        additions: List[Addition] = []
+        labor = 0.0
+        for rule in self.by_category.get(category, []):
+            labor += float(rule.get("labor_add_per_item_won", 0))
+            for add in rule.get("then_add", []):
+                item_id = add["item_id"]
+                qty = float(add.get("qty_per", 1))
+                additions.append(Addition(item_id, qty, rule["id"], (rule["id"],), tuple(add.get("flags", []))))
+                nested_category = self.item_category.get(item_id)
+                if nested_category in self.by_category:
+                    nested_additions = self.closure(nested_category, path + (category,))
+                    labor += qty * self.labor_per_unit[nested_category]
+                    for nested in nested_additions:
+                        additions.append(Addition(
+                            nested.item_id, qty * nested.qty, nested.rule_id, (rule["id"],) + nested.chain, nested.flags,
+                        ))
+        self._closure[category] = additions
+        self.labor_per_unit[category] = labor
+        return additions
+
+    def category_of(self, line: Dict[str, Any]) -> Optional[str]:
+        return line.get("category") or self.item_category.get(line.get("item_id") or line.get("id") or "")
+
+
+def load_index(rules_path: Path | None = None) -> BundleIndex:
+    """Index the rules snapshot's ai_estimation_core, or a rules file given explicitly."""
+    if rules_path is None:
+        snapshot = rules_snapshot.load()
+        key, version = None, snapshot["digest"]
+    else:
+        key = Path(rules_path)
+        guard.ensure_whitelisted(key)
+        version = key.stat().st_mtime_ns
+    with _INDEX_LOCK:
+        cached = _INDEX_CACHE.get(key)
+        if cached is None or cached[0] != version:
+            if key is None:
+                rules = snapshot["rules"]["ai_estimation_core"]
+            else:
+                with key.open("r", encoding="utf-8-sig") as handle:
+                    rules = json.load(handle)
+            cached = (version, BundleIndex(rules))
+            _INDEX_CACHE[key] = cached
+    return cached[1]
+
+
+def expand(bom: List[Dict[str, Any]], index: BundleIndex) -> Tuple[List[Dict[str, Any]], float]:
+    """Aggregate auxiliary lines for ``bom`` in one pass; returns (lines, added labor in won)."""
+    totals: Dict[Tuple[str, str, Tuple[str, ...]], Dict[str, Any]] = {}
+    labor = 0.0
+    for line in bom:
+        category = index.category_of(line)
+        if category not in index.by_category:
+            continue
+        qty = float(line.get("qty", 1))
+        source = line.get("item_id") or line.get("id") or category
+        labor += qty * index.labor_per_unit[category]
+        for addition in index.closure(category):
+            key = (addition.item_id, addition.rule_id, addition.chain)
+            entry = totals.get(key)
+            if entry is None:
+                entry = totals[key] = {
+                    "item_id": addition.item_id,
+                    "qty": 0.0,
+                    "rule_id": addition.rule_id,
+                    "chain": list(addition.chain),
+                    "flags": list(addition.flags),
+                    "trigger_category": category,
+                    "sources": {},
+                }
+            entry["qty"] += qty * addition.qty
+            entry["sources"][source] = entry["sources"].get(source, 0.0) + qty
+
+    lines = []
+    for entry in totals.values():
+        rule = index.rules_by_id[entry["rule_id"]]
+        via = " -> ".join(entry["chain"])
+        sources = ", ".join(f"{name} x{count:g}" for name, count in entry["sources"].items())
+        entry["explanations"] = [f"{via}: {entry['qty']:g} x {entry['item_id']} for {sources}"] + list(rule.get("explanations", []))
+        entry["rule_class"] = rule.get("class", "")
+        entry["sources"] = len(entry["sources"])
+        lines.append(entry)
+    return lines, labor
+
+
+@profiling.profiled("bundle_expander")
+def expand_bundles(
+    bom: List[Dict[str, Any]],
+    case_id: str = evidence.CASE_DEFAULT,
+    rules_path: Path | None = None,
+) -> Dict[str, Any]:
+    index = load_index(rules_path)
+    lines, labor = expand(bom, index)
+
+    payload = {
+        "bom_lines": len(bom),
+        "auxiliary_lines": lines,
+        "labor_add_won": round(labor, 2),
+        "rules_applied": sorted({line["rule_id"] for line in lines}),
+    }
+
+    table = pl.from_dicts(
+        [{key: line[key] for key in ("item_id", "qty", "rule_id", "trigger_category", "sources", "rule_class")} for line in lines]
+    ) if lines else pl.DataFrame({"item_id": [], "qty": [], "rule_id": []})
+
+    artefacts = evidence.write_stage(
+        "bundle_expander",
+        payload,
+        case_id=case_id,
+        inputs={"bom": {"lines": len(bom)}},
+        tables={"auxiliary_lines": table},
+    )
+    return {
+        "payload": payload,
+        "evidence": artefacts,
+        "logs": [
+            f"Bundle expander added {len(lines)} auxiliary lines",  # [REAL-LOGIC] one pass over the BOM
+        ],
+    }
@@ -7,9 +7,11 @@ from typing import Any, Dict
 
 import polars as pl
 
+from ..util import profiling
 from . import evidence
 
 
+@profiling.profiled("cover_tab_writer")
 def generate(formatter_payload: Dict[str, Any], case_id: str = evidence.CASE_DEFAULT) -> Dict[str, Any]:
     document = formatter_payload.get("document", {})
     totals = formatter_payload.get("totals", {})
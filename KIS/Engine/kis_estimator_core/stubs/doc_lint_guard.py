@@ -8,6 +8,7 @@ from typing import Any, Dict, List
 
 import polars as pl
 
+from ..util import profiling
 from . import evidence
 
 
@@ -42,6 +43,7 @@ def _contrast_ratio(foreground: str, background: str = "FFFFFF") -> float:
     return (lighter + 0.05) / (darker + 0.05)
 
 
+@profiling.profiled("doc_lint_guard")
 def inspect(formatter_payload: Dict[str, Any], cover_payload: Dict[str, Any], case_id: str = evidence.CASE_DEFAULT) -> Dict[str, Any]:
     issues: List[Dict[str, Any]] = []
 
@@ -2,18 +2,22 @@
 
 from __future__ import annotations
 
+import threading
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 import duckdb
 import polars as pl
 
-from ..util import guard
+from ..util import guard, profiling
 from . import evidence
 
 CATALOG_DIR = Path(__file__).resolve().parents[3] / "Templates" / "catalog"
 ENCLOSURE_CATALOG = CATALOG_DIR / "enclosures.csv"
 
+_CATALOG_LOCK = threading.Lock()
+_CATALOG_CACHE: Dict[Path, Tuple[int, pl.DataFrame]] = {}
+
 
 def _validate_request(request: Dict[str, Any]) -> None:
     required_keys = ["loads", "enclosure", "ip_min"]
@@ -40,9 +44,24 @@ def _loads_frame(loads: List[Dict[str, Any]]) -> pl.DataFrame:
     ])
 
 
-def _load_catalog() -> pl.DataFrame:
-    guard.ensure_whitelisted(ENCLOSURE_CATALOG)
-    return pl.read_csv(ENCLOSURE_CATALOG)
+def _load_catalog(catalog_path: Path | None = None) -> pl.DataFrame:
+    path = Path(catalog_path) if catalog_path is not None else ENCLOSURE_CATALOG
+    guard.ensure_whitelisted(path)
+    mtime_ns = path.stat().st_mtime_ns
+    with _CATALOG_LOCK:
+        cached = _CATALOG_CACHE.get(path)
+        if cached is None or cached[0] != mtime_ns:
+            # [REAL-LOGIC] reuse the parsed catalog until the CSV changes on disk
+            cached = (mtime_ns, pl.read_csv(path).rechunk())
+            _CATALOG_CACHE[path] = cached
+    # a shallow copy per caller: concurrent to_arrow() on one shared frame fails
+    # with "Already mutably borrowed"
+    return cached[1].clone()
+
+
+def warm_catalog(catalog_path: Path | None = None) -> int:
+    """Load the enclosure catalog ahead of a batch and return its row count."""
+    return _load_catalog(catalog_path).height
 
 
 def _ip_to_int(ip_code: str) -> int:
@@ -50,7 +69,12 @@ def _ip_to_int(ip_code: str) -> int:
     return int(digits or 0)
 
 
-def solve(request: Dict[str, Any], case_id: str = evidence.CASE_DEFAULT) -> Dict[str, Any]:
+@profiling.profiled("enclosure_solver")
+def solve(
+    request: Dict[str, Any],
+    case_id: str = evidence.CASE_DEFAULT,
+    catalog_path: Path | None = None,
+) -> Dict[str, Any]:
     _validate_request(request)
     loads = request["loads"]
     enclosure_req = request["enclosure"]
@@ -65,7 +89,7 @@ def solve(request: Dict[str, Any], case_id: str = evidence.CASE_DEFAULT) -> Dict
     total_width = float(totals["total_width_unit"][0])
     total_heat = float(totals["total_heat_w"][0])
 
-    enclosures_df = _load_catalog()
+    enclosures_df = _load_catalog(catalog_path)
     if enclosures_df.is_empty():
         raise RuntimeError("Enclosure catalog is empty")
 
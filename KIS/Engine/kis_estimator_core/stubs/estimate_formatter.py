@@ -7,8 +7,8 @@ from typing import Any, Dict
 
 import polars as pl
 
-from ..util import templates
-from . import evidence
+from ..util import profiling, templates
+from . import evidence, pricing
 
 
 def _loads_frame(loads: list[dict[str, Any]]) -> pl.DataFrame:
@@ -48,6 +48,7 @@ def _brand_profile(request: Dict[str, Any]) -> Dict[str, Any]:
     return profile
 
 
+@profiling.profiled("estimate_formatter")
 def format_estimate(request: Dict[str, Any], breaker_review: Dict[str, Any], case_id: str = evidence.CASE_DEFAULT) -> Dict[str, Any]:
     loads = request.get("loads", [])
     if not loads:
@@ -57,22 +58,7 @@ def format_estimate(request: Dict[str, Any], breaker_review: Dict[str, Any], cas
     doc = _document_fields(request)
     brand = _brand_profile(request)
 
-    base_cost = float(loads_df["heat_w"].sum() * 4200)
-    width_cost = float(loads_df["width_unit"].sum() * 90000)
-    labor_cost = float(loads_df.height * 85000)
-    materials = base_cost + width_cost
-    labor = labor_cost
-    subtotal = materials + labor
-    vat = round(subtotal * 0.1, 2)
-    grand_total = round(subtotal + vat, 2)
-
-    totals = {
-        "materials": round(materials, 2),
-        "labor": round(labor, 2),
-        "subtotal": round(subtotal, 2),
-        "vat": vat,
-        "grand_total": grand_total,
-    }
+    breakdown, totals, policy = pricing.price_request(request, loads_df)
 
     named_ranges = [
         {"name": "ProjectName", "value": doc["project_name"]},
@@ -90,6 +76,7 @@ def format_estimate(request: Dict[str, Any], breaker_review: Dict[str, Any], cas
         "project_id": request["project_id"],
         "generated_at": datetime.utcnow().isoformat() + "Z",
         "totals": totals,
+        "pricing": policy,
         "document": doc,
         "brand": brand,
         "named_ranges": named_ranges,
@@ -109,6 +96,7 @@ def format_estimate(request: Dict[str, Any], breaker_review: Dict[str, Any], cas
         },
         tables={
             "loads": loads_df,
+            "pricing": breakdown,
         },
     )
 
@@ -116,6 +104,6 @@ def format_estimate(request: Dict[str, Any], breaker_review: Dict[str, Any], cas
         "payload": payload,
         "evidence": artefacts,
         "logs": [
-            "Estimate formatter produced financial summary",  # [REAL-LOGIC] totals derived from loads
+            "Estimate formatter produced financial summary",  # [REAL-LOGIC] totals priced from cost tables
         ],
     }
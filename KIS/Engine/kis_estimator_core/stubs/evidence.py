@@ -2,38 +2,162 @@
 
 from __future__ import annotations
 
-import base64
+import os
 import re
 from datetime import datetime
+from io import BytesIO
 from pathlib import Path
-from typing import Dict, Iterable, List, Mapping, MutableMapping
+from typing import Dict, Iterable, List, Mapping, MutableMapping, Optional, Union
 
 import polars as pl  # type: ignore
 
-from ..util import guard, io
+from ..util import artifact_sink, blob_store, evidence_archive, evidence_render, evidence_retention, guard, io, profiling
 
 CASE_DEFAULT = "2025-0001"
-_PNG_PIXEL = base64.b64decode(
-    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVQI12P4//8/AwAI/AL+XgKp5wAAAABJRU5ErkJggg=="
-)
+STORE_FILES = "files"
+STORE_ARCHIVE = "archive"
+STORE_CAS = "cas"
+# "files" writes every returned path as a real file. The archive and CAS stores
+# hand out virtual paths that only read_artifact() resolves, so they are opt-in.
+EVIDENCE_STORE = os.environ.get("KIS_EVIDENCE_STORE", STORE_FILES).strip().lower()
+# Writes finish before write_stage() returns; the background sink
+# (KIS_EVIDENCE_MODE=async) is opt-in and needs flush() before reads.
+EVIDENCE_MODE = os.environ.get("KIS_EVIDENCE_MODE", artifact_sink.MODE_SYNC).strip().lower()
+EVIDENCE_FSYNC = os.environ.get("KIS_EVIDENCE_FSYNC", "").strip().lower() in {"1", "true", "yes", "on"}
+if EVIDENCE_STORE not in {STORE_FILES, STORE_ARCHIVE, STORE_CAS}:
+    raise ValueError(f"Unknown evidence store '{EVIDENCE_STORE}'")
+SINK = artifact_sink.ArtifactSink(mode=EVIDENCE_MODE, fsync=EVIDENCE_FSYNC)
+
+
+def _evidence_dir(case_id: str) -> Path:
+    return Path(__file__).resolve().parents[3] / "Work" / case_id / "output" / "evidence"
 
 
 def _evidence_root(case_id: str = CASE_DEFAULT) -> Path:
-    base = Path(__file__).resolve().parents[3] / "Work" / case_id / "output" / "evidence"
-    return io.ensure_dir(base)
+    return io.ensure_dir(_evidence_dir(case_id))
+
+
+def artifact_path(case_id: str, name: str) -> Path:
+    """Return the (possibly virtual) path of artifact ``name`` without creating directories."""
+    return _evidence_dir(case_id) / name
 
 
-def _write_binary(path: Path, payload: bytes) -> Path:
-    guard.ensure_whitelisted(path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_bytes(payload)
-    return path
+def _parquet_bytes(frame: pl.DataFrame) -> bytes:
+    buffer = BytesIO()
+    frame.write_parquet(buffer)
+    return buffer.getvalue()
+
+
+def _payload_bytes(payload: Union[bytes, pl.DataFrame]) -> bytes:
+    return payload if isinstance(payload, bytes) else _parquet_bytes(payload)
+
+
+def _persist(
+    root: Path,
+    case_id: str,
+    stage: str,
+    timestamp: str,
+    items: List[tuple[str, Union[bytes, pl.DataFrame]]],
+) -> List[str]:
+    """Queue a run's artifacts on the configured store and return their (possibly virtual) paths."""
+    paths = [root / name for name, _ in items]
+    for path in paths:
+        guard.ensure_whitelisted(path)
+
+    if EVIDENCE_STORE == STORE_FILES:
+        for path, (_, payload) in zip(paths, items):
+            SINK.submit(path, payload if isinstance(payload, bytes) else payload.write_parquet)
+    elif EVIDENCE_STORE == STORE_ARCHIVE:
+        archive = evidence_archive.archive_for(root)
+        for name, payload in items:
+            SINK.submit(
+                archive.archive_path,
+                lambda _, name=name, payload=payload: archive.append(name, stage, timestamp, _payload_bytes(payload)),
+                atomic=False,
+            )
+    else:
+        store = blob_store.default_store()
+        # [REAL-LOGIC] hashing happens on the sink thread; the run holds one reference per artifact
+        SINK.submit(
+            store.manifest_path(case_id, stage, timestamp),
+            lambda _: store.commit(case_id, stage, timestamp, {name: _payload_bytes(payload) for name, payload in items}),
+            atomic=False,
+        )
+    return [str(path) for path in paths]
+
+
+def flush(timeout: float | None = None) -> List[tuple[str, str]]:
+    """Wait for queued evidence to reach disk; returns (path, error) for failed writes."""
+    return SINK.flush(timeout)
+
+
+def read_artifact(path: Union[str, Path]) -> bytes:
+    """Return artifact bytes from the configured store; SVG/PNG visuals are rendered on demand."""
+    artifact = Path(path)
+    guard.ensure_whitelisted(artifact)
+    if artifact.suffix in evidence_render.VISUAL_SUFFIXES:
+        source = _read_stored(artifact.with_name(evidence_render.source_name(artifact.name)))
+        return evidence_render.render(artifact.name, source)
+    try:
+        return _read_stored(artifact)
+    except FileNotFoundError:
+        if artifact.suffix != ".parquet":
+            raise
+        return evidence_retention.read_compacted(artifact)  # folded into a monthly partition
+
+
+def _read_stored(artifact: Path) -> bytes:
+    if artifact.is_file():
+        return artifact.read_bytes()
+    if EVIDENCE_STORE == STORE_CAS:
+        case_id = artifact.parents[2].name  # Work/<case>/output/evidence/<name>
+        blob = blob_store.default_store().resolve(case_id, artifact.name)
+        if blob is None:
+            flush()
+            blob = blob_store.default_store().resolve(case_id, artifact.name)
+        if blob is None:
+            raise FileNotFoundError(f"{artifact.name} has no manifest entry for case {case_id}")
+        return blob.read_bytes()
+    archive = evidence_archive.archive_for(artifact.parent)
+    if archive.lookup(artifact.name) is None:
+        flush()  # the artifact may still be queued on the sink
+    return archive.read(artifact.name)
+
+
+def list_artifacts(
+    case_id: str = CASE_DEFAULT,
+    stage: Optional[str] = None,
+    since: evidence_archive.TimeBound = None,
+    until: evidence_archive.TimeBound = None,
+) -> List[Dict[str, object]]:
+    """List archived artifacts for a case, optionally by stage and timestamp window.
+
+    Only the archive and CAS stores keep records; with the files store the
+    evidence directory itself is the listing.
+    """
+    root = _evidence_root(case_id)
+    if EVIDENCE_STORE == STORE_CAS:
+        low, high = evidence_archive.time_bound(since), evidence_archive.time_bound(until)
+        listed: List[Dict[str, object]] = []
+        for manifest_path in blob_store.default_store().manifests(case_id):
+            manifest = io.read_json(manifest_path)
+            run_stage, run_timestamp = manifest["stage"], manifest["timestamp"]
+            if stage is not None and run_stage != stage:
+                continue
+            if (low is not None and run_timestamp < low) or (high is not None and run_timestamp > high):
+                continue
+            for name, ref in sorted(manifest["artifacts"].items()):
+                listed.append({"name": name, "stage": run_stage, "timestamp": run_timestamp, "path": str(root / name), **ref})
+        return listed
+    entries = evidence_archive.archive_for(root).entries(stage, since, until)
+    return [{**entry, "path": str(root / entry["name"])} for entry in entries]
 
 
 def _sanitise(name: str) -> str:
     return re.sub(r"[^A-Za-z0-9_-]", "_", name)
 
 
+@profiling.profiled("evidence.write_stage", category="evidence")
 def write_stage(
     stage: str,
     payload: Mapping[str, object],
@@ -46,37 +170,26 @@ def write_stage(
     # [REAL-LOGIC] Ensure every stage produces structured artefacts for auditability
     root = _evidence_root(case_id)
     timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
-    artefacts: List[str] = []
-
-    json_path = root / f"{stage}_{timestamp}.json"
-    io.write_json(json_path, dict(payload))
-    artefacts.append(str(json_path))
-
-    svg_stub = root / f"{stage}_{timestamp}.svg"
-    svg_content = (
-        "<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"320\" height=\"80\">"
-        f"<rect width=\"320\" height=\"80\" fill=\"#f2f6ff\"/>"
-        f"<text x=\"16\" y=\"30\" font-size=\"14\" fill=\"#003366\">{stage} snapshot</text>"
-        f"<text x=\"16\" y=\"60\" font-size=\"12\" fill=\"#003366\">{timestamp}</text></svg>"
-    ).encode("utf-8")
-    _write_binary(svg_stub, svg_content)
-    artefacts.append(str(svg_stub))
-
-    png_stub = root / f"{stage}_{timestamp}.png"
-    _write_binary(png_stub, _PNG_PIXEL)
-    artefacts.append(str(png_stub))
+    items: List[tuple[str, Union[bytes, pl.DataFrame]]] = [
+        (f"{stage}_{timestamp}.json", io.encode_json(dict(payload), pretty=False)),
+    ]
 
     if inputs:
         for name, snapshot in inputs.items():
-            snap_path = root / f"{stage}_{_sanitise(name)}_{timestamp}.json"
-            io.write_json(snap_path, dict(snapshot))
-            artefacts.append(str(snap_path))
+            items.append((f"{stage}_{_sanitise(name)}_{timestamp}.json", io.encode_json(dict(snapshot), pretty=False)))
 
     if tables:
         for name, frame in tables.items():
-            table_path = root / f"{stage}_{_sanitise(name)}_{timestamp}.parquet"
-            guard.ensure_whitelisted(table_path)
-            frame.write_parquet(table_path)  # [REAL-LOGIC] Persist analytical tables for traceability
-            artefacts.append(str(table_path))
-
+            # [REAL-LOGIC] Persist analytical tables for traceability
+            items.append((f"{stage}_{_sanitise(name)}_{timestamp}.parquet", frame))
+
+    visuals = [f"{stage}_{timestamp}{suffix}" for suffix in (".svg", ".png")]
+    if EVIDENCE_STORE == STORE_FILES:
+        # Plain files: consumers open the returned paths directly, so the visuals are written too.
+        source = items[0][1]
+        items[1:1] = [(name, evidence_render.render(name, source)) for name in visuals]
+        return _persist(root, case_id, stage, timestamp, items)
+    artefacts = _persist(root, case_id, stage, timestamp, items)
+    # SVG/PNG visuals are virtual: read_artifact renders them from the stage JSON when fetched.
+    artefacts[1:1] = [str(root / name) for name in visuals]
     return artefacts
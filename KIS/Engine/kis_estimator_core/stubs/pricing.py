@@ -0,0 +1,167 @@
+"""Table-driven pricing for estimate lines.
+
+Material, labor and coating rates come from ``Rules/cost_tables`` and
+tax/margin from ``Rules/policy_tax_margin.yaml``, read from the compiled rules
+snapshot. The tables are loaded once into polars lookup frames and reused
+until the snapshot digest changes, so a batch of requests is priced by a
+single warm engine with vectorized joins.
+
+Coating bands are keyed on a line's ``width_unit``. The coating table carries
+no unit label; its bands (0-0.2, 0.2-0.5, 0.5-1.0, 1.0-2.0, 2.0+) are on the
+scale of ``width_unit``, the fraction of a panel width a load occupies
+(0.25-1.0 in practice), and no other line field is: ``heat_w`` runs in the
+hundreds of watts and ``kva`` in the tens.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import polars as pl
+
+from ..util import rules_snapshot
+
+LINE_COLUMNS = ("request", "id", "heat_w", "width_unit", "bundle")
+
+_ENGINE_LOCK = threading.Lock()
+_ENGINE: Optional[Tuple[str, "PricingEngine"]] = None
+
+
+@dataclass(frozen=True)
+class PricingEngine:
+    material: Dict[str, float]  # rate per unit of each line column (``heat_w``, ``width_unit``)
+    labor: Dict[str, float]
+    coating: pl.DataFrame  # band lower bound ``coat_min``, upper bound ``coat_max``, ``coat_unit``; sorted
+    overhead_rate: float
+    tax_rate: float
+    margin_floor: float
+    margin_ceiling: float
+    currency: str
+    versions: Dict[str, str]
+
+    @classmethod
+    def load(cls, snapshot: Dict[str, Any]) -> "PricingEngine":
+        material = snapshot["rules"]["cost_material"]
+        labor = snapshot["rules"]["cost_labor"]
+        coating = snapshot["rules"]["cost_coating"]
+        policy = snapshot["rules"]["policy_tax_margin"]
+        policies = policy.get("policies", {})
+        bands = pl.from_dicts(coating["table"]).select([
+            pl.col("min").cast(pl.Float64).alias("coat_min"),
+            pl.col("max").cast(pl.Float64).alias("coat_max"),
+            pl.col("unit").cast(pl.Float64).alias("coat_unit"),
+        ]).sort("coat_min")
+        return cls(
+            material={row["class"]: float(row["unit"]) for row in material["table"]},
+            labor={row["class"]: float(row["unit"]) for row in labor["table"]},
+            coating=bands,
+            overhead_rate=float(labor.get("overhead_rate", 0.0)),
+            tax_rate=float(policies.get("tax_rate_default", 0.1)),
+            margin_floor=float(policies.get("margin_floor", 0.0)),
+            margin_ceiling=float(policies.get("margin_ceiling", 1.0)),
+            currency=str(policies.get("currency", "KRW")),
+            versions={
+                "material": Path(snapshot["sources"]["cost_material"]["path"]).stem,
+                "labor": Path(snapshot["sources"]["cost_labor"]["path"]).stem,
+                "coating": Path(snapshot["sources"]["cost_coating"]["path"]).stem,
+                "policy": str(policy.get("version", "")),
+            },
+        )
+
+    def margin_rate(self, requested: Optional[float] = None) -> float:
+        """Clamp a requested margin to the policy band; no request prices at the floor."""
+        if requested is None:
+            return self.margin_floor
+        return min(max(float(requested), self.margin_floor), self.margin_ceiling)
+
+    def price_lines(self, lines: pl.DataFrame) -> pl.DataFrame:
+        """Add per-line cost columns to ``lines`` (LINE_COLUMNS; ``bundle`` optional), keeping row order."""
+        if "bundle" not in lines.columns:
+            lines = lines.with_columns(pl.lit(None, dtype=pl.Utf8).alias("bundle"))
+        # [REAL-LOGIC] coating band by width unit (see module docstring) via one as-of join
+        priced = (
+            lines.with_row_index("_row")
+            .with_columns(pl.col("width_unit").cast(pl.Float64), pl.col("heat_w").cast(pl.Float64))
+            .sort("width_unit")
+            .join_asof(self.coating, left_on="width_unit", right_on="coat_min", strategy="backward")
+            .sort("_row")
+        )
+        wiring = self.labor.get("wiring", 0.0)
+        bundle_apply = self.labor.get("bundle_apply", 0.0)
+        return priced.with_columns([
+            (pl.col("heat_w") * self.material.get("heat_w", 0.0) + pl.col("width_unit") * self.material.get("width_unit", 0.0)).alias("material"),
+            pl.when(pl.col("width_unit") < pl.col("coat_max")).then(pl.col("coat_unit")).otherwise(0.0).alias("coating"),
+            (pl.lit(wiring) + pl.when(pl.col("bundle").is_not_null()).then(bundle_apply).otherwise(0.0)).alias("labor"),
+        ]).with_columns(
+            (pl.col("labor") * self.overhead_rate).alias("overhead"),
+        ).with_columns(
+            pl.sum_horizontal("material", "coating", "labor", "overhead").alias("line_total"),
+        ).drop("_row", "coat_min", "coat_max", "coat_unit")
+
+    def totals(self, priced: pl.DataFrame, margin_rates: Sequence[float]) -> List[Dict[str, float]]:
+        """Roll priced lines up per request index; each request also carries one ``panel_base`` labor."""
+        sums = priced.group_by("request").agg([pl.col(col).sum() for col in ("material", "coating", "labor")])
+        by_request = {row["request"]: row for row in sums.iter_rows(named=True)}
+        panel_base = self.labor.get("panel_base", 0.0)
+        results = []
+        for index, margin_rate in enumerate(margin_rates):
+            row = by_request.get(index, {"material": 0.0, "coating": 0.0, "labor": 0.0})
+            labor = row["labor"] + panel_base
+            overhead = labor * self.overhead_rate
+            cost = row["material"] + row["coating"] + labor + overhead
+            margin = cost * margin_rate
+            subtotal = round(cost + margin, 2)
+            vat = round(subtotal * self.tax_rate, 2)
+            results.append({
+                "materials": round(row["material"], 2),
+                "coating": round(row["coating"], 2),
+                "labor": round(labor, 2),
+                "overhead": round(overhead, 2),
+                "margin": round(margin, 2),
+                "subtotal": subtotal,
+                "vat": vat,
+                "grand_total": round(subtotal + vat, 2),
+            })
+        return results
+
+    def policy(self, margin_rate: float) -> Dict[str, Any]:
+        return {
+            "currency": self.currency,
+            "tax_rate": self.tax_rate,
+            "margin_rate": margin_rate,
+            "overhead_rate": self.overhead_rate,
+            "tables": self.versions,
+        }
+
+
+def engine() -> PricingEngine:
+    """Return the shared engine, rebuilt only when the rules snapshot digest changes."""
+    global _ENGINE
+    snapshot = rules_snapshot.load()
+    with _ENGINE_LOCK:
+        if _ENGINE is None or _ENGINE[0] != snapshot["digest"]:
+            _ENGINE = (snapshot["digest"], PricingEngine.load(snapshot))
+        return _ENGINE[1]
+
+
+def warm_pricing() -> PricingEngine:
+    """Load the pricing tables ahead of a batch, so workers share one warm engine."""
+    return engine()
+
+
+def _lines(loads: pl.DataFrame, index: int) -> pl.DataFrame:
+    columns = [pl.lit(index, dtype=pl.UInt32).alias("request")]
+    columns += [pl.col(name) for name in LINE_COLUMNS[1:] if name in loads.columns]
+    return loads.select(columns)
+
+
+def price_request(request: Dict[str, Any], loads: pl.DataFrame) -> Tuple[pl.DataFrame, Dict[str, float], Dict[str, Any]]:
+    """Price one request's loads; returns (per-line breakdown, totals, applied policy)."""
+    pricing = engine()
+    margin_rate = pricing.margin_rate(request.get("margin_rate"))
+    priced = pricing.price_lines(_lines(loads, 0))
+    return priced.drop("request"), pricing.totals(priced, [margin_rate])[0], pricing.policy(margin_rate)
+
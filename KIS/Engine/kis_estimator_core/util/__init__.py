@@ -1,5 +1,5 @@
 """Utility exports for estimator core."""
 
-from . import guard, hashing, io, templates
+from . import artifact_sink, blob_store, evidence_archive, evidence_render, evidence_retention, file_digest, guard, hashing, io, profiling, rules_snapshot, serialize, templates, xlsx
 
-__all__ = ["guard", "hashing", "io", "templates"]
+__all__ = ["artifact_sink", "blob_store", "evidence_archive", "evidence_render", "evidence_retention", "file_digest", "guard", "hashing", "io", "profiling", "rules_snapshot", "serialize", "templates", "xlsx"]
@@ -0,0 +1,232 @@
+"""Content-addressed evidence blobs with per-run manifests and reference counts."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+try:  # fcntl is POSIX-only; Windows relies on the per-process lock alone
+    import fcntl
+except ImportError:  # pragma: no cover - Windows desktop installs
+    fcntl = None  # type: ignore[assignment]
+
+from . import guard, hashing, io, serialize
+
+DEFAULT_ROOT = guard.KIS_ROOT / "Work" / "evidence_store"
+LEDGER_NAME = "refcounts.log"
+LOCK_NAME = "refcounts_lock.log"
+GC_GRACE_SECONDS = 300.0
+
+BlobKey = Tuple[str, str]  # (sha256, suffix)
+
+
+class BlobStore:
+    """Store each unique artifact once under ``blobs/<sha[:2]>/<sha><suffix>``.
+
+    A run (one ``evidence.write_stage`` call) is recorded as a manifest under
+    ``manifests/<case>/<timestamp>_<stage>.json`` naming the blob behind each
+    artifact. ``refcounts.log`` is an append-only ledger of +1/-1 deltas;
+    :meth:`gc` recounts from the manifests, removes unreferenced blobs and
+    compacts the ledger.
+    """
+
+    def __init__(self, root: Path = DEFAULT_ROOT) -> None:
+        self.root = root
+        self.blob_root = root / "blobs"
+        self.manifest_root = root / "manifests"
+        self.ledger_path = root / LEDGER_NAME
+        self.lock_path = root / LOCK_NAME
+        guard.ensure_whitelisted(self.ledger_path)
+        guard.ensure_whitelisted(self.lock_path)
+        self._lock = threading.Lock()
+
+    def blob_path(self, sha: str, suffix: str) -> Path:
+        return self.blob_root / sha[:2] / f"{sha}{suffix}"
+
+    def manifest_path(self, case_id: str, stage: str, timestamp: str) -> Path:
+        return self.manifest_root / case_id / f"{timestamp}_{stage}.json"
+
+    def put(self, payload: bytes, suffix: str) -> Dict[str, Any]:
+        """Store ``payload`` unless an identical blob exists; return its reference.
+
+        A reused blob has its mtime refreshed so :meth:`gc` treats it as new
+        for the grace window, exactly like a freshly written one.
+        """
+        sha = hashing.sha256_bytes(payload)
+        path = self.blob_path(sha, suffix)
+        guard.ensure_whitelisted(path)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self._write_blob(path, payload)
+        return {"sha256": sha, "suffix": suffix, "size": len(payload)}
+
+    def _write_blob(self, path: Path, payload: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.{threading.get_ident()}{path.suffix}")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)  # [REAL-LOGIC] concurrent writers of one blob race to identical content
+
+    def commit(self, case_id: str, stage: str, timestamp: str, artifacts: Mapping[str, bytes]) -> Path:
+        """Store a run's artifacts, write its manifest and take one reference per artifact.
+
+        Blobs are hashed and written outside the ledger lock; the manifest is
+        written under it, after re-checking that no :meth:`gc` removed a blob
+        in between, so a committed manifest never names a missing blob.
+        """
+        refs = {name: self.put(payload, Path(name).suffix) for name, payload in artifacts.items()}
+        manifest_path = self.manifest_path(case_id, stage, timestamp)
+        guard.ensure_whitelisted(manifest_path)
+        manifest = {"case_id": case_id, "stage": stage, "timestamp": timestamp, "artifacts": refs}
+        with self._ledger_lock():
+            for name, ref in refs.items():
+                path = self.blob_path(ref["sha256"], ref["suffix"])
+                if not path.exists():
+                    self._write_blob(path, artifacts[name])
+            io.write_bytes(manifest_path, serialize.dumps(manifest))
+            self._write_ledger([(ref["sha256"], ref["suffix"], 1) for ref in refs.values()])
+        return manifest_path
+
+    def release(self, manifest_path: Path) -> int:
+        """Drop a run's manifest and its references; blobs go at the next :meth:`gc`."""
+        guard.ensure_whitelisted(manifest_path)
+        manifest = serialize.loads(manifest_path.read_bytes())
+        refs = manifest.get("artifacts", {}).values()
+        self._append_ledger([(ref["sha256"], ref["suffix"], -1) for ref in refs])
+        manifest_path.unlink()
+        return len(refs)
+
+    def resolve(self, case_id: str, name: str) -> Optional[Path]:
+        """Return the blob behind the virtual artifact ``name`` of a case, if recorded."""
+        # Artifact names end in "_<timestamp>.<ext>", which also prefixes the run manifest.
+        timestamp = Path(name).stem.rsplit("_", 1)[-1]
+        case_dir = self.manifest_root / case_id
+        for manifest_path in sorted(case_dir.glob(f"{timestamp}_*.json")):
+            ref = serialize.loads(manifest_path.read_bytes()).get("artifacts", {}).get(name)
+            if ref:
+                return self.blob_path(ref["sha256"], ref["suffix"])
+        return None
+
+    def manifests(self, case_id: Optional[str] = None) -> Iterator[Path]:
+        pattern = f"{case_id}/*.json" if case_id else "*/*.json"
+        return iter(sorted(self.manifest_root.glob(pattern)))
+
+    def refcounts(self) -> Dict[BlobKey, int]:
+        """Fold the ledger into live reference counts."""
+        counts: Dict[BlobKey, int] = {}
+        if not self.ledger_path.exists():
+            return counts
+        with self.ledger_path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                if not line.endswith("\n"):
+                    break
+                entry = serialize.loads(line)
+                key = (entry["sha256"], entry["suffix"])
+                counts[key] = counts.get(key, 0) + entry["delta"]
+        return {key: count for key, count in counts.items() if count}
+
+    def _marked(self) -> Dict[BlobKey, int]:
+        counts: Dict[BlobKey, int] = {}
+        for manifest_path in self.manifests():
+            for ref in serialize.loads(manifest_path.read_bytes()).get("artifacts", {}).values():
+                key = (ref["sha256"], ref["suffix"])
+                counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def gc(self, grace_seconds: float = GC_GRACE_SECONDS, dry_run: bool = False) -> Dict[str, Any]:
+        """Delete blobs no manifest references and rewrite the ledger from the manifests.
+
+        Blobs younger than ``grace_seconds`` are kept because a run stores its
+        blobs before its manifest lands.
+        """
+        with self._ledger_lock():
+            ledger = self.refcounts()
+            marked = self._marked()
+            cutoff = time.time() - grace_seconds
+            removed, kept, freed = 0, 0, 0
+            for path in sorted(self.blob_root.glob("*/*")):
+                if path.name.startswith("."):
+                    continue
+                key = (path.stem, path.suffix)
+                if key in marked or path.stat().st_mtime > cutoff:
+                    kept += 1
+                    continue
+                removed += 1
+                freed += path.stat().st_size
+                if not dry_run:
+                    path.unlink()
+            if not dry_run:
+                self._rewrite_ledger(marked)
+        return {
+            "blobs_kept": kept,
+            "blobs_removed": removed,
+            "bytes_freed": freed,
+            "ledger_drift": sorted(
+                f"{sha}{suffix}" for (sha, suffix) in set(ledger) | set(marked) if ledger.get((sha, suffix), 0) != marked.get((sha, suffix), 0)
+            ),
+            "dry_run": dry_run,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        blobs = [path for path in self.blob_root.glob("*/*") if not path.name.startswith(".")]
+        counts = self.refcounts()
+        return {
+            "blobs": len(blobs),
+            "blob_bytes": sum(path.stat().st_size for path in blobs),
+            "manifests": sum(1 for _ in self.manifests()),
+            "references": sum(counts.values()),
+        }
+
+    @contextmanager
+    def _ledger_lock(self) -> Iterator[None]:
+        """Serialise ledger appends and compaction across threads and processes."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            self.root.mkdir(parents=True, exist_ok=True)
+            with self.lock_path.open("a") as handle:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _append_ledger(self, deltas: List[Tuple[str, str, int]]) -> None:
+        with self._ledger_lock():
+            self._write_ledger(deltas)
+
+    def _write_ledger(self, deltas: List[Tuple[str, str, int]]) -> None:
+        """Append ledger deltas; the caller holds :meth:`_ledger_lock`."""
+        if not deltas:
+            return
+        with self.ledger_path.open("ab") as handle:
+            handle.write(
+                b"".join(serialize.dumps({"sha256": sha, "suffix": suffix, "delta": delta}) + b"\n" for sha, suffix, delta in deltas)
+            )
+
+    def _rewrite_ledger(self, counts: Mapping[BlobKey, int]) -> None:
+        tmp_path = self.ledger_path.with_name(f"{self.ledger_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(
+            b"".join(
+                serialize.dumps({"sha256": sha, "suffix": suffix, "delta": count}) + b"\n"
+                for (sha, suffix), count in sorted(counts.items())
+            )
+        )
+        os.replace(tmp_path, self.ledger_path)
+
+
+_DEFAULT: Optional[BlobStore] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_store() -> BlobStore:
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = BlobStore()
+        return _DEFAULT
@@ -0,0 +1,220 @@
+"""Append-only per-case evidence archive with an offset index."""
+
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+try:  # fcntl is POSIX-only; Windows relies on the per-process lock alone
+    import fcntl
+except ImportError:  # pragma: no cover - Windows desktop installs
+    fcntl = None  # type: ignore[assignment]
+
+from . import guard, serialize
+
+ARCHIVE_NAME = "evidence_archive.log"
+INDEX_NAME = "evidence_index.log"
+RECORD_MARK = b"@KISEVD "
+TIMESTAMP_FORMAT = "%Y%m%dT%H%M%S%f"
+
+TimeBound = Union[str, datetime, None]
+
+_ARCHIVES: Dict[Path, "EvidenceArchive"] = {}
+_ARCHIVES_LOCK = threading.Lock()
+
+
+def time_bound(value: TimeBound) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.strftime(TIMESTAMP_FORMAT)
+    return value
+
+
+class EvidenceArchive:
+    """One log file of evidence records per case plus a line-per-record index.
+
+    Each record is ``RECORD_MARK + header JSON + "\\n" + payload`` so the index
+    can be rebuilt by scanning the archive. The index maps the original
+    artifact file name (the virtual path) to its payload offset and length.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.archive_path = root / ARCHIVE_NAME
+        self.index_path = root / INDEX_NAME
+        guard.ensure_whitelisted(self.archive_path)
+        guard.ensure_whitelisted(self.index_path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._index_offset = 0
+        self._index_inode: Optional[int] = None
+
+    @contextmanager
+    def _locked(self, handle: Any, shared: bool = False) -> Iterator[None]:
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def append(self, name: str, stage: str, timestamp: str, payload: bytes) -> Dict[str, Any]:
+        """Append ``payload`` under the virtual name and return its index entry."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        header = serialize.dumps({"name": name, "stage": stage, "timestamp": timestamp, "length": len(payload)})
+        head = RECORD_MARK + header + b"\n"
+        while True:
+            with self.archive_path.open("ab") as archive:
+                # [REAL-LOGIC] archive and index appends happen under one lock so parallel workers interleave whole records
+                with self._locked(archive):
+                    if os.fstat(archive.fileno()).st_ino != os.stat(self.archive_path).st_ino:
+                        continue  # rewritten by compaction while we waited; reopen the new file
+                    archive.seek(0, os.SEEK_END)
+                    offset = archive.tell() + len(head)
+                    archive.write(head + payload)
+                    archive.flush()
+                    entry = {"name": name, "stage": stage, "timestamp": timestamp, "offset": offset, "length": len(payload)}
+                    with self.index_path.open("ab") as index:
+                        index.write(serialize.dumps(entry) + b"\n")
+            return entry
+
+    def _refresh(self) -> None:
+        """Read index lines appended since the last refresh."""
+        if not self.index_path.exists():
+            return
+        with self.index_path.open("rb") as index:
+            inode = os.fstat(index.fileno()).st_ino
+            if inode != self._index_inode:  # replaced by rewrite/rebuild, possibly in another process
+                self._entries = {}
+                self._index_offset = 0
+                self._index_inode = inode
+            index.seek(self._index_offset)
+            for line in index:
+                if not line.endswith(b"\n"):
+                    break  # a writer is mid-line; pick it up next time
+                self._index_offset += len(line)
+                entry = serialize.loads(line)
+                self._entries[entry["name"]] = entry
+
+    def entries(self, stage: Optional[str] = None, since: TimeBound = None, until: TimeBound = None) -> List[Dict[str, Any]]:
+        """Return index entries filtered by stage and an inclusive timestamp window."""
+        with self._lock:
+            self._refresh()
+            selected = list(self._entries.values())
+        low, high = time_bound(since), time_bound(until)
+        return sorted(
+            (
+                entry
+                for entry in selected
+                if (stage is None or entry["stage"] == stage)
+                and (low is None or entry["timestamp"] >= low)
+                and (high is None or entry["timestamp"] <= high)
+            ),
+            key=lambda entry: (entry["timestamp"], entry["name"]),
+        )
+
+    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if name not in self._entries:
+                self._refresh()
+            return self._entries.get(name)
+
+    def read(self, name: str) -> bytes:
+        """Return an artifact's payload.
+
+        The offset is looked up and read through one handle under the archive
+        lock, so a concurrent :meth:`rewrite` (in any process) cannot move the
+        record in between.
+        """
+        while True:
+            try:
+                archive = self.archive_path.open("rb")
+            except FileNotFoundError:
+                raise FileNotFoundError(f"{name} is not in {self.archive_path}") from None
+            with archive, self._locked(archive, shared=True):
+                if os.fstat(archive.fileno()).st_ino != os.stat(self.archive_path).st_ino:
+                    continue  # rewritten while we waited; reopen the new file
+                self._refresh()
+                entry = self._entries.get(name)
+                if entry is None:
+                    raise FileNotFoundError(f"{name} is not in {self.archive_path}")
+                archive.seek(entry["offset"])
+                return archive.read(entry["length"])
+
+    def rewrite(
+        self,
+        keep: Callable[[Dict[str, Any]], bool],
+        on_copy: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """Rewrite the archive with only the entries ``keep`` accepts; returns bytes reclaimed.
+
+        ``on_copy`` is called with each copied record size so callers can
+        throttle the I/O.
+        """
+        if not self.archive_path.exists():
+            return 0
+        tmp_path = self.archive_path.with_name(f"{self.archive_path.name}.{os.getpid()}.tmp")
+        with self.archive_path.open("rb") as archive:
+            with self._locked(archive):  # holds self._lock as well as the file lock
+                self._refresh()
+                live = sorted(self._entries.values(), key=lambda entry: entry["offset"])
+                before = os.fstat(archive.fileno()).st_size
+                kept: List[Dict[str, Any]] = []
+                with tmp_path.open("wb") as target:
+                    for entry in live:
+                        if not keep(entry):
+                            continue
+                        archive.seek(entry["offset"])
+                        payload = archive.read(entry["length"])
+                        header = {key: entry[key] for key in ("name", "stage", "timestamp")}
+                        header["length"] = len(payload)
+                        target.write(RECORD_MARK + serialize.dumps(header) + b"\n")
+                        kept.append({**entry, "offset": target.tell()})
+                        target.write(payload)
+                        if on_copy is not None:
+                            on_copy(len(payload))
+                    after = target.tell()
+                index_tmp = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+                index_tmp.write_bytes(b"".join(serialize.dumps(entry) + b"\n" for entry in kept))
+                os.replace(tmp_path, self.archive_path)
+                os.replace(index_tmp, self.index_path)
+                self._entries = {}
+                self._index_offset = 0
+        return before - after
+
+    def rebuild_index(self) -> int:
+        """Rewrite the index from the archive's record headers; returns the record count."""
+        entries: List[Dict[str, Any]] = []
+        if self.archive_path.exists():
+            with self.archive_path.open("rb") as archive:
+                while True:
+                    head = archive.readline()
+                    if not head.startswith(RECORD_MARK) or not head.endswith(b"\n"):
+                        break  # end of file or a torn trailing record
+                    header = serialize.loads(head[len(RECORD_MARK):])
+                    offset = archive.tell()
+                    if len(archive.read(header["length"])) != header["length"]:
+                        break
+                    entries.append({**header, "offset": offset})
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(b"".join(serialize.dumps(entry) + b"\n" for entry in entries))
+        with self._lock:
+            os.replace(tmp_path, self.index_path)
+            self._entries = {}
+            self._index_offset = 0
+        return len(entries)
+
+
+def archive_for(root: Path) -> EvidenceArchive:
+    """Return the shared archive handle for an evidence directory."""
+    key = root.resolve()
+    with _ARCHIVES_LOCK:
+        archive = _ARCHIVES.get(key)
+        if archive is None:
+            archive = _ARCHIVES[key] = EvidenceArchive(key)
+        return archive
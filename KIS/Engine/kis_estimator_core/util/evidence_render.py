@@ -0,0 +1,110 @@
+"""On-demand SVG/PNG rendering of evidence visuals from their stage JSON."""
+
+from __future__ import annotations
+
+import functools
+import struct
+import zlib
+from typing import Any, Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+from . import serialize
+
+VISUAL_SUFFIXES = {".svg", ".png"}
+MEDIA_TYPES = {".svg": "image/svg+xml", ".png": "image/png"}
+RENDER_CACHE_SIZE = 256
+MAX_METRICS = 4
+
+WIDTH = 320
+HEIGHT = 80
+BACKGROUND = (0xF2, 0xF6, 0xFF)
+INK = (0x00, 0x33, 0x66)
+
+
+def source_name(name: str) -> str:
+    """Return the stage JSON artifact a visual is rendered from."""
+    stem, _, _ = name.rpartition(".")
+    return f"{stem}.json"
+
+
+def _split_name(name: str) -> Tuple[str, str]:
+    stem = name.rpartition(".")[0]
+    stage, _, timestamp = stem.rpartition("_")
+    return stage, timestamp
+
+
+def _metrics(payload: Dict[str, Any]) -> List[Tuple[str, float]]:
+    """Pick the first numeric scalars, looking inside a nested ``metrics`` block first."""
+    nested = payload.get("metrics")
+    candidates = list(nested.items()) if isinstance(nested, dict) else []
+    candidates += list(payload.items())
+    picked: List[Tuple[str, float]] = []
+    for key, value in candidates:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if any(key == seen for seen, _ in picked):
+            continue
+        picked.append((key, float(value)))
+        if len(picked) == MAX_METRICS:
+            break
+    return picked
+
+
+def _svg(stage: str, timestamp: str, metrics: List[Tuple[str, float]]) -> bytes:
+    height = HEIGHT + 18 * len(metrics)
+    lines = [
+        f"<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"{WIDTH}\" height=\"{height}\">",
+        f"<rect width=\"{WIDTH}\" height=\"{height}\" fill=\"#f2f6ff\"/>",
+        f"<text x=\"16\" y=\"30\" font-size=\"14\" fill=\"#003366\">{escape(stage)} snapshot</text>",
+        f"<text x=\"16\" y=\"60\" font-size=\"12\" fill=\"#003366\">{escape(timestamp)}</text>",
+    ]
+    for idx, (key, value) in enumerate(metrics):
+        lines.append(
+            f"<text x=\"16\" y=\"{84 + 18 * idx}\" font-size=\"11\" fill=\"#003366\">{escape(key)}: {value:g}</text>"
+        )
+    lines.append("</svg>")
+    return "".join(lines).encode("utf-8")
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def _png(metrics: List[Tuple[str, float]]) -> bytes:
+    """Encode a banner with one bar per metric, scaled to the largest magnitude."""
+    scale = max((abs(value) for _, value in metrics), default=0.0) or 1.0
+    bar_rows = {}
+    for idx, (_, value) in enumerate(metrics):
+        top = 24 + idx * 14
+        length = int((WIDTH - 32) * abs(value) / scale)
+        for y in range(top, top + 8):
+            bar_rows[y] = length
+
+    background = bytes(BACKGROUND)
+    ink = bytes(INK)
+    rows = []
+    for y in range(HEIGHT):
+        if y < 12:
+            row = ink * WIDTH
+        else:
+            length = bar_rows.get(y, 0)
+            row = background * 16 + ink * length + background * (WIDTH - 16 - length)
+        rows.append(b"\x00" + row)
+    header = struct.pack(">IIBBBBB", WIDTH, HEIGHT, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", header)
+        + _png_chunk(b"IDAT", zlib.compress(b"".join(rows), 9))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render(name: str, source: bytes) -> bytes:
+    """Render the visual ``name`` from its stage JSON bytes; results are LRU-cached."""
+    stage, timestamp = _split_name(name)
+    payload = serialize.loads(source)
+    metrics = _metrics(payload) if isinstance(payload, dict) else []
+    if name.endswith(".png"):
+        return _png(metrics)
+    return _svg(stage, timestamp, metrics)
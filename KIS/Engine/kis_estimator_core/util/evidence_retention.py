@@ -0,0 +1,434 @@
+"""Retention, TTL and parquet compaction for evidence and engine work directories."""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import polars as pl  # type: ignore
+
+from . import blob_store, evidence_archive, guard, io, serialize
+
+logger = logging.getLogger(__name__)
+
+WORK_ROOT = guard.KIS_ROOT / "Work"
+DEFAULT_POLICY_PATH = guard.KIS_ROOT / "Rules" / "evidence_retention.json"
+REPORT_PATH = WORK_ROOT / "retention" / "retention_report.json"
+HOLD_NAME = "retention_hold.json"
+TABLES_DIR = "tables"
+RUN_TIMESTAMP_COLUMN = "_run_timestamp"
+ENGINE_STAGE_DIRS = {"enclosure", "placement", "format", "cover", "lint", "spatial"}
+SIGNED_KEYS = ("signed", "released", "signature")
+
+_NAME_RE = re.compile(r"^(?P<prefix>.+)_(?P<timestamp>\d{8}T\d{6}(?:\d{6}|Z))\.(?P<ext>[A-Za-z0-9]+)$")
+
+
+@dataclass
+class RetentionPolicy:
+    """Limits applied per case and stage; see ``KIS/Rules/evidence_retention.json``."""
+
+    keep_last: int = 50
+    keep_min: int = 3
+    ttl_days: float = 30.0
+    compact_tables_after_days: float = 7.0
+    protected_cases: List[str] = field(default_factory=list)
+    engine_keep_last: int = 20
+    engine_ttl_days: float = 30.0
+    engine_protected: List[str] = field(default_factory=lambda: ["current"])
+    max_bytes_per_second: int = 8 * 1024 * 1024
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_POLICY_PATH) -> "RetentionPolicy":
+        if not path.exists():
+            return cls()
+        data = io.read_json(path).get("retention", {})
+        known = {name for name in cls.__dataclass_fields__}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+@dataclass
+class _Run:
+    stage: str
+    timestamp: str
+    when: datetime
+    files: List[Path] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+    manifest: Optional[Path] = None
+
+
+class _Throttle:
+    """Token bucket keeping deletes and copies under ``rate`` bytes per second."""
+
+    def __init__(self, rate: int) -> None:
+        self.rate = rate
+        self._started = time.monotonic()
+        self._spent = 0
+
+    def consume(self, nbytes: int) -> None:
+        if self.rate <= 0:
+            return
+        self._spent += nbytes
+        ahead = self._spent / self.rate - (time.monotonic() - self._started)
+        if ahead > 0:
+            time.sleep(ahead)
+
+
+def parse_timestamp(timestamp: str) -> datetime:
+    if timestamp.endswith("Z"):
+        return datetime.strptime(timestamp, "%Y%m%dT%H%M%SZ")
+    return datetime.strptime(timestamp, evidence_archive.TIMESTAMP_FORMAT)
+
+
+def split_name(name: str) -> Optional[Tuple[str, str]]:
+    """Return ``(prefix, timestamp)`` for an artifact name, or None if it has no timestamp."""
+    match = _NAME_RE.match(name)
+    return (match["prefix"], match["timestamp"]) if match else None
+
+
+def hold(case_id: str, reason: str) -> Path:
+    """Exempt a case from retention, e.g. once it is signed or released."""
+    path = WORK_ROOT / case_id / HOLD_NAME
+    return io.write_json(path, {"case_id": case_id, "reason": reason, "held_at": datetime.utcnow().isoformat() + "Z"}, pretty=False)
+
+
+def release_hold(case_id: str) -> bool:
+    path = WORK_ROOT / case_id / HOLD_NAME
+    guard.ensure_whitelisted(path)
+    if not path.exists():
+        return False
+    path.unlink()
+    return True
+
+
+def _is_signed(payload: bytes) -> bool:
+    try:
+        data = serialize.loads(payload)
+    except ValueError:
+        return False
+    return isinstance(data, dict) and any(data.get(key) for key in SIGNED_KEYS)
+
+
+def _partition_path(evidence_dir: Path, prefix: str, timestamp: str) -> Path:
+    return evidence_dir / TABLES_DIR / prefix / f"{timestamp[:4]}-{timestamp[4:6]}.parquet"
+
+
+def read_compacted(artifact: Path) -> bytes:
+    """Return a parquet artifact's table from its monthly partition."""
+    parts = split_name(artifact.name)
+    if parts is None:
+        raise FileNotFoundError(artifact)
+    partition = _partition_path(artifact.parent, *parts)
+    guard.ensure_whitelisted(partition)
+    if not partition.exists():
+        raise FileNotFoundError(artifact)
+    frame = pl.read_parquet(partition).filter(pl.col(RUN_TIMESTAMP_COLUMN) == parts[1])
+    if frame.height == 0:
+        raise FileNotFoundError(artifact)
+    buffer = BytesIO()
+    frame.drop(RUN_TIMESTAMP_COLUMN).write_parquet(buffer)
+    return buffer.getvalue()
+
+
+class RetentionRunner:
+    """Apply a :class:`RetentionPolicy` one target (case, engine dirs, blob GC) at a time."""
+
+    def __init__(self, policy: Optional[RetentionPolicy] = None, work_root: Path = WORK_ROOT, dry_run: bool = False) -> None:
+        self.policy = policy or RetentionPolicy.load()
+        self.work_root = work_root
+        self.dry_run = dry_run
+        self._cursor: List[str] = []
+        self._report = self._empty_report()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- scheduling -----------------------------------------------------------------
+
+    def targets(self) -> List[str]:
+        cases = sorted(path.parent.parent.name for path in self.work_root.glob("*/output/evidence"))
+        return [f"case:{case_id}" for case_id in cases] + ["engine", "blobs"]
+
+    def step(self) -> Optional[Dict[str, Any]]:
+        """Process the next target; returns the cycle report when a full cycle completes."""
+        if not self._cursor:
+            self._cursor = self.targets()
+        target = self._cursor.pop(0)
+        throttle = _Throttle(self.policy.max_bytes_per_second)
+        started = time.perf_counter()
+        if target.startswith("case:"):
+            outcome = self._process_case(target[len("case:"):], throttle)
+        elif target == "engine":
+            outcome = self._process_engine_dirs(throttle)
+        else:
+            outcome = self._collect_blobs()
+        outcome["ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+        self._merge(target, outcome)
+        if self._cursor:
+            return None
+        report, self._report = self._report, self._empty_report()
+        report["finished_at"] = datetime.utcnow().isoformat() + "Z"
+        io.write_json(REPORT_PATH, report)
+        return report
+
+    def run_once(self) -> Dict[str, Any]:
+        self._cursor = self.targets()
+        while True:
+            report = self.step()
+            if report is not None:
+                return report
+
+    def start(self, interval_seconds: float = 60.0) -> None:
+        """Run one target per ``interval_seconds`` on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def loop() -> None:
+            while not self._stop.wait(interval_seconds):
+                try:
+                    self.step()
+                except Exception as exc:  # [REAL-LOGIC] retention must never take the gateway down
+                    logger.error("Retention step failed: %s", exc)
+
+        self._thread = threading.Thread(target=loop, name="evidence-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # -- reporting ------------------------------------------------------------------
+
+    def _empty_report(self) -> Dict[str, Any]:
+        return {
+            "policy": asdict(self.policy),
+            "dry_run": self.dry_run,
+            "bytes_reclaimed": 0,
+            "files_removed": 0,
+            "runs_removed": 0,
+            "tables_compacted": 0,
+            "targets": {},
+        }
+
+    def _merge(self, target: str, outcome: Dict[str, Any]) -> None:
+        for key in ("bytes_reclaimed", "files_removed", "runs_removed", "tables_compacted"):
+            self._report[key] += outcome.get(key, 0)
+        self._report["targets"][target] = outcome
+
+    # -- selection ------------------------------------------------------------------
+
+    def _held(self, case_id: str) -> bool:
+        return case_id in self.policy.protected_cases or (self.work_root / case_id / HOLD_NAME).exists()
+
+    def _expired(self, runs: Iterable[_Run], keep_last: int, ttl_days: float) -> List[_Run]:
+        """Runs beyond ``keep_last`` per stage, or older than the TTL beyond ``keep_min``."""
+        cutoff = datetime.utcnow() - timedelta(days=ttl_days)
+        by_stage: Dict[str, List[_Run]] = {}
+        for run in runs:
+            by_stage.setdefault(run.stage, []).append(run)
+        expired: List[_Run] = []
+        for stage_runs in by_stage.values():
+            stage_runs.sort(key=lambda run: run.timestamp, reverse=True)
+            for rank, run in enumerate(stage_runs):
+                if rank >= keep_last or (rank >= self.policy.keep_min and run.when < cutoff):
+                    expired.append(run)
+        return expired
+
+    # -- evidence ---------------------------------------------------------------------
+
+    def _process_case(self, case_id: str, throttle: _Throttle) -> Dict[str, Any]:
+        if self._held(case_id):
+            return {"held": True}
+        evidence_dir = self.work_root / case_id / "output" / "evidence"
+        outcome: Dict[str, Any] = {"bytes_reclaimed": 0, "files_removed": 0, "runs_removed": 0, "tables_compacted": 0}
+        self._process_loose(evidence_dir, throttle, outcome)
+        self._process_archive(evidence_dir, throttle, outcome)
+        self._process_manifests(case_id, outcome)
+        return outcome
+
+    def _process_loose(self, evidence_dir: Path, throttle: _Throttle, outcome: Dict[str, Any]) -> None:
+        runs: Dict[str, _Run] = {}
+        for path in evidence_dir.iterdir():
+            parts = split_name(path.name) if path.is_file() else None
+            if parts is None:
+                continue
+            prefix, timestamp = parts
+            run = runs.get(timestamp)
+            if run is None:
+                run = runs[timestamp] = _Run(prefix, timestamp, parse_timestamp(timestamp))
+            elif len(prefix) < len(run.stage):
+                run.stage = prefix  # the shortest prefix sharing a timestamp is the stage itself
+            run.files.append(path)
+
+        expired = self._expired(runs.values(), self.policy.keep_last, self.policy.ttl_days)
+        for run in expired:
+            stage_json = next((path for path in run.files if path.name == f"{run.stage}_{run.timestamp}.json"), None)
+            if stage_json is not None and _is_signed(stage_json.read_bytes()):
+                continue
+            for path in run.files:
+                size = path.stat().st_size
+                if not self.dry_run:
+                    path.unlink()
+                throttle.consume(size)
+                outcome["bytes_reclaimed"] += size
+                outcome["files_removed"] += 1
+            outcome["runs_removed"] += 1
+            del runs[run.timestamp]
+
+        compact_before = datetime.utcnow() - timedelta(days=self.policy.compact_tables_after_days)
+        tables = [
+            (path.name, path.read_bytes, path)
+            for run in runs.values()
+            if run.when < compact_before
+            for path in run.files
+            if path.suffix == ".parquet"
+        ]
+        for path in self._compact_tables(evidence_dir, tables, throttle, outcome):
+            if not self.dry_run:
+                path.unlink()
+
+    def _process_archive(self, evidence_dir: Path, throttle: _Throttle, outcome: Dict[str, Any]) -> None:
+        archive = evidence_archive.archive_for(evidence_dir)
+        entries = archive.entries()
+        if not entries:
+            return
+        runs: Dict[Tuple[str, str], _Run] = {}
+        for entry in entries:
+            key = (entry["stage"], entry["timestamp"])
+            run = runs.get(key)
+            if run is None:
+                run = runs[key] = _Run(entry["stage"], entry["timestamp"], parse_timestamp(entry["timestamp"]))
+            run.names.append(entry["name"])
+
+        dropped: set = set()
+        for run in self._expired(runs.values(), self.policy.keep_last, self.policy.ttl_days):
+            stage_json = f"{run.stage}_{run.timestamp}.json"
+            if stage_json in run.names and _is_signed(archive.read(stage_json)):
+                continue
+            dropped.update(run.names)
+            outcome["runs_removed"] += 1
+            outcome["files_removed"] += len(run.names)
+            del runs[(run.stage, run.timestamp)]
+
+        compact_before = datetime.utcnow() - timedelta(days=self.policy.compact_tables_after_days)
+        tables = [
+            (name, lambda name=name: archive.read(name), None)
+            for run in runs.values()
+            if run.when < compact_before
+            for name in run.names
+            if name.endswith(".parquet")
+        ]
+        self._compact_tables(evidence_dir, tables, throttle, outcome)
+        dropped.update(name for name, _, _ in tables)
+        if not dropped:
+            return
+        if self.dry_run:
+            outcome["bytes_reclaimed"] += sum(entry["length"] for entry in entries if entry["name"] in dropped)
+            return
+        outcome["bytes_reclaimed"] += archive.rewrite(lambda entry: entry["name"] not in dropped, throttle.consume)
+
+    def _process_manifests(self, case_id: str, outcome: Dict[str, Any]) -> None:
+        store = blob_store.default_store()
+        runs: List[_Run] = []
+        for manifest_path in store.manifests(case_id):
+            manifest = io.read_json(manifest_path)
+            run = _Run(manifest["stage"], manifest["timestamp"], parse_timestamp(manifest["timestamp"]), manifest=manifest_path)
+            run.names = list(manifest.get("artifacts", {}))
+            runs.append(run)
+        for run in self._expired(runs, self.policy.keep_last, self.policy.ttl_days):
+            manifest_path = run.manifest
+            if manifest_path is None:
+                continue
+            ref = io.read_json(manifest_path).get("artifacts", {}).get(f"{run.stage}_{run.timestamp}.json")
+            if ref and _is_signed(store.blob_path(ref["sha256"], ref["suffix"]).read_bytes()):
+                continue
+            if not self.dry_run:
+                store.release(manifest_path)
+            outcome["runs_removed"] += 1
+            outcome["files_removed"] += len(run.names)
+
+    def _collect_blobs(self) -> Dict[str, Any]:
+        store = blob_store.default_store()
+        if not store.root.exists():
+            return {"bytes_reclaimed": 0, "files_removed": 0}
+        report = store.gc(dry_run=self.dry_run)
+        return {"bytes_reclaimed": report["bytes_freed"], "files_removed": report["blobs_removed"], **report}
+
+    def _compact_tables(
+        self,
+        evidence_dir: Path,
+        tables: List[Tuple[str, Callable[[], bytes], Optional[Path]]],
+        throttle: _Throttle,
+        outcome: Dict[str, Any],
+    ) -> List[Path]:
+        """Fold old per-run parquet tables into ``tables/<prefix>/<YYYY-MM>.parquet``.
+
+        Returns the loose files that were folded in, for the caller to delete.
+        """
+        partitions: Dict[Path, List[Tuple[str, Callable[[], bytes], Optional[Path]]]] = {}
+        for name, load, path in tables:
+            parts = split_name(name)
+            if parts is not None:
+                partitions.setdefault(_partition_path(evidence_dir, *parts), []).append((name, load, path))
+        folded: List[Path] = []
+        for partition, members in partitions.items():
+            guard.ensure_whitelisted(partition)
+            frames = [pl.read_parquet(partition)] if partition.exists() else []
+            for name, load, path in members:
+                payload = load()
+                throttle.consume(len(payload))
+                timestamp = split_name(name)[1]  # type: ignore[index]
+                frames.append(pl.read_parquet(BytesIO(payload)).with_columns(pl.lit(timestamp).alias(RUN_TIMESTAMP_COLUMN)))
+                outcome["tables_compacted"] += 1
+                if path is not None:
+                    outcome["bytes_reclaimed"] += len(payload)
+                    folded.append(path)
+            if self.dry_run:
+                continue
+            before = partition.stat().st_size if partition.exists() else 0
+            partition.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = partition.with_name(f".{partition.stem}.{os.getpid()}.parquet")
+            pl.concat(frames, how="diagonal").write_parquet(tmp_path)
+            os.replace(tmp_path, partition)
+            outcome["bytes_reclaimed"] -= partition.stat().st_size - before
+        return folded
+
+    # -- engine work directories -------------------------------------------------------
+
+    def _process_engine_dirs(self, throttle: _Throttle) -> Dict[str, Any]:
+        """Expire whole ``engine/`` work directories (``--work``) by recency and age."""
+        outcome: Dict[str, Any] = {"bytes_reclaimed": 0, "files_removed": 0, "runs_removed": 0}
+        runs: List[_Run] = []
+        for work_dir in self.work_root.iterdir():
+            if not work_dir.is_dir() or work_dir.name in self.policy.engine_protected or self._held(work_dir.name):
+                continue
+            stage_dirs = [child for child in work_dir.iterdir() if child.is_dir() and child.name in ENGINE_STAGE_DIRS]
+            if not stage_dirs:
+                continue
+            newest = max(child.stat().st_mtime for child in stage_dirs)
+            when = datetime.utcfromtimestamp(newest)
+            runs.append(_Run("engine", when.strftime(evidence_archive.TIMESTAMP_FORMAT), when, files=stage_dirs))
+
+        for run in self._expired(runs, self.policy.engine_keep_last, self.policy.engine_ttl_days):
+            for stage_dir in run.files:
+                for path in sorted(stage_dir.rglob("*"), key=lambda item: len(item.parts), reverse=True):
+                    if path.is_dir():
+                        if not self.dry_run:
+                            path.rmdir()
+                        continue
+                    size = path.stat().st_size
+                    if not self.dry_run:
+                        path.unlink()
+                    throttle.consume(size)
+                    outcome["bytes_reclaimed"] += size
+                    outcome["files_removed"] += 1
+                if not self.dry_run:
+                    stage_dir.rmdir()
+            outcome["runs_removed"] += 1
+        return outcome
@@ -0,0 +1,82 @@
+"""Stat-keyed SHA-256 of files with an in-process digest cache.
+
+Standard library only, so the engine scripts, the MCP orchestrator and the
+MCP gateway load this file directly instead of importing the KIS package.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Dict, Tuple, Union
+
+try:  # mmap is missing on a few embedded builds; buffered reads cover them
+    import mmap
+except ImportError:  # pragma: no cover
+    mmap = None  # type: ignore[assignment]
+
+PathLike = Union[str, Path]
+StatKey = Tuple[int, int, int, int, int]  # (st_dev, st_ino, st_size, st_mtime_ns, st_ctime_ns)
+
+READ_CHUNK = 1 << 20
+MMAP_THRESHOLD = 4 << 20
+CACHE_SIZE = 4096
+RACY_SECONDS = 2.0  # files modified this recently may change again within one mtime tick
+
+_CACHE: "OrderedDict[StatKey, str]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _stat_key(stat: os.stat_result) -> StatKey:
+    # ctime catches rewrites whose mtime was put back (touch -r, tar, rsync -t)
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns)
+
+
+def _digest_handle(handle: BinaryIO, size: int) -> str:
+    # [REAL-LOGIC] hashlib releases the GIL on large updates, so pooled threads hash in parallel
+    if mmap is not None and size >= MMAP_THRESHOLD:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            return hashlib.sha256(view).hexdigest()
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: handle.read(READ_CHUNK), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sha256_path(path: PathLike) -> str:
+    """Hash a file, reusing the digest while its (inode, size, mtime, ctime) are unchanged.
+
+    A digest is only cached once the file has been quiet for ``RACY_SECONDS``:
+    a write landing in the same mtime tick as the hash would otherwise leave
+    the stale digest behind an unchanged key.
+    """
+    with open(path, "rb") as handle:
+        before = os.fstat(handle.fileno())
+        key = _stat_key(before)
+        with _CACHE_LOCK:
+            cached = _CACHE.get(key)
+            if cached is not None:
+                _CACHE.move_to_end(key)
+                return cached
+        digest = _digest_handle(handle, before.st_size)
+        after = os.fstat(handle.fileno())
+    if _stat_key(after) == key and time.time() - max(after.st_mtime, after.st_ctime) > RACY_SECONDS:
+        with _CACHE_LOCK:
+            _CACHE[key] = digest
+            if len(_CACHE) > CACHE_SIZE:
+                _CACHE.popitem(last=False)
+    return digest
+
+
+def clear_cache() -> None:
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+def cache_info() -> Dict[str, int]:
+    with _CACHE_LOCK:
+        return {"entries": len(_CACHE), "capacity": CACHE_SIZE}
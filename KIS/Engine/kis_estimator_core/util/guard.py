@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import bisect
+import functools
+import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from stat import S_ISLNK
+from typing import Iterable, List, Tuple
 
 KIS_ROOT = Path(__file__).resolve().parents[3]
 WORKSPACE_ROOT = KIS_ROOT.parent
@@ -34,19 +38,126 @@ ALLOWED_SUFFIXES = {
     ".md",
 }
 
+RULES_SNAPSHOT_PATH = KIS_ROOT / "Work" / "cache" / "rules_snapshot.pkl"
+
+# Exact files allowed despite a suffix outside ALLOWED_SUFFIXES.
+ALLOWED_FILES = {
+    RULES_SNAPSHOT_PATH.resolve(),  # [REAL-LOGIC] compiled rules snapshot (plain data only, see rules_snapshot)
+}
+_ALLOWED_FILE_KEYS = {os.path.normcase(str(path)) for path in ALLOWED_FILES}
+
+
+GUARD_CACHE_SIZE = 4096
+
 
 def _in_whitelist(path: Path, whitelist: Iterable[Path]) -> bool:
     return any(path == allowed or allowed in path.parents for allowed in whitelist)
 
 
+def _root_prefixes(roots: Iterable[Path]) -> Tuple[str, ...]:
+    """Sorted, normalised ``root + sep`` prefixes with roots nested in another root dropped."""
+    prefixes = sorted({os.path.normcase(str(root)).rstrip(os.sep) + os.sep for root in roots})
+    kept: List[str] = []
+    for prefix in prefixes:
+        if not any(prefix.startswith(outer) for outer in kept):
+            kept.append(prefix)
+    return tuple(kept)
+
+
+_ROOT_PREFIXES = _root_prefixes(ALLOWED_ROOTS)
+
+
+def _under_allowed_root(resolved: str) -> bool:
+    # With nesting removed, only the greatest prefix sorting at or below the path can contain it.
+    key = os.path.normcase(resolved).rstrip(os.sep) + os.sep
+    idx = bisect.bisect_right(_ROOT_PREFIXES, key) - 1
+    return idx >= 0 and key.startswith(_ROOT_PREFIXES[idx])
+
+
+DirectoryIdentity = Tuple[Tuple[int, int, int, int], ...]
+
+
+def _directory_identity(directory: str) -> DirectoryIdentity:
+    """``(st_dev, st_ino, st_mode, ctime)`` of the directory and each ancestor, from a fresh ``lstat``.
+
+    Only symlinks change where a path resolves, so a component swapped for a
+    symlink (or one symlink replaced by another, even on a reused inode) yields
+    a new key and is resolved again. ctime is kept for symlinks only, since a
+    directory's ctime moves with every file written into it. Missing
+    components contribute zeros.
+    """
+    identity = []
+    current = directory
+    while True:
+        try:
+            stat = os.lstat(current)
+            link_ctime = stat.st_ctime_ns if S_ISLNK(stat.st_mode) else 0
+            identity.append((stat.st_dev, stat.st_ino, stat.st_mode, link_ctime))
+        except OSError:
+            identity.append((0, 0, 0, 0))
+        parent = os.path.dirname(current)
+        if parent == current:
+            return tuple(identity)
+        current = parent
+
+
+@functools.lru_cache(maxsize=GUARD_CACHE_SIZE)
+def _directory_decision(directory: str, identity: DirectoryIdentity) -> Tuple[str, bool]:
+    """Resolve a directory once per on-disk identity and remember whether it lies under an allowed root."""
+    resolved = str(Path(directory).resolve())
+    return resolved, _under_allowed_root(resolved)
+
+
+def clear_cache() -> None:
+    """Forget cached directory decisions, e.g. after ALLOWED_ROOTS or ALLOWED_FILES change."""
+    global _ROOT_PREFIXES, _ALLOWED_FILE_KEYS
+    _ROOT_PREFIXES = _root_prefixes(ALLOWED_ROOTS)
+    _ALLOWED_FILE_KEYS = {os.path.normcase(str(path)) for path in ALLOWED_FILES}
+    _directory_decision.cache_clear()
+
+
+def _resolve(path: Path) -> Tuple[str, bool]:
+    """Return the resolved path and whether it is inside the whitelist.
+
+    The parent directory is resolved through the cache, keyed on the fresh
+    ``lstat`` identity of every ancestor so a component replaced by a symlink
+    is resolved again. The last component is checked with a single ``lstat``:
+    a symlink there gets a full uncached resolve, as do paths containing
+    ``..`` (which must be applied after symlinks, exactly as ``Path.resolve``
+    does).
+    """
+    raw = os.fspath(path)
+    if not os.path.isabs(raw):
+        raw = os.path.join(os.getcwd(), raw)
+    directory, name = os.path.split(raw)
+    parts = directory.replace(os.altsep or os.sep, os.sep).split(os.sep)
+    if not name or name in (".", "..") or ".." in parts or os.path.islink(raw):
+        resolved = str(Path(raw).resolve())
+        return resolved, _under_allowed_root(resolved)
+    resolved_dir, allowed = _directory_decision(directory, _directory_identity(directory))
+    return os.path.join(resolved_dir, name), allowed
+
+
 def ensure_whitelisted(path: Path, allow_directory: bool = False) -> None:
     """Ensure a path is within allowed roots and uses an approved extension."""
+    resolved, allowed = _resolve(path)
+    if not allowed:
+        raise PermissionError(f"Path outside whitelist: {resolved}")
+    _check_suffix(resolved, allow_directory)
+
+
+def ensure_whitelisted_uncached(path: Path, allow_directory: bool = False) -> None:
+    """Reference implementation resolving every call; kept for benchmarks and audits."""
     resolved = Path(path).resolve()
     if not _in_whitelist(resolved, ALLOWED_ROOTS):
         raise PermissionError(f"Path outside whitelist: {resolved}")
-    if allow_directory:
+    _check_suffix(str(resolved), allow_directory)
+
+
+def _check_suffix(resolved: str, allow_directory: bool) -> None:
+    if allow_directory or os.path.normcase(resolved) in _ALLOWED_FILE_KEYS:
         return
-    suffix = resolved.suffix.lower()
+    suffix = os.path.splitext(resolved)[1].lower()
     if not suffix:
         raise PermissionError(f"Missing extension not permitted: {resolved}")
     if suffix not in ALLOWED_SUFFIXES:
@@ -2,26 +2,61 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Union
+from typing import Dict, Iterable, Optional, Union
 
-from . import guard
+from . import file_digest, guard
 
 PathLike = Union[str, Path]
 
+RACY_SECONDS = file_digest.RACY_SECONDS
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+# Paths are guarded by the public entry points before they reach the shared digest cache.
+_hash_path = file_digest.sha256_path
+clear_cache = file_digest.clear_cache
+cache_info = file_digest.cache_info
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="kis-hash")
+        return _POOL
+
 
 def sha256_file(path: PathLike) -> str:
     """Return the sha256 hex digest for a file."""
-    file_path = Path(path).resolve()
-    guard.ensure_whitelisted(file_path)
-    digest = hashlib.sha256()
-    with file_path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(65536), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+    file_path = Path(path)
+    guard.ensure_whitelisted(file_path)  # resolves symlinks itself
+    return _hash_path(file_path)
+
+
+def sha256_files(paths: Iterable[PathLike]) -> Dict[Path, str]:
+    """Hash many files on the shared thread pool; results keep the input order."""
+    file_paths = [Path(path) for path in paths]
+    for file_path in file_paths:
+        guard.ensure_whitelisted(file_path)
+    if len(file_paths) < 2:
+        return {file_path: _hash_path(file_path) for file_path in file_paths}
+    return dict(zip(file_paths, _pool().map(_hash_path, file_paths)))
+
+
+async def sha256_file_async(path: PathLike) -> str:
+    """Hash a file on the shared pool without blocking the running event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_pool(), sha256_file, path)
 
 
 def sha256_bytes(payload: bytes) -> str:
     """Return the sha256 hex digest for bytes."""
     return hashlib.sha256(payload).hexdigest()
+
@@ -3,13 +3,21 @@
 from __future__ import annotations
 
 import json
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterator, Optional, Set
 
-from . import guard
+from . import guard, serialize
 
 PACKAGE_ROOT = Path(__file__).resolve().parent.parent
 CONTRACT_DIR = PACKAGE_ROOT / "contracts"
+FSYNC_ENV = "KIS_IO_FSYNC"
+FSYNC_DEFAULT = os.environ.get(FSYNC_ENV, "").strip().lower() in {"1", "true", "yes", "on"}
+
+_BATCH = threading.local()
+_sync_data = getattr(os, "fdatasync", os.fsync)  # fdatasync is POSIX-only
 
 
 def load_contract(contract_name: str) -> Dict[str, Any]:
@@ -30,14 +38,94 @@ def ensure_dir(path: Path) -> Path:
 def read_json(path: Path) -> Dict[str, Any]:
     """Read JSON file with guard enforcement."""
     guard.ensure_whitelisted(path)
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return serialize.loads(path.read_bytes())
 
 
-def write_json(path: Path, payload: Dict[str, Any]) -> Path:
-    """Persist JSON payload in a guarded location."""
-    guard.ensure_whitelisted(path)
+def fsync_path(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        _sync_data(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_directory(path: Path) -> None:
+    """Persist renames inside ``path``; a no-op on Windows, which cannot open directories."""
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def group_commit() -> Iterator[Set[Path]]:
+    """Batch the directory fsyncs of durable writes made by this thread.
+
+    Inside the block each touched directory is fsynced once, at exit, instead
+    of after every file. Nested blocks join the outermost batch.
+    """
+    pending: Optional[Set[Path]] = getattr(_BATCH, "directories", None)
+    if pending is not None:
+        yield pending
+        return
+    pending = _BATCH.directories = set()
+    try:
+        yield pending
+    finally:
+        _BATCH.directories = None
+        for directory in sorted(pending):
+            fsync_directory(directory)
+
+
+def atomic_write(path: Path, writer: Callable[[Path], None], fsync: Optional[bool] = None) -> Path:
+    """Run ``writer`` against a sibling temp file, then rename it over ``path``.
+
+    Readers see the old file or the complete new one, never a truncated
+    write. With ``fsync`` (default from ``KIS_IO_FSYNC``) the data is synced
+    before the rename and the directory after it, or once per
+    :func:`group_commit` batch.
+    """
+    durable = FSYNC_DEFAULT if fsync is None else fsync
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2, sort_keys=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        writer(tmp_path)
+        if durable:
+            fsync_path(tmp_path)
+        os.replace(tmp_path, path)  # [REAL-LOGIC] atomic on POSIX and NTFS; concurrent writers last-one-wins
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if durable:
+        pending = getattr(_BATCH, "directories", None)
+        if pending is None:
+            fsync_directory(path.parent)
+        else:
+            pending.add(path.parent)
     return path
+
+
+def write_bytes(path: Path, data: bytes, fsync: Optional[bool] = None) -> Path:
+    """Atomically persist ``data`` in a guarded location."""
+    guard.ensure_whitelisted(path)
+    return atomic_write(path, lambda tmp_path: tmp_path.write_bytes(data), fsync)
+
+
+def write_text(path: Path, text: str, fsync: Optional[bool] = None) -> Path:
+    return write_bytes(path, text.encode("utf-8"), fsync)
+
+
+def encode_json(payload: Dict[str, Any], pretty: bool = True) -> bytes:
+    """Serialise a payload exactly as :func:`write_json` stores it."""
+    return serialize.dumps(payload, pretty=pretty)
+
+
+def write_json(path: Path, payload: Dict[str, Any], pretty: bool = True, fsync: Optional[bool] = None) -> Path:
+    """Persist JSON payload in a guarded location.
+
+    Pass ``pretty=False`` for machine-consumed artifacts to skip indenting and key sorting.
+    """
+    return write_bytes(path, serialize.dumps(payload, pretty=pretty), fsync)
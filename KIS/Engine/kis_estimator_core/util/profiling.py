@@ -0,0 +1,247 @@
+"""Optional per-stage profiling emitting Chrome trace-event JSON."""
+
+from __future__ import annotations
+
+import atexit
+import cProfile
+import functools
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+try:  # resource is POSIX-only; peak RSS is reported as None elsewhere
+    import resource
+except ImportError:  # pragma: no cover - Windows desktop installs
+    resource = None  # type: ignore[assignment]
+
+try:  # fcntl is POSIX-only; Windows relies on the per-process lock alone
+    import fcntl
+except ImportError:  # pragma: no cover - Windows desktop installs
+    fcntl = None  # type: ignore[assignment]
+
+from . import guard, serialize
+
+PROFILE_ENV = "KIS_PROFILE"
+CPROFILE_ENV = "KIS_PROFILE_CPROFILE"
+DEFAULT_TRACE_PATH = guard.KIS_ROOT / "Work" / "profile" / "kis_trace.json"
+_TRUTHY = {"1", "true", "yes", "on"}
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# tracemalloc's peak is process-global: every reset and read goes through this
+# lock, and a reset first folds the current peak into every running stage.
+_TRACEMALLOC_LOCK = threading.Lock()
+_RUNNING: List[Dict[str, int]] = []
+# Serialises the trace file's read-merge-replace between threads (and, via
+# flock on a sibling lock file, between processes).
+_TRACE_LOCK = threading.Lock()
+
+
+def _max_rss_kb() -> Optional[int]:
+    """Process-lifetime RSS high-water mark (ru_maxrss), not a per-stage figure."""
+    if resource is None:
+        return None
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _start_peak() -> Dict[str, int]:
+    """Reset the traced-memory peak for a new stage without losing running stages' peaks."""
+    with _TRACEMALLOC_LOCK:
+        current = tracemalloc.get_traced_memory()[1]
+        for frame in _RUNNING:
+            frame["peak"] = max(frame["peak"], current)
+        tracemalloc.reset_peak()
+        frame = {"peak": 0}
+        _RUNNING.append(frame)
+        return frame
+
+
+def _finish_peak(frame: Dict[str, int]) -> int:
+    """Return the highest traced memory seen while ``frame``'s stage ran."""
+    with _TRACEMALLOC_LOCK:
+        _RUNNING.remove(frame)
+        return max(frame["peak"], tracemalloc.get_traced_memory()[1])
+
+
+@contextmanager
+def _trace_file_lock(trace_path: Path) -> Iterator[None]:
+    with _TRACE_LOCK:
+        if fcntl is None:
+            yield
+            return
+        lock_path = trace_path.with_name(f"{trace_path.stem}_lock.log")
+        guard.ensure_whitelisted(lock_path)
+        with lock_path.open("a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class Profiler:
+    """Collect stage spans and flush them into a single trace file."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.trace_path: Path = DEFAULT_TRACE_PATH
+        self.cprofile = False
+        self._events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracemalloc = False
+
+    def enable(self, trace_path: Optional[Path | str] = None, cprofile: bool = False) -> None:
+        self.trace_path = Path(trace_path) if trace_path else DEFAULT_TRACE_PATH
+        guard.ensure_whitelisted(self.trace_path)
+        self.cprofile = cprofile
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _stack(self) -> List[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def stage(self, name: str, category: str = "kis_estimator_core", **args: Any) -> Iterator[Dict[str, Any]]:
+        """Trace the enclosed block; the yielded dict receives the span's args on exit."""
+        event_args: Dict[str, Any] = {}
+        if not self.enabled:
+            yield event_args
+            return
+
+        stack = self._stack()
+        stack.append(name)
+        profile = cProfile.Profile() if self.cprofile and len(stack) == 1 else None
+
+        frame = _start_peak()
+        rss_start = _max_rss_kb()
+        wall_ns = time.time_ns()
+        cpu_start = time.thread_time_ns()
+        start_ns = time.perf_counter_ns()
+        if profile is not None:
+            profile.enable()
+        status = "ok"
+        try:
+            yield event_args
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            if profile is not None:
+                profile.disable()
+            duration_ns = time.perf_counter_ns() - start_ns
+            cpu_ns = time.thread_time_ns() - cpu_start
+            peak = _finish_peak(frame)
+            stack.pop()
+
+            rss_end = _max_rss_kb()
+            event_args.update(
+                args,
+                status=status,
+                wall_ms=round(duration_ns / 1e6, 3),
+                cpu_ms=round(cpu_ns / 1e6, 3),
+                tracemalloc_peak_kb=round(peak / 1024.0, 1),
+                # ru_maxrss only ever grows: report the process high-water mark
+                # and how far this stage raised it, not a per-stage peak.
+                max_rss_kb=rss_end,
+                max_rss_growth_kb=None if rss_end is None else rss_end - rss_start,
+            )
+            if profile is not None:
+                event_args["cprofile"] = str(self._dump_profile(profile, name, wall_ns))
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": wall_ns / 1000.0,
+                "dur": duration_ns / 1000.0,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": event_args,
+            }
+            with self._lock:
+                self._events.append(event)
+
+    def _dump_profile(self, profile: cProfile.Profile, name: str, wall_ns: int) -> Path:
+        target = self.trace_path.parent / "cprofile" / f"{name}_{os.getpid()}_{wall_ns}.prof"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(str(target))
+        return target
+
+    def flush(self) -> Optional[Path]:
+        """Merge collected events into the trace file and clear the buffer."""
+        with self._lock:
+            events, self._events = self._events, []
+        if not events:
+            return None
+        self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+        with _trace_file_lock(self.trace_path):
+            existing: List[Dict[str, Any]] = []
+            if self.trace_path.exists():
+                try:
+                    existing = serialize.loads(self.trace_path.read_bytes()).get("traceEvents", [])
+                except (OSError, ValueError):
+                    existing = []
+            tmp_path = self.trace_path.with_name(f"{self.trace_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(
+                serialize.dumps({"traceEvents": existing + events, "displayTimeUnit": "ms"}, sort_keys=False)
+            )
+            os.replace(tmp_path, self.trace_path)
+        return self.trace_path
+
+
+PROFILER = Profiler()
+
+
+def enable(trace_path: Optional[Path | str] = None, cprofile: bool = False) -> None:
+    PROFILER.enable(trace_path, cprofile)
+
+
+def flush() -> Optional[Path]:
+    return PROFILER.flush()
+
+
+def stage(name: str, category: str = "kis_estimator_core", **args: Any):
+    return PROFILER.stage(name, category, **args)
+
+
+def profiled(name: str, category: str = "kis_estimator_core") -> Callable[[F], F]:
+    """Decorate a stage entry point so it is traced when profiling is enabled."""
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not PROFILER.enabled:
+                return fn(*args, **kwargs)
+            with PROFILER.stage(name, category):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _configure_from_env() -> None:
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    if not value or value.lower() in {"0", "false", "no", "off"}:
+        return
+    trace_path = None if value.lower() in _TRUTHY else value
+    enable(trace_path, cprofile=os.environ.get(CPROFILE_ENV, "").strip().lower() in _TRUTHY)
+
+
+_configure_from_env()
+atexit.register(flush)
@@ -0,0 +1,206 @@
+"""Compiled rules snapshot: every rule source validated and parsed once into one binary file.
+
+Engines call :func:`rules` instead of parsing JSON/YAML themselves. The
+snapshot records each source's sha256 and stat; a source whose stat moved is
+re-hashed, and only a changed hash triggers a rebuild. The payload is a
+plain-data pickle read with an unpickler that refuses every class, so a
+tampered snapshot cannot execute code.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io as _bytes_io
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+from . import guard, hashing
+from . import io as kis_io
+
+RULES_DIR = Path(__file__).resolve().parents[3] / "Rules"
+SNAPSHOT_PATH = guard.RULES_SNAPSHOT_PATH  # the only .pkl the guard admits
+SNAPSHOT_FORMAT = 1
+MAGIC = b"KISRULES"
+
+# snapshot key -> path relative to RULES_DIR
+SOURCES: Dict[str, str] = {
+    "ai_estimation_core": "ai_estimation_core.json",
+    "breaker_models": "breaker_models.json",
+    "inclosure": "inclosure.json",
+    "enclosure": "enclosure.json",
+    "sku_map": "sku_map.json",
+    "compliance_iec61439": "compliance/IEC61439_tables.json",
+    "compliance_ks": "compliance/KS_tables.json",
+    "cost_labor": "cost_tables/labor/BASE_V1.json",
+    "cost_coating": "cost_tables/coating/BASE_V1.json",
+    "cost_material": "cost_tables/material/BASE_V1.json",
+    "policy_tax_margin": "policy_tax_margin.yaml",
+    "accessory_rules": "accessory_rules.yaml",
+    "cover_rules": "cover_rules.yaml",
+    "enclosure_rules": "enclosure_rules.yaml",
+    "panel_rules": "panel_rules.yaml",
+}
+
+_LOCK = threading.Lock()
+_LOADED: Dict[str, Dict[str, Any]] = {}
+
+
+class RulesError(ValueError):
+    """Raised when a rule source is missing or fails validation."""
+
+
+class _DataUnpickler(pickle.Unpickler):
+    def find_class(self, module: str, name: str) -> Any:
+        raise pickle.UnpicklingError(f"Rules snapshot may only hold plain data, found {module}.{name}")
+
+
+def _read_source(path: Path) -> Any:
+    guard.ensure_whitelisted(path)
+    text = path.read_text(encoding="utf-8-sig")
+    if path.suffix == ".json":
+        return json.loads(text)
+    return yaml.safe_load(text)
+
+
+def _require(errors: List[str], name: str, condition: bool, message: str) -> None:
+    if not condition:
+        errors.append(f"{name}: {message}")
+
+
+def _validate_core(name: str, data: Any, errors: List[str]) -> None:
+    _require(errors, name, isinstance(data, dict) and isinstance(data.get("rules"), dict), "missing 'rules' mapping")
+    for rule in (data.get("rules", {}).get("bundles", []) if isinstance(data, dict) else []):
+        _require(errors, name, {"id", "if_item_category", "then_add"} <= set(rule), f"bundle {rule.get('id', '?')} incomplete")
+        _require(errors, name, all("item_id" in add for add in rule.get("then_add", [])), f"bundle {rule.get('id', '?')} adds an item without item_id")
+
+
+def _validate_models(fields: Tuple[str, ...]) -> Callable[[str, Any, List[str]], None]:
+    def validate(name: str, data: Any, errors: List[str]) -> None:
+        _require(errors, name, isinstance(data, list) and bool(data), "expected a non-empty list of models")
+        for index, entry in enumerate(data if isinstance(data, list) else []):
+            missing = [field for field in fields if field not in entry]
+            _require(errors, name, not missing, f"entry {index} ({entry.get('model', '?')}) missing {missing}")
+
+    return validate
+
+
+def _validate_table(fields: Tuple[str, ...]) -> Callable[[str, Any, List[str]], None]:
+    def validate(name: str, data: Any, errors: List[str]) -> None:
+        rows = data.get("table") if isinstance(data, dict) else None
+        _require(errors, name, isinstance(rows, list) and bool(rows), "missing 'table' rows")
+        for index, row in enumerate(rows or []):
+            _require(errors, name, all(field in row for field in fields), f"row {index} missing one of {list(fields)}")
+
+    return validate
+
+
+def _validate_compliance(name: str, data: Any, errors: List[str]) -> None:
+    _require(errors, name, isinstance(data, dict) and isinstance(data.get("tables"), dict), "missing 'tables' mapping")
+
+
+def _validate_mapping(name: str, data: Any, errors: List[str]) -> None:
+    _require(errors, name, isinstance(data, dict), "expected a mapping")
+
+
+VALIDATORS: Dict[str, Callable[[str, Any, List[str]], None]] = {
+    "ai_estimation_core": _validate_core,
+    "breaker_models": _validate_models(("model", "category", "poles", "ampere", "price")),
+    "inclosure": _validate_models(("model", "size_mm", "price")),
+    "compliance_iec61439": _validate_compliance,
+    "compliance_ks": _validate_compliance,
+    "cost_labor": _validate_table(("class", "unit")),
+    "cost_coating": _validate_table(("min", "max", "unit")),
+    "cost_material": _validate_table(("class", "unit")),
+}
+
+
+def _stat(path: Path) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def compile_rules(rules_dir: Path = RULES_DIR) -> Dict[str, Any]:
+    """Read, validate and fingerprint every source; raises RulesError listing all problems."""
+    errors: List[str] = []
+    sources: Dict[str, Dict[str, Any]] = {}
+    data: Dict[str, Any] = {}
+    for name, relative in SOURCES.items():
+        path = rules_dir / relative
+        try:
+            data[name] = _read_source(path)
+        except (OSError, ValueError) as exc:
+            errors.append(f"{name}: cannot read {relative}: {exc}")
+            continue
+        VALIDATORS.get(name, _validate_mapping)(name, data[name], errors)
+        size, mtime_ns = _stat(path)
+        sources[name] = {"path": relative, "sha256": hashing.sha256_file(path), "size": size, "mtime_ns": mtime_ns}
+    if errors:
+        raise RulesError("Invalid rule sources:\n  " + "\n  ".join(errors))
+    digest = hashlib.sha256("\n".join(f"{name}:{sources[name]['sha256']}" for name in sorted(sources)).encode()).hexdigest()
+    return {"format": SNAPSHOT_FORMAT, "digest": digest, "sources": sources, "rules": data}
+
+
+def write_snapshot(snapshot: Dict[str, Any], path: Path = SNAPSHOT_PATH) -> Path:
+    return kis_io.write_bytes(path, MAGIC + pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def read_snapshot(path: Path = SNAPSHOT_PATH) -> Optional[Dict[str, Any]]:
+    """Return the stored snapshot, or None when it is missing, foreign or from another format."""
+    guard.ensure_whitelisted(path)
+    try:
+        payload = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    if not payload.startswith(MAGIC):
+        return None
+    try:
+        snapshot = _DataUnpickler(_bytes_io.BytesIO(payload[len(MAGIC):])).load()
+    except (pickle.UnpicklingError, EOFError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT:
+        return None
+    return snapshot
+
+
+def stale_sources(snapshot: Dict[str, Any], rules_dir: Path = RULES_DIR) -> List[str]:
+    """Sources whose content no longer matches the snapshot; unchanged stat skips hashing."""
+    stale = [name for name in SOURCES if name not in snapshot["sources"]]
+    for name, entry in snapshot["sources"].items():
+        path = rules_dir / entry["path"]
+        try:
+            if _stat(path) == (entry["size"], entry["mtime_ns"]):
+                continue
+            if hashing.sha256_file(path) == entry["sha256"]:
+                continue
+        except OSError:
+            pass
+        stale.append(name)
+    return stale
+
+
+def load(path: Path = SNAPSHOT_PATH, rules_dir: Path = RULES_DIR) -> Dict[str, Any]:
+    """Return the current snapshot, recompiling and rewriting it when a source hash changed."""
+    key = str(path)
+    with _LOCK:
+        snapshot = _LOADED.get(key) or read_snapshot(path)
+        if snapshot is None or stale_sources(snapshot, rules_dir):
+            snapshot = compile_rules(rules_dir)
+            write_snapshot(snapshot, path)
+        _LOADED[key] = snapshot
+        return snapshot
+
+
+def rules(name: str) -> Any:
+    """Parsed content of one rule source from the shared snapshot."""
+    return load()["rules"][name]
+
+
+def clear_cache() -> None:
+    with _LOCK:
+        _LOADED.clear()
@@ -0,0 +1,99 @@
+"""JSON serializer backends: orjson or msgspec when installed, stdlib otherwise."""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable, Dict
+
+BACKEND_ENV = "KIS_JSON_BACKEND"
+
+Dumps = Callable[[Any, bool, bool], bytes]
+
+
+def _stdlib_dumps(payload: Any, pretty: bool, sort_keys: bool) -> bytes:
+    if pretty:
+        return json.dumps(payload, indent=2, sort_keys=sort_keys, ensure_ascii=False).encode("utf-8")
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _orjson_backend() -> Dumps:
+    import orjson  # type: ignore
+
+    compact = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    indented = compact | orjson.OPT_INDENT_2
+
+    def dumps(payload: Any, pretty: bool, sort_keys: bool) -> bytes:
+        option = (indented | (orjson.OPT_SORT_KEYS if sort_keys else 0)) if pretty else compact
+        try:
+            return orjson.dumps(payload, option=option)
+        except TypeError:  # e.g. integers beyond 64 bits; stdlib handles those
+            return _stdlib_dumps(payload, pretty, sort_keys)
+
+    return dumps
+
+
+def _msgspec_backend() -> Dumps:
+    import msgspec  # type: ignore
+
+    encoder = msgspec.json.Encoder()
+    try:
+        sorted_encoder = msgspec.json.Encoder(order="sorted")
+    except TypeError:  # msgspec < 0.18 cannot sort keys
+        sorted_encoder = None
+
+    def dumps(payload: Any, pretty: bool, sort_keys: bool) -> bytes:
+        try:
+            if not pretty:
+                return encoder.encode(payload)
+            if not sort_keys:
+                return msgspec.json.format(encoder.encode(payload), indent=2)
+            if sorted_encoder is None:
+                return _stdlib_dumps(payload, pretty, sort_keys)
+            return msgspec.json.format(sorted_encoder.encode(payload), indent=2)
+        except (TypeError, msgspec.EncodeError):
+            return _stdlib_dumps(payload, pretty, sort_keys)
+
+    return dumps
+
+
+_BACKENDS: Dict[str, Callable[[], Dumps]] = {
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+    "json": lambda: _stdlib_dumps,
+}
+
+
+def _select() -> tuple[str, Dumps]:
+    requested = os.environ.get(BACKEND_ENV, "").strip().lower()
+    order = [requested] if requested in _BACKENDS else list(_BACKENDS)
+    for name in order:
+        try:
+            return name, _BACKENDS[name]()
+        except ImportError:
+            continue
+    return "json", _stdlib_dumps
+
+
+BACKEND, _dumps = _select()
+
+
+def dumps(payload: Any, pretty: bool = False, sort_keys: bool = True) -> bytes:
+    """Encode ``payload`` as UTF-8 JSON.
+
+    Compact output is for machine-consumed artifacts; ``pretty`` (2-space
+    indent, keys sorted unless ``sort_keys=False``) is for files people read
+    and diff.
+    """
+    return _dumps(payload, pretty, sort_keys)
+
+
+def _select_loads() -> Callable[[bytes | str], Any]:
+    if BACKEND == "orjson":
+        import orjson  # type: ignore
+
+        return orjson.loads  # raises a ValueError subclass, like json.loads
+    return json.loads
+
+
+loads = _select_loads()
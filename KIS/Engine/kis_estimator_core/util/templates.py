@@ -3,34 +3,66 @@
 from __future__ import annotations
 
 import json
+import os
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Tuple
 
-import openpyxl
 import polars as pl
 
-from . import guard, hashing
+from . import guard, hashing, xlsx
 
 REGISTRY_PATH = Path(__file__).resolve().parents[3] / "Templates" / "registry.json"
 TEMPLATE_ROOT = REGISTRY_PATH.parent
 
+# resolved path -> ((size, mtime_ns), metadata); templates are few, so no eviction
+_METADATA: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_METADATA_LOCK = threading.Lock()
+
 
 def load_registry() -> Dict[str, object]:
     guard.ensure_whitelisted(REGISTRY_PATH)
-    with REGISTRY_PATH.open("r", encoding="utf-8") as handle:
+    with REGISTRY_PATH.open("r", encoding="utf-8-sig") as handle:  # registry.json is saved with a BOM
         return json.load(handle)
 
 
-def _resolve_named_range(workbook: openpyxl.Workbook, name: str) -> List[str]:
-    destinations = []
-    defined_name = workbook.defined_names.get(name)
-    if not defined_name:
-        return destinations
-    for sheet_name, coord in defined_name.destinations:
-        sheet = workbook[sheet_name]
-        destinations.append(str(sheet[coord].value))
-    return destinations
+def _read_named_ranges(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Resolve every workbook-scoped defined name straight from the xlsx zip."""
+    ranges = xlsx.named_range_values(path)
+    for entry in ranges.values():
+        entry["values"] = [str(value) for value in entry["values"]]
+    return ranges
+
+
+def template_metadata(path: Path) -> Dict[str, Any]:
+    """Return the digest and named-range values of a template, cached per file.
+
+    The cache is checked against (size, mtime); when those moved but the
+    digest did not, the cached ranges are reused without reopening the workbook.
+    """
+    key = str(path)
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    with _METADATA_LOCK:
+        cached = _METADATA.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    digest = hashing.sha256_file(path)
+    if cached is not None and cached[1]["digest"] == digest:
+        metadata = cached[1]
+    else:
+        metadata = {"digest": digest, "ranges": _read_named_ranges(path)}
+    if time.time() - stat.st_mtime > hashing.RACY_SECONDS:  # a just-written file may change within one mtime tick
+        with _METADATA_LOCK:
+            _METADATA[key] = (signature, metadata)
+    return metadata
+
+
+def clear_metadata_cache() -> None:
+    with _METADATA_LOCK:
+        _METADATA.clear()
 
 
 def validate_template(path: Path, expected_hash: str | None = None, expected_ranges: List[str] | None = None) -> Dict[str, object]:
@@ -50,20 +82,20 @@ def validate_template(path: Path, expected_hash: str | None = None, expected_ran
     if not resolved.exists():
         return report
 
-    digest = hashing.sha256_file(resolved)
+    metadata = template_metadata(resolved)
+    digest = metadata["digest"]
     report["hash"] = digest
     if expected_hash:
         report["hash_match"] = digest == expected_hash
     else:
         report["hash_match"] = True
 
-    workbook = openpyxl.load_workbook(resolved, data_only=True)
     missing_ranges: List[str] = []
     empty_ranges: List[str] = []
 
     expected = expected_ranges or []
     for named in expected:
-        values = _resolve_named_range(workbook, named)
+        values = metadata["ranges"].get(named, {}).get("values", [])
         if not values:
             missing_ranges.append(named)
         elif all(v in (None, "") for v in values):
@@ -78,6 +110,8 @@ def validate_template(path: Path, expected_hash: str | None = None, expected_ran
 def validate_templates() -> Dict[str, object]:
     registry = load_registry()
     files = registry.get("files", [])
+    # Hash every template on the shared pool first; validate_template then hits the digest cache.
+    hashing.sha256_files(path for path in (TEMPLATE_ROOT / entry["name"] for entry in files) if path.exists())
     results: List[Dict[str, object]] = []
     for entry in files:
         template_path = TEMPLATE_ROOT / entry["name"]
@@ -0,0 +1,267 @@
+"""Lightweight xlsx reader: defined names and targeted cell values straight from the zip.
+
+Only ``xl/workbook.xml``, its relationships, the styles and shared-string
+tables, and the sheets that hold requested cells are parsed, with
+``iterparse`` so a sheet is abandoned as soon as the last wanted row passes.
+"""
+
+from __future__ import annotations
+
+import posixpath
+import re
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from xml.etree.ElementTree import iterparse
+
+NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_AREA = re.compile(r"(?:'((?:[^']|'')+)'|([^'!,]+))!(\$?[A-Z]{1,3}\$?\d+(?::\$?[A-Z]{1,3}\$?\d+)?)")
+_CELL = re.compile(r"\$?([A-Z]{1,3})\$?(\d+)")
+# Built-in number formats openpyxl reads as dates or times
+_DATE_FORMAT_IDS = set(range(14, 23)) | {27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 45, 46, 47, 50, 51, 52, 53, 54, 55, 56, 57, 58}
+_DURATION_FORMAT_IDS = {46}  # [h]:mm:ss
+_DURATION = re.compile(r"\[(?:hh?|mm?|ss?)\]", re.IGNORECASE)
+_DATE_TOKENS = re.compile(r"[dmyhs]", re.IGNORECASE)
+_FORMAT_LITERALS = re.compile(r'"[^"]*"|\[[^\]]*\]|\\.')
+
+PathLike = Union[str, Path]
+Destination = Tuple[str, str]  # (sheet name, "$A$1" or "$A$1:$B$2")
+CellRef = Tuple[str, str]  # (sheet name, "A1")
+
+
+def column_index(letters: str) -> int:
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index
+
+
+def column_letters(index: int) -> str:
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def parse_destinations(text: str) -> List[Destination]:
+    """Split a defined-name formula into sheet/range areas; constants and formulas yield ``[]``."""
+    areas: List[Destination] = []
+    position = 0
+    while position < len(text):
+        match = _AREA.match(text, position)
+        if match is None:
+            return []
+        sheet = match.group(1).replace("''", "'") if match.group(1) is not None else match.group(2)
+        areas.append((sheet, match.group(3)))
+        position = match.end()
+        if position < len(text):
+            if text[position] != ",":
+                return []
+            position += 1
+    return areas
+
+
+def expand(coord: str) -> List[str]:
+    """Expand ``$A$1`` or ``$A$1:$B$2`` into plain cell references, row by row."""
+    corners = [_CELL.fullmatch(part) for part in coord.split(":")]
+    if not all(corners):
+        raise ValueError(f"Unsupported cell reference '{coord}'")
+    (first_col, first_row), (last_col, last_row) = [(m.group(1), int(m.group(2))) for m in (corners[0], corners[-1])]
+    cols = range(column_index(first_col), column_index(last_col) + 1)
+    return [f"{column_letters(col)}{row}" for row in range(first_row, last_row + 1) for col in cols]
+
+
+class XlsxReader:
+    """Read-only view over one workbook archive; use as a context manager."""
+
+    def __init__(self, path: PathLike) -> None:
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path)
+        self.sheet_paths: Dict[str, str] = {}
+        self.names: Dict[str, List[Destination]] = {}
+        self.date1904 = False
+        self._styles: Optional[List[Tuple[bool, bool]]] = None
+        self._read_workbook()
+
+    def __enter__(self) -> "XlsxReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def _read_workbook(self) -> None:
+        targets: Dict[str, str] = {}
+        with self._zip.open("xl/_rels/workbook.xml.rels") as handle:
+            for _, element in iterparse(handle):
+                if element.tag == f"{NS_PKG}Relationship":
+                    target = element.get("Target", "")
+                    targets[element.get("Id", "")] = target.lstrip("/") if target.startswith("/") else posixpath.normpath(f"xl/{target}")
+        with self._zip.open("xl/workbook.xml") as handle:
+            for _, element in iterparse(handle):
+                if element.tag == f"{NS_MAIN}sheet":
+                    target = targets.get(element.get(f"{NS_REL}id", ""))
+                    if target:
+                        self.sheet_paths[element.get("name", "")] = target
+                elif element.tag == f"{NS_MAIN}workbookPr":
+                    self.date1904 = element.get("date1904", "0") in ("1", "true")
+                elif element.tag == f"{NS_MAIN}definedName":
+                    if element.get("localSheetId") is None:  # sheet-scoped names are not workbook ranges
+                        self.names[element.get("name", "")] = parse_destinations((element.text or "").strip())
+
+    def _style_kinds(self) -> List[Tuple[bool, bool]]:
+        """Return (is_date, is_duration) per cellXfs entry."""
+        if self._styles is not None:
+            return self._styles
+        kinds: List[Tuple[bool, bool]] = []
+        custom: Dict[int, str] = {}
+        try:
+            handle = self._zip.open("xl/styles.xml")
+        except KeyError:
+            self._styles = kinds
+            return kinds
+        in_cell_xfs = False
+        with handle:
+            for event, element in iterparse(handle, events=("start", "end")):
+                if element.tag == f"{NS_MAIN}cellXfs":
+                    in_cell_xfs = event == "start"
+                elif event == "end" and element.tag == f"{NS_MAIN}numFmt":
+                    custom[int(element.get("numFmtId", "0"))] = element.get("formatCode", "")
+                elif event == "end" and element.tag == f"{NS_MAIN}xf" and in_cell_xfs:
+                    fmt_id = int(element.get("numFmtId", "0"))
+                    if fmt_id in custom:
+                        code = custom[fmt_id].split(";")[0]
+                        duration = bool(_DURATION.search(code))
+                        is_date = duration or bool(_DATE_TOKENS.search(_FORMAT_LITERALS.sub("", code)))
+                    else:
+                        is_date = fmt_id in _DATE_FORMAT_IDS
+                        duration = fmt_id in _DURATION_FORMAT_IDS
+                    kinds.append((is_date, duration))
+        self._styles = kinds
+        return kinds
+
+    def _shared_strings(self, wanted: Set[int]) -> Dict[int, str]:
+        strings: Dict[int, str] = {}
+        if not wanted:
+            return strings
+        last = max(wanted)
+        index = 0
+        with self._zip.open("xl/sharedStrings.xml") as handle:
+            for _, element in iterparse(handle):
+                if element.tag != f"{NS_MAIN}si":
+                    continue
+                if index in wanted:
+                    # Phonetic runs (rPh) are annotations, not part of the value
+                    phonetic = {id(t) for rph in element.iter(f"{NS_MAIN}rPh") for t in rph.iter(f"{NS_MAIN}t")}
+                    strings[index] = "".join(t.text or "" for t in element.iter(f"{NS_MAIN}t") if id(t) not in phonetic)
+                element.clear()
+                index += 1
+                if index > last:
+                    break
+        return strings
+
+    def _number(self, text: str, style: int) -> Any:
+        value: Any = float(text) if any(ch in text for ch in ".eE") else int(text)
+        kinds = self._style_kinds()
+        if style < len(kinds) and kinds[style][0]:
+            if kinds[style][1]:
+                return timedelta(days=value)
+            epoch = datetime(1904, 1, 1) if self.date1904 else datetime(1899, 12, 30)
+            if not self.date1904 and value < 60:
+                epoch += timedelta(days=1)  # Excel's phantom 1900-02-29
+            moment = epoch + timedelta(days=value)
+            # Like openpyxl, a date-styled fraction of a day is a time of day whatever the format
+            return moment.time() if 0 <= value < 1 else moment
+        return value
+
+    def read_cells(self, cells: Iterable[CellRef]) -> Dict[CellRef, Any]:
+        """Return cached values for ``(sheet, "A1")`` pairs; missing cells map to ``None``."""
+        by_sheet: Dict[str, Set[str]] = {}
+        for sheet, ref in cells:
+            by_sheet.setdefault(sheet, set()).add(ref.replace("$", ""))
+        values: Dict[CellRef, Any] = {}
+        pending_strings: Dict[CellRef, int] = {}
+        for sheet, refs in by_sheet.items():
+            for ref in refs:
+                values[(sheet, ref)] = None
+            member = self.sheet_paths.get(sheet)
+            if member is None:
+                continue
+            last_row = max(int(_CELL.fullmatch(ref).group(2)) for ref in refs)
+            remaining = set(refs)
+            row_number, column = 0, 0
+            with self._zip.open(member) as handle:
+                for event, element in iterparse(handle, events=("start", "end")):
+                    tag = element.tag
+                    if event == "start":
+                        if tag == f"{NS_MAIN}row":
+                            row_number = int(element.get("r") or row_number + 1)
+                            column = 0
+                            if row_number > last_row:
+                                break
+                        continue
+                    if tag == f"{NS_MAIN}c":
+                        ref = element.get("r")
+                        if ref is None:  # writers may omit r; cells then follow in column order
+                            column += 1
+                            ref = f"{column_letters(column)}{row_number}"
+                        else:
+                            column = column_index(_CELL.fullmatch(ref).group(1))
+                        if ref in remaining:
+                            remaining.discard(ref)
+                            kind = element.get("t", "n")
+                            raw = element.findtext(f"{NS_MAIN}v")
+                            if kind == "inlineStr":
+                                values[(sheet, ref)] = "".join(t.text or "" for t in element.iter(f"{NS_MAIN}t"))
+                            elif raw is None:
+                                pass
+                            elif kind == "s":
+                                pending_strings[(sheet, ref)] = int(raw)
+                            elif kind == "b":
+                                values[(sheet, ref)] = raw == "1"
+                            elif kind in ("str", "e"):
+                                values[(sheet, ref)] = raw
+                            else:
+                                values[(sheet, ref)] = self._number(raw, int(element.get("s", "0")))
+                        element.clear()
+                        if not remaining:
+                            break
+                    elif tag == f"{NS_MAIN}row":
+                        element.clear()
+        strings = self._shared_strings(set(pending_strings.values()))
+        for key, index in pending_strings.items():
+            values[key] = strings.get(index)
+        return values
+
+    def named_ranges(self) -> Dict[str, Dict[str, Any]]:
+        """Resolve every workbook-scoped name to its destinations and cell values."""
+        cells = {
+            name: [(sheet, ref) for sheet, coord in destinations if sheet in self.sheet_paths for ref in expand(coord)]
+            for name, destinations in self.names.items()
+        }
+        values = self.read_cells(cell for refs in cells.values() for cell in refs)
+        return {
+            name: {
+                "destinations": [[sheet, coord] for sheet, coord in self.names[name] if sheet in self.sheet_paths],
+                "values": [values[cell] for cell in refs],
+            }
+            for name, refs in cells.items()
+            if refs
+        }
+
+
+def defined_names(path: PathLike) -> Dict[str, List[Destination]]:
+    with XlsxReader(path) as reader:
+        return dict(reader.names)
+
+
+def named_range_values(path: PathLike) -> Dict[str, Dict[str, Any]]:
+    with XlsxReader(path) as reader:
+        return reader.named_ranges()
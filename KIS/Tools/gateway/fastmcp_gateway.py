@@ -3,25 +3,34 @@
 from __future__ import annotations
 
 import argparse
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import polars as pl
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from fastapi.testclient import TestClient
 from pydantic import BaseModel, Field
 
 from ...Engine.kis_estimator_core.stubs import (
     breaker_critic,
     breaker_placer,
+    bundle_expander,
     cover_tab_writer,
     doc_lint_guard,
     enclosure_solver,
     estimate_formatter,
     evidence,
+    pricing,
 )
-from ...Engine.kis_estimator_core.util import templates
+from ...Engine.kis_estimator_core.util import evidence_render, evidence_retention, profiling, templates
+from . import jobs
 
 app = FastAPI(title="KIS FastMCP Gateway", version="0.1.0-rc2")
 
@@ -35,9 +44,15 @@ class EstimateRequestModel(BaseModel):
     requested_totals: Dict[str, Any]
     document: Optional[Dict[str, Any]] = None
     brand: Optional[Dict[str, Any]] = None
+    accessories: Optional[List[Dict[str, Any]]] = None  # BOM lines (item_id or category, qty) for bundle rules
     case_id: str = Field(default=evidence.CASE_DEFAULT)
 
 
+class BatchEstimateRequestModel(BaseModel):
+    requests: List[EstimateRequestModel] = Field(..., min_length=1)
+    max_workers: int = Field(default=4, ge=1, le=16)
+
+
 class ValidationRequestModel(BaseModel):
     template_path: str | None = None
     expected_hash: str | None = None
@@ -75,20 +90,34 @@ def _raise_pipeline_error(stage: str, exc: Exception, stage_history: List[Dict[s
     raise HTTPException(status_code=422, detail=detail)
 
 
-def _run_pipeline(request: EstimateRequestModel) -> Dict[str, Any]:
+def _report_stage(
+    progress: Optional[jobs.ProgressCallback],
+    stage: str,
+    started: float,
+    metric: Dict[str, Any],
+) -> None:
+    if progress is not None:
+        progress(stage, (time.perf_counter() - started) * 1000.0, metric)
+
+
+@profiling.profiled("estimate_pipeline", category="gateway")
+def _run_pipeline(request: EstimateRequestModel, progress: Optional[jobs.ProgressCallback] = None) -> Dict[str, Any]:
     data = request.dict()
     case_id = data.get("case_id", evidence.CASE_DEFAULT)
 
     stage_reports: List[Dict[str, Any]] = []
     metrics = {"fit_score": None, "phase_balance": None, "lint_errors": None}
 
+    started = time.perf_counter()
     try:
         enclosure_report = enclosure_solver.solve(data, case_id=case_id)
         metrics["fit_score"] = enclosure_report["payload"].get("fit_score")
         stage_reports.append(_stage_entry("enclosure_solver", enclosure_report))
     except Exception as exc:  # [REAL-LOGIC] propagate solver failures with evidence trail
         _raise_pipeline_error("enclosure_solver", exc, stage_reports, metrics)
+    _report_stage(progress, "enclosure_solver", started, {"fit_score": metrics["fit_score"]})
 
+    started = time.perf_counter()
     try:
         breaker_report = breaker_placer.place(enclosure_report["payload"], data, case_id=case_id)
         critic_report = breaker_critic.review(breaker_report["payload"], case_id=case_id)
@@ -105,19 +134,50 @@ def _run_pipeline(request: EstimateRequestModel) -> Dict[str, Any]:
     }
     metrics["phase_balance"] = combined_breaker["payload"].get("phase_balance")
     stage_reports.append(_stage_entry("breaker_placer", combined_breaker))
-
+    _report_stage(progress, "breaker_placer", started, {"phase_balance": metrics["phase_balance"]})
+
+    bundle_report: Optional[Dict[str, Any]] = None
+    if data.get("accessories"):
+        started = time.perf_counter()
+        try:
+            bundle_report = bundle_expander.expand_bundles(data["accessories"], case_id=case_id)
+        except Exception as exc:  # [REAL-LOGIC] a bundle cycle in the rules fails the estimate with evidence
+            _raise_pipeline_error("bundle_expander", exc, stage_reports, metrics)
+        stage_reports.append(_stage_entry("bundle_expander", bundle_report))
+        _report_stage(
+            progress,
+            "bundle_expander",
+            started,
+            {"auxiliary_lines": len(bundle_report["payload"]["auxiliary_lines"])},
+        )
+
+    started = time.perf_counter()
     try:
         formatter_report = estimate_formatter.format_estimate(data, combined_breaker["payload"], case_id=case_id)
     except Exception as exc:
         _raise_pipeline_error("estimate_formatter", exc, stage_reports, metrics)
     stage_reports.append(_stage_entry("estimate_formatter", formatter_report))
-
+    _report_stage(
+        progress,
+        "estimate_formatter",
+        started,
+        {"grand_total": formatter_report["payload"].get("totals", {}).get("grand_total")},
+    )
+
+    started = time.perf_counter()
     try:
         cover_report = cover_tab_writer.generate(formatter_report["payload"], case_id=case_id)
     except Exception as exc:
         _raise_pipeline_error("cover_tab_writer", exc, stage_reports, metrics)
     stage_reports.append(_stage_entry("cover_tab_writer", cover_report))
-
+    _report_stage(
+        progress,
+        "cover_tab_writer",
+        started,
+        {"project_number": cover_report["payload"].get("summary", {}).get("project_number")},
+    )
+
+    started = time.perf_counter()
     try:
         lint_report = doc_lint_guard.inspect(formatter_report["payload"], cover_report["payload"], case_id=case_id)
     except Exception as exc:
@@ -126,6 +186,7 @@ def _run_pipeline(request: EstimateRequestModel) -> Dict[str, Any]:
 
     lint_payload = lint_report.get("payload", {})
     metrics["lint_errors"] = lint_payload.get("lint_errors")
+    _report_stage(progress, "doc_lint_guard", started, {"lint_errors": metrics["lint_errors"]})
 
     evidence_list: List[Dict[str, Any]] = [
         {"stage": entry["stage"], "artifacts": entry["artifacts"]}
@@ -152,6 +213,8 @@ def _run_pipeline(request: EstimateRequestModel) -> Dict[str, Any]:
         "next": ["/v1/validate", "/v1/rag/pack"],
         "metrics": metrics,
     }
+    if bundle_report is not None:
+        response["bundles"] = bundle_report["payload"]
     return response
 
 
@@ -165,6 +228,165 @@ def estimate(request: EstimateRequestModel) -> Dict[str, Any]:
     return _run_pipeline(request)
 
 
+def _warm_batch() -> int:
+    """Load the enclosure catalog, rules snapshot, pricing tables and bundle index; returns catalog rows."""
+    catalog_rows = enclosure_solver.warm_catalog()
+    pricing.warm_pricing()
+    bundle_expander.load_index()
+    return catalog_rows
+
+
+def _batch_requests(requests: List[EstimateRequestModel]) -> List[EstimateRequestModel]:
+    """Give cases that share a case_id (e.g. the default) their own ``<case_id>-<index>``.
+
+    Evidence names are ``<stage>_<microsecond timestamp>`` inside the case
+    directory, so concurrent cases of one case_id could overwrite each other.
+    """
+    counts = Counter(request.case_id for request in requests)
+    return [
+        request if counts[request.case_id] == 1 else request.model_copy(update={"case_id": f"{request.case_id}-{index:04d}"})
+        for index, request in enumerate(requests)
+    ]
+
+
+def _run_batch_case(index: int, request: EstimateRequestModel) -> Dict[str, Any]:
+    started = time.perf_counter()
+    entry: Dict[str, Any] = {"index": index, "project_id": request.project_id, "case_id": request.case_id}
+    stages: Dict[str, float] = {}
+
+    def progress(stage: str, ms: float, metric: Dict[str, Any]) -> None:
+        stages[stage] = round(ms, 3)
+
+    entry["stages"] = stages
+    try:
+        entry["response"] = _run_pipeline(request, progress)
+        entry["status_code"] = 200
+    except HTTPException as exc:  # [REAL-LOGIC] keep per-case quality gate detail without failing the batch
+        entry["status_code"] = exc.status_code
+        entry["error"] = exc.detail
+    except Exception as exc:
+        entry["status_code"] = 500
+        entry["error"] = {"error": str(exc)}
+    entry["ok"] = entry["status_code"] == 200
+    entry["ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+    # pool workers skip atexit: drain queued evidence and trace spans per case
+    evidence.flush()
+    profiling.flush()
+    return entry
+
+
+@app.post("/v1/estimate/batch")
+def estimate_batch(batch: BatchEstimateRequestModel) -> Dict[str, Any]:
+    started = time.perf_counter()
+    requests = _batch_requests(batch.requests)
+    catalog_rows = _warm_batch()
+    workers = min(batch.max_workers, len(requests), os.cpu_count() or 1)
+    if workers == 1:
+        results = [_run_batch_case(index, request) for index, request in enumerate(requests)]
+    else:
+        # [REAL-LOGIC] processes, not threads: the CPU-bound stages would serialise on the
+        # GIL. Spawned workers import the gateway once (~1.2 s) and warm their caches.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_warm_batch) as pool:
+            results = list(pool.map(_run_batch_case, range(len(requests)), requests))
+    wall_ms = (time.perf_counter() - started) * 1000.0
+    succeeded = sum(1 for item in results if item["ok"])
+    return {
+        "results": results,
+        "aggregate": {
+            "cases": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "workers": workers,
+            "catalog_rows": catalog_rows,
+            "wall_ms": round(wall_ms, 3),
+            "case_ms_sum": round(sum(item["ms"] for item in results), 3),
+            "throughput_per_s": round(len(results) / (wall_ms / 1000.0), 3) if wall_ms else None,
+        },
+    }
+
+
+def _job_links(job_id: str) -> Dict[str, str]:
+    return {
+        "self": f"/v1/estimate/jobs/{job_id}",
+        "events": f"/v1/estimate/jobs/{job_id}/events",
+    }
+
+
+def _require_job(job_id: str) -> jobs.EstimateJob:
+    job = jobs.REGISTRY.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail={"job_id": job_id, "error": "Job not found or expired"})
+    return job
+
+
+@app.post("/v1/estimate/jobs", status_code=202)
+def submit_estimate_job(request: EstimateRequestModel) -> Dict[str, Any]:
+    job = jobs.REGISTRY.submit(request.project_id, lambda progress: _run_pipeline(request, progress))
+    return {"job_id": job.job_id, "status": job.status, "links": _job_links(job.job_id)}
+
+
+@app.get("/v1/estimate/jobs/{job_id}")
+def get_estimate_job(job_id: str) -> Dict[str, Any]:
+    job = _require_job(job_id)
+    return {**job.snapshot(), "links": _job_links(job_id)}
+
+
+@app.get("/v1/estimate/jobs/{job_id}/events")
+def stream_estimate_job(job_id: str) -> StreamingResponse:
+    job = _require_job(job_id)
+    return StreamingResponse(
+        jobs.REGISTRY.stream(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+_EVIDENCE_MEDIA_TYPES = {
+    ".json": "application/json",
+    ".parquet": "application/vnd.apache.parquet",
+    **evidence_render.MEDIA_TYPES,
+}
+
+
+@app.get("/v1/evidence/{path:path}")
+def get_evidence(path: str) -> Response:
+    case_id, _, name = path.partition("/")
+    if not case_id or not name or "/" in name or ".." in (case_id, name):
+        raise HTTPException(status_code=400, detail={"path": path, "error": "Expected <case_id>/<artifact name>"})
+    artifact = evidence.artifact_path(case_id, name)
+    try:
+        content = evidence.read_artifact(artifact)
+    except PermissionError as exc:
+        raise HTTPException(status_code=403, detail={"path": path, "error": str(exc)}) from exc
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail={"path": path, "error": "Evidence artifact not found"}) from exc
+    return Response(
+        content,
+        media_type=_EVIDENCE_MEDIA_TYPES.get(artifact.suffix, "application/octet-stream"),
+        headers={"Cache-Control": "private, max-age=3600"},  # artifacts are write-once
+    )
+
+
+RETENTION_INTERVAL_ENV = "KIS_RETENTION_INTERVAL"
+_RETENTION = evidence_retention.RetentionRunner()
+
+
+@app.on_event("startup")
+def _start_retention() -> None:
+    # Opt-in: long-running installs set the seconds between retention steps.
+    interval = os.environ.get(RETENTION_INTERVAL_ENV, "").strip()
+    if interval:
+        _RETENTION.start(float(interval))
+
+
+@app.on_event("shutdown")
+def _shutdown_jobs() -> None:
+    jobs.REGISTRY.shutdown()
+    _RETENTION.stop()
+    evidence.flush()
+
+
 @app.post("/v1/validate")
 def validate(request: ValidationRequestModel) -> Dict[str, Any]:
     registry_report = templates.validate_templates()
@@ -240,15 +462,33 @@ def _selftest() -> None:
     }
     estimate_response = client.post("/v1/estimate", json=sample_request)
     estimate_response.raise_for_status()
-    client.post("/v1/validate", json={}).raise_for_status()
-    print("Selftest OK: /v1/estimate, /v1/validate")
+    job_response = client.post("/v1/estimate/jobs", json=sample_request)
+    job_response.raise_for_status()
+    job_id = job_response.json()["job_id"]
+    events = client.get(f"/v1/estimate/jobs/{job_id}/events")
+    events.raise_for_status()
+    job_status = client.get(f"/v1/estimate/jobs/{job_id}").json()
+    if job_status["status"] != "succeeded":
+        raise RuntimeError(f"Estimate job did not succeed: {job_status.get('error')}")
+    validate_response = client.post("/v1/validate", json={})
+    validate_response.raise_for_status()
+    visual = Path(validate_response.json()["evidence"][1])
+    client.get(f"/v1/evidence/{evidence.CASE_DEFAULT}/{visual.name}").raise_for_status()
+    print("Selftest OK: /v1/estimate, /v1/estimate/jobs, /v1/validate, /v1/evidence")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="KIS FastMCP Gateway helper")
     parser.add_argument("--selftest", action="store_true", help="Run pipeline smoke test")
+    parser.add_argument("--profile", nargs="?", const="", metavar="TRACE", help="Write a Chrome trace of every stage")
+    parser.add_argument("--cprofile", action="store_true", help="Dump cProfile stats per top-level stage")
     args = parser.parse_args()
+    if args.profile is not None:
+        profiling.enable(args.profile or None, cprofile=args.cprofile)
     if args.selftest:
         _selftest()
+        trace_path = profiling.flush()
+        if trace_path:
+            print(f"Profile trace written to {trace_path}")
     else:
         parser.print_help()
@@ -0,0 +1,153 @@
+"""In-process job registry backing the asynchronous estimate endpoints."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from fastapi import HTTPException
+
+JOB_TTL_SECONDS = 900.0
+JOB_WORKERS = 2
+STREAM_POLL_SECONDS = 15.0
+
+TERMINAL_STATES = {"succeeded", "failed"}
+
+ProgressCallback = Callable[[str, float, Dict[str, Any]], None]
+
+
+def _utc_iso() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+@dataclass
+class EstimateJob:
+    job_id: str
+    project_id: str
+    status: str = "queued"
+    created_at: str = field(default_factory=_utc_iso)
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, Any]] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    finished_monotonic: Optional[float] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "project_id": self.project_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "stages": [event for event in self.events if event["event"] == "stage"],
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobRegistry:
+    """Track estimate jobs, run them on a worker pool and evict stale results."""
+
+    def __init__(self, ttl_seconds: float = JOB_TTL_SECONDS, workers: int = JOB_WORKERS) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, EstimateJob] = {}
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="estimate-job")
+
+    def submit(self, project_id: str, runner: Callable[[ProgressCallback], Dict[str, Any]]) -> EstimateJob:
+        self.evict_expired()
+        job = EstimateJob(job_id=f"job_{uuid.uuid4().hex[:16]}", project_id=project_id)
+        with self._cond:
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._execute, job, runner)
+        return job
+
+    def get(self, job_id: str) -> Optional[EstimateJob]:
+        self.evict_expired()
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def evict_expired(self) -> int:
+        cutoff = time.monotonic() - self.ttl_seconds
+        with self._cond:
+            expired = [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job.finished_monotonic is not None and job.finished_monotonic < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+    def stream(self, job: EstimateJob, poll_seconds: float = STREAM_POLL_SECONDS) -> Iterator[str]:
+        """Yield server-sent events for a job until it reaches a terminal state."""
+        cursor = 0
+        while True:
+            with self._cond:
+                while cursor >= len(job.events) and job.status not in TERMINAL_STATES:
+                    if not self._cond.wait(timeout=poll_seconds):
+                        break
+                pending = job.events[cursor:]
+                cursor = len(job.events)
+                finished = job.status in TERMINAL_STATES
+            if not pending and not finished:
+                yield ": keep-alive\n\n"
+                continue
+            for event in pending:
+                yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+            if finished and cursor >= len(job.events):
+                return
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _publish(self, job: EstimateJob, event: Dict[str, Any]) -> None:
+        with self._cond:
+            self._append_event(job, event)
+
+    def _append_event(self, job: EstimateJob, event: Dict[str, Any]) -> None:
+        job.events.append({"seq": len(job.events) + 1, "ts": _utc_iso(), **event})
+        self._cond.notify_all()
+
+    def _execute(self, job: EstimateJob, runner: Callable[[ProgressCallback], Dict[str, Any]]) -> None:
+        with self._cond:
+            job.status = "running"
+            job.started_at = _utc_iso()
+
+        def progress(stage: str, ms: float, metric: Dict[str, Any]) -> None:
+            self._publish(job, {"event": "stage", "stage": stage, "ms": round(ms, 3), "metric": metric})
+
+        try:
+            result = runner(progress)
+        except HTTPException as exc:  # [REAL-LOGIC] keep quality gate detail for pollers
+            self._finish(job, "failed", error={"status_code": exc.status_code, "detail": exc.detail})
+        except Exception as exc:
+            self._finish(job, "failed", error={"status_code": 500, "detail": str(exc)})
+        else:
+            self._finish(job, "succeeded", result=result)
+
+    def _finish(
+        self,
+        job: EstimateJob,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        with self._cond:
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = _utc_iso()
+            job.finished_monotonic = time.monotonic()
+            self._append_event(job, {"event": "done", "status": status})
+
+
+REGISTRY = JobRegistry()
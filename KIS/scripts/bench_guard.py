@@ -0,0 +1,143 @@
+"""Micro-benchmark for cached guard decisions with symlink-escape parity checks."""
+
+from __future__ import annotations
+
+import argparse
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+PARENT = ROOT.parent
+if str(PARENT) not in sys.path:
+    sys.path.insert(0, str(PARENT))
+
+from KIS.Engine.kis_estimator_core.util import guard, io  # noqa: E402
+
+BENCH_DIR = ROOT / "Work" / "bench"
+RESULTS_DIR = BENCH_DIR / "logs"
+
+
+def _per_call_ns(check: Callable[[Path], None], paths: list[Path], rounds: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(rounds):
+        for path in paths:
+            check(path)
+    return (time.perf_counter_ns() - started) / (rounds * len(paths))
+
+
+def _outcome(check: Callable[..., None], path: Path, allow_directory: bool = False) -> str:
+    try:
+        check(path, allow_directory=allow_directory)
+    except PermissionError as exc:
+        return f"denied: {str(exc).split(':')[0]}"
+    return "allowed"
+
+
+ParityCase = tuple[str, Path, bool, Optional[Callable[[], None]]]
+
+
+def _swap_for_link(directory: Path, target: Path) -> Callable[[], None]:
+    def swap() -> None:
+        shutil.rmtree(directory)
+        directory.symlink_to(target, target_is_directory=True)
+
+    return swap
+
+
+def parity_cases(sandbox: Path, outside: Path) -> list[ParityCase]:
+    """Build allowed and escaping paths, including symlinks out of the whitelist.
+
+    A case with a mutation is checked once, mutated, then checked again, so a
+    decision cached before a directory was swapped for a symlink is caught.
+    """
+    (sandbox / "real").mkdir(parents=True, exist_ok=True)
+    (outside / "secret.json").write_text("{}", encoding="utf-8")
+    cases = [
+        ("plain file", sandbox / "real" / "a.json", False, None),
+        ("bad suffix", sandbox / "real" / "a.exe", False, None),
+        ("missing suffix", sandbox / "real" / "a", False, None),
+        ("directory", sandbox / "real", True, None),
+        ("outside root", outside / "secret.json", False, None),
+        ("dotdot escape", sandbox / ".." / ".." / ".." / ".." / "x.json", False, None),
+    ]
+    try:
+        (sandbox / "dir_link").symlink_to(outside, target_is_directory=True)
+        (sandbox / "file_link.json").symlink_to(outside / "secret.json")
+        (sandbox / "real" / "inner_link").symlink_to(sandbox / "real", target_is_directory=True)
+    except (OSError, NotImplementedError):  # [REAL-LOGIC] Windows without symlink privilege
+        return cases
+    cases += [
+        ("symlinked dir escape", sandbox / "dir_link" / "secret.json", False, None),
+        ("symlinked file escape", sandbox / "file_link.json", False, None),
+        ("symlink then dotdot", sandbox / "dir_link" / ".." / "x.json", False, None),
+        ("symlink inside root", sandbox / "real" / "inner_link" / "b.json", False, None),
+    ]
+    swapped = sandbox / "swapped" / "sub"
+    swapped.mkdir(parents=True, exist_ok=True)
+    cases.append(("dir swapped for symlink", swapped / "x.json", False, _swap_for_link(swapped, outside)))
+    return cases
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark guard.ensure_whitelisted against the uncached check")
+    parser.add_argument("--paths", type=int, default=2000, help="Distinct artifact paths per round")
+    parser.add_argument("--dirs", type=int, default=20, help="Distinct directories the paths spread over")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--label", default="local")
+    args = parser.parse_args(argv)
+
+    sandbox = BENCH_DIR / "guard_sandbox"
+    outside = Path(tempfile.mkdtemp(prefix="kis_guard_outside_"))
+    try:
+        cases = parity_cases(sandbox, outside)
+        parity = []
+        for label, path, allow_directory, mutate in cases:
+            guard.clear_cache()
+            if mutate is not None:
+                _outcome(guard.ensure_whitelisted, path, allow_directory)  # prime the cache
+                mutate()
+            expected = _outcome(guard.ensure_whitelisted_uncached, path, allow_directory)
+            cold = _outcome(guard.ensure_whitelisted, path, allow_directory)
+            warm = _outcome(guard.ensure_whitelisted, path, allow_directory)
+            parity.append({"case": label, "uncached": expected, "cached": cold, "match": expected == cold == warm})
+    finally:
+        shutil.rmtree(sandbox, ignore_errors=True)
+        shutil.rmtree(outside, ignore_errors=True)
+
+    paths = [
+        ROOT / "Work" / f"case-{idx % args.dirs:04d}" / "output" / "evidence" / f"stage_{idx:06d}.json"
+        for idx in range(args.paths)
+    ]
+    uncached_ns = _per_call_ns(guard.ensure_whitelisted_uncached, paths, args.rounds)
+    guard.clear_cache()
+    cached_ns = _per_call_ns(guard.ensure_whitelisted, paths, args.rounds)
+    info = guard._directory_decision.cache_info()
+
+    report: dict[str, Any] = {
+        "label": args.label,
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "params": {"paths": args.paths, "dirs": args.dirs, "rounds": args.rounds},
+        "uncached_ns_per_call": round(uncached_ns, 1),
+        "cached_ns_per_call": round(cached_ns, 1),
+        "speedup": round(uncached_ns / cached_ns, 2) if cached_ns else None,
+        "cache": {"hits": info.hits, "misses": info.misses, "size": info.currsize},
+        "parity": parity,
+    }
+    output_path = io.write_json(RESULTS_DIR / f"bench_guard_{args.label}.json", report)
+    for row in parity:
+        print(f"{'ok ' if row['match'] else 'MISMATCH'} {row['case']:<24} {row['cached']}")
+    print(f"uncached {uncached_ns:,.0f} ns/call, cached {cached_ns:,.0f} ns/call ({report['speedup']}x)")
+    print(f"Benchmark results written to {output_path}")
+    if not all(row["match"] for row in parity):
+        raise AssertionError("Cached guard decisions diverge from the uncached check")
+
+
+if __name__ == "__main__":
+    main()
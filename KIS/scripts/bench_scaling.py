@@ -0,0 +1,153 @@
+"""Scaling benchmark for estimator core stages on synthetic requests."""
+
+from __future__ import annotations
+
+import argparse
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from typing import Any, Callable
+
+import polars as pl
+
+ROOT = Path(__file__).resolve().parents[1]
+PARENT = ROOT.parent
+if str(PARENT) not in sys.path:
+    sys.path.insert(0, str(PARENT))
+
+from KIS.Engine.kis_estimator_core.stubs import (  # noqa: E402
+    breaker_placer,
+    enclosure_solver,
+    estimate_formatter,
+    evidence,
+)
+from KIS.Engine.kis_estimator_core.util import io  # noqa: E402
+from KIS.scripts import synthetic_cases  # noqa: E402
+
+BENCH_CASE_ID = "bench"
+RESULTS_DIR = ROOT / "Work" / BENCH_CASE_ID / "logs"
+DEFAULT_SIZES = (10, 100, 1000, 5000)
+STAGES = ("enclosure_solver", "breaker_placer", "estimate_formatter", "evidence.write_stage", "evidence.flush")
+
+
+def _measure(fn: Callable[[], Any]) -> tuple[Any, float, int]:
+    """Run ``fn`` and return its result, wall ms and Python heap peak in bytes."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = fn()
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed_ms, peak
+
+
+def bench_size(n_loads: int, catalog_size: int, seed: int, phase_mix: str) -> dict[str, dict[str, float]]:
+    request = synthetic_cases.generate_request(n_loads, seed, phase_mix, case_id=BENCH_CASE_ID)
+    catalog_path = ROOT / "Work" / BENCH_CASE_ID / "input" / f"enclosures_{catalog_size}_{seed}.csv"
+    synthetic_cases.write_catalog(synthetic_cases.generate_catalog(request, catalog_size, seed), catalog_path)
+    enclosure_solver.warm_catalog(catalog_path)
+
+    samples: dict[str, dict[str, float]] = {}
+    plan, ms, peak = _measure(lambda: enclosure_solver.solve(request, case_id=BENCH_CASE_ID, catalog_path=catalog_path))
+    samples["enclosure_solver"] = {"ms": ms, "peak_bytes": peak}
+
+    placement, ms, peak = _measure(lambda: breaker_placer.place(plan["payload"], request, case_id=BENCH_CASE_ID))
+    samples["breaker_placer"] = {"ms": ms, "peak_bytes": peak}
+
+    formatted, ms, peak = _measure(
+        lambda: estimate_formatter.format_estimate(request, placement["payload"], case_id=BENCH_CASE_ID)
+    )
+    samples["estimate_formatter"] = {"ms": ms, "peak_bytes": peak}
+
+    loads_table = pl.from_dicts(request["loads"])
+    _, ms, peak = _measure(
+        lambda: evidence.write_stage(
+            "bench_scaling",
+            formatted["payload"],
+            case_id=BENCH_CASE_ID,
+            inputs={"placement": {"phase_balance": placement["payload"]["phase_balance"]}},
+            tables={"loads": loads_table},
+        )
+    )
+    samples["evidence.write_stage"] = {"ms": ms, "peak_bytes": peak}
+
+    _, ms, peak = _measure(evidence.flush)
+    samples["evidence.flush"] = {"ms": ms, "peak_bytes": peak}
+    return samples
+
+
+def run(sizes: list[int], catalog_size: int, seed: int, phase_mix: str, repeat: int) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for n_loads in sizes:
+        runs = [bench_size(n_loads, catalog_size, seed, phase_mix) for _ in range(repeat)]
+        for stage in STAGES:
+            timings = [sample[stage]["ms"] for sample in runs]
+            peaks = [sample[stage]["peak_bytes"] for sample in runs]
+            rows.append({
+                "loads": n_loads,
+                "stage": stage,
+                "ms_median": round(median(timings), 3),
+                "ms_min": round(min(timings), 3),
+                "peak_kb": round(max(peaks) / 1024.0, 1),
+            })
+            print(f"{n_loads:>5} loads  {stage:<22} {rows[-1]['ms_median']:>10.2f} ms  {rows[-1]['peak_kb']:>10.1f} KiB")
+    return rows
+
+
+def compare(current: list[dict[str, Any]], previous: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return per (loads, stage) ratios of current over previous median timings."""
+    reference = {(row["loads"], row["stage"]): row for row in previous}
+    diff: list[dict[str, Any]] = []
+    for row in current:
+        before = reference.get((row["loads"], row["stage"]))
+        if not before or not before["ms_median"]:
+            continue
+        diff.append({
+            "loads": row["loads"],
+            "stage": row["stage"],
+            "ms_ratio": round(row["ms_median"] / before["ms_median"], 3),
+            "peak_ratio": round(row["peak_kb"] / before["peak_kb"], 3) if before["peak_kb"] else None,
+        })
+    return diff
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark estimator stages across synthetic request sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--catalog-size", type=int, default=200)
+    parser.add_argument("--phase-mix", choices=sorted(synthetic_cases.PHASE_MIXES), default="mixed")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--label", default="local", help="Name for the result file, e.g. a commit id")
+    parser.add_argument("--compare", type=Path, help="Earlier result file to diff against")
+    args = parser.parse_args(argv)
+
+    rows = run(args.sizes, args.catalog_size, args.seed, args.phase_mix, args.repeat)
+    report: dict[str, Any] = {
+        "label": args.label,
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "params": {
+            "sizes": args.sizes,
+            "catalog_size": args.catalog_size,
+            "phase_mix": args.phase_mix,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": rows,
+    }
+    if args.compare:
+        report["compare"] = {"against": str(args.compare), "diff": compare(rows, io.read_json(args.compare)["results"])}
+
+    output_path = io.write_json(RESULTS_DIR / f"bench_scaling_{args.label}.json", report)
+    print(f"Benchmark results written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
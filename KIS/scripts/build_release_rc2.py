@@ -13,6 +13,11 @@ ROOT = Path(__file__).resolve().parents[1]
 if hasattr(sys.stdout, "reconfigure"):
     sys.stdout.reconfigure(encoding="utf-8")
 WORKSPACE = ROOT.parent
+if str(WORKSPACE) not in sys.path:
+    sys.path.insert(0, str(WORKSPACE))
+
+from KIS.Engine.kis_estimator_core.util import evidence_retention  # noqa: E402
+
 DIST = WORKSPACE / "dist"
 METRICS_PATH = ROOT / "Work" / "2025-0001" / "logs" / "regression_metrics.json"
 EVIDENCE_DIR = ROOT / "Work" / "2025-0001" / "output" / "evidence"
@@ -29,10 +34,20 @@ def _ensure_metrics() -> dict:
         return json.load(handle)
 
 
+EVIDENCE_ARCHIVE_FILES = {"evidence_archive.log", "evidence_index.log"}
+
+
 def _count_evidence() -> int:
     if not EVIDENCE_DIR.exists():
         return 0
-    return sum(1 for path in EVIDENCE_DIR.glob("**/*") if path.is_file())
+    loose = sum(1 for path in EVIDENCE_DIR.glob("**/*") if path.is_file() and path.name not in EVIDENCE_ARCHIVE_FILES)
+    index_path = EVIDENCE_DIR / "evidence_index.log"
+    if not index_path.exists():
+        return loose
+    # [REAL-LOGIC] archived artifacts count once per virtual path, later appends replace earlier ones
+    with index_path.open("r", encoding="utf-8") as handle:
+        archived = {json.loads(line)["name"] for line in handle if line.strip()}
+    return loose + len(archived)
 
 
 def build_manifest(metrics: dict) -> Path:
@@ -95,8 +110,14 @@ def summary_lines(metrics: dict) -> list[str]:
     ]
 
 
+def hold_released_evidence() -> Path:
+    """Exempt the released case from evidence retention."""
+    return evidence_retention.hold(EVIDENCE_DIR.parents[1].name, f"released {VERSION}")
+
+
 def run_build(metrics: dict) -> None:
     manifest_path = build_manifest(metrics)
+    hold_released_evidence()
     write_release_notes(manifest_path, metrics)
     for line in summary_lines(metrics):
         print(line)
@@ -0,0 +1,59 @@
+"""Validate the rule sources and compile them into the shared rules snapshot."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PARENT = ROOT.parent
+if str(PARENT) not in sys.path:
+    sys.path.insert(0, str(PARENT))
+
+from KIS.Engine.kis_estimator_core.util import rules_snapshot  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compile KIS/Rules into a binary snapshot engines load in milliseconds")
+    parser.add_argument("--rules", type=Path, default=rules_snapshot.RULES_DIR, help="Rules directory")
+    parser.add_argument("--out", type=Path, default=rules_snapshot.SNAPSHOT_PATH, help="Snapshot file (the guard admits only the default .pkl path)")
+    parser.add_argument("--check", action="store_true", help="Validate the sources and report staleness without writing")
+    parser.add_argument("--force", action="store_true", help="Rebuild even when the snapshot is current")
+    args = parser.parse_args(argv)
+
+    existing = rules_snapshot.read_snapshot(args.out)
+    stale = rules_snapshot.stale_sources(existing, args.rules) if existing else sorted(rules_snapshot.SOURCES)
+    started = time.perf_counter()
+    try:
+        snapshot = rules_snapshot.compile_rules(args.rules)
+    except rules_snapshot.RulesError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    compile_ms = (time.perf_counter() - started) * 1000.0
+
+    written = False
+    if not args.check and (args.force or stale):
+        rules_snapshot.write_snapshot(snapshot, args.out)
+        written = True
+    report = {
+        "snapshot": str(args.out),
+        "digest": snapshot["digest"],
+        "sources": len(snapshot["sources"]),
+        "stale": stale,
+        "written": written,
+        "compile_ms": round(compile_ms, 2),
+    }
+    if args.out.exists():
+        started = time.perf_counter()
+        rules_snapshot.read_snapshot(args.out)
+        report["load_ms"] = round((time.perf_counter() - started) * 1000.0, 2)
+        report["bytes"] = args.out.stat().st_size
+    print(json.dumps(report, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
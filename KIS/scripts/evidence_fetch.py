@@ -0,0 +1,45 @@
+"""Fetch or list evidence artifacts, rendering SVG/PNG visuals on demand."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PARENT = ROOT.parent
+if str(PARENT) not in sys.path:
+    sys.path.insert(0, str(PARENT))
+
+from KIS.Engine.kis_estimator_core.stubs import evidence  # noqa: E402
+from KIS.Engine.kis_estimator_core.util import guard  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Fetch an evidence artifact by <case_id>/<name>")
+    parser.add_argument("path", nargs="?", help="<case_id>/<artifact name>, e.g. 2025-0001/validate_<ts>.svg")
+    parser.add_argument("--out", type=Path, help="Write the artifact here instead of stdout")
+    parser.add_argument("--list", metavar="CASE", help="List the artifacts recorded for CASE")
+    parser.add_argument("--stage", help="With --list, only this stage")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for entry in evidence.list_artifacts(args.list, stage=args.stage):
+            print(f"{entry['timestamp']}  {entry['stage']:<24} {entry['name']}")
+        return
+    if not args.path or "/" not in args.path:
+        parser.error("path must look like <case_id>/<artifact name>")
+
+    case_id, _, name = args.path.partition("/")
+    content = evidence.read_artifact(evidence.artifact_path(case_id, name))
+    if args.out:
+        guard.ensure_whitelisted(args.out)
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_bytes(content)
+        print(f"Wrote {len(content)} bytes to {args.out}")
+    else:
+        sys.stdout.buffer.write(content)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Garbage-collect the content-addressed evidence store."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PARENT = ROOT.parent
+if str(PARENT) not in sys.path:
+    sys.path.insert(0, str(PARENT))
+
+from KIS.Engine.kis_estimator_core.util import blob_store  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Release evidence runs and delete unreferenced blobs")
+    parser.add_argument("--root", type=Path, default=blob_store.DEFAULT_ROOT, help="Evidence store root")
+    parser.add_argument("--release-case", action="append", default=[], metavar="CASE", help="Drop every run manifest of CASE first")
+    parser.add_argument("--grace", type=float, default=blob_store.GC_GRACE_SECONDS, help="Keep blobs younger than this many seconds")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be deleted")
+    parser.add_argument("--stats", action="store_true", help="Only print store statistics")
+    args = parser.parse_args(argv)
+
+    store = blob_store.BlobStore(args.root)
+    if args.stats:
+        print(json.dumps(store.stats(), indent=2, sort_keys=True))
+        return
+
+    released = 0
+    for case_id in args.release_case:
+        for manifest_path in list(store.manifests(case_id)):
+            if not args.dry_run:
+                store.release(manifest_path)
+            released += 1
+
+    report = store.gc(grace_seconds=args.grace, dry_run=args.dry_run)
+    report["manifests_released"] = released
+    report.update({f"after_{key}": value for key, value in store.stats().items()})
+    print(json.dumps(report, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Apply the evidence retention policy once or keep it running in the background."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PARENT = ROOT.parent
+if str(PARENT) not in sys.path:
+    sys.path.insert(0, str(PARENT))
+
+from KIS.Engine.kis_estimator_core.util import evidence_retention  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Expire and compact evidence and engine work directories")
+    parser.add_argument("--policy", type=Path, default=evidence_retention.DEFAULT_POLICY_PATH)
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be reclaimed without deleting")
+    parser.add_argument("--rate", type=int, help="Override max_bytes_per_second (0 = unthrottled)")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="Process one target every SECONDS until interrupted")
+    parser.add_argument("--hold", metavar="CASE", help="Exempt CASE from retention and exit")
+    parser.add_argument("--reason", default="released", help="Reason recorded with --hold")
+    parser.add_argument("--release-hold", metavar="CASE", help="Remove the retention hold of CASE and exit")
+    args = parser.parse_args(argv)
+
+    if args.hold:
+        print(f"Hold written: {evidence_retention.hold(args.hold, args.reason)}")
+        return
+    if args.release_hold:
+        released = evidence_retention.release_hold(args.release_hold)
+        print(f"Hold {'released' if released else 'not present'} for {args.release_hold}")
+        return
+
+    policy = evidence_retention.RetentionPolicy.load(args.policy)
+    if args.rate is not None:
+        policy.max_bytes_per_second = args.rate
+    runner = evidence_retention.RetentionRunner(policy, dry_run=args.dry_run)
+
+    if args.watch:
+        runner.start(args.watch)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            runner.stop()
+        return
+
+    report = runner.run_once()
+    print(json.dumps({key: report[key] for key in ("bytes_reclaimed", "files_removed", "runs_removed", "tables_compacted", "dry_run")}, indent=2))
+    print(f"Full report: {evidence_retention.REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import argparse
 import json
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from statistics import mean
+from typing import Any
 
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -14,11 +20,18 @@ PARENT = ROOT.parent
 if str(PARENT) not in sys.path:
     sys.path.insert(0, str(PARENT))
 
+from KIS.Engine.kis_estimator_core.stubs import evidence  # noqa: E402
 from KIS.Engine.kis_estimator_core.util import io  # noqa: E402
-from KIS.Tools.gateway.fastmcp_gateway import app  # noqa: E402
+from KIS.Tools.gateway.fastmcp_gateway import EstimateRequestModel, _run_pipeline, app  # noqa: E402
 
 client = TestClient(app)
 
+METRICS_PATH = ROOT / "Work" / "2025-0001" / "logs" / "regression_metrics.json"
+BASELINE_PATH = ROOT / "tests" / "regression" / "latency_baseline.json"
+LATENCY_TOLERANCE = 0.25
+LATENCY_SLACK_MS = 5.0
+PERCENTILES = (50, 95, 99)
+
 
 def _verify_metrics(case_id: str, metrics: dict[str, float]) -> None:
     if metrics.get("fit_score", 0.0) < 0.80:
@@ -29,44 +42,192 @@ def _verify_metrics(case_id: str, metrics: dict[str, float]) -> None:
         raise AssertionError(f"[{case_id}] lint errors present: {metrics.get('lint_errors')}")
 
 
-def run_case(case_path: Path) -> dict[str, float]:
-    payload = json.loads(case_path.read_text(encoding="utf-8-sig"))
-    response = client.post("/v1/estimate", json=payload)
-    if response.status_code != 200:
-        detail = response.json()
-        raise RuntimeError(f"Regression case failed ({case_path.name}): {detail}")
-    body = response.json()
+def _load_case(case_path: Path) -> dict:
+    return json.loads(case_path.read_text(encoding="utf-8-sig"))
+
+
+def run_case(case_path: Path) -> dict[str, Any]:
+    """Run one case through the gateway pipeline and record per-stage wall time."""
+    payload = _load_case(case_path)
+    stages: dict[str, float] = {}
+
+    def progress(stage: str, ms: float, metric: dict[str, Any]) -> None:
+        stages[stage] = round(ms, 3)
+
+    started = time.perf_counter()
+    try:
+        body = _run_pipeline(EstimateRequestModel(**payload), progress)
+    except HTTPException as exc:
+        raise RuntimeError(f"Regression case failed ({case_path.name}): {exc.detail}") from exc
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    # Evidence is written in the background; drain it here since pool workers skip atexit.
+    failed_writes = evidence.flush()
+    if failed_writes:
+        raise RuntimeError(f"Evidence write failed ({case_path.name}): {failed_writes}")
+
     metrics = body.get("metrics", {})
     _verify_metrics(payload.get("project_id", case_path.stem), metrics)
-    return metrics
+    return {"case": case_path.name, "metrics": metrics, "ms": round(elapsed_ms, 3), "stages": stages}
+
+
+def run_batch(case_paths: list[Path], max_workers: int) -> list[dict[str, Any]]:
+    payloads = [_load_case(case_path) for case_path in case_paths]
+    response = client.post("/v1/estimate/batch", json={"requests": payloads, "max_workers": max_workers})
+    response.raise_for_status()
+    body = response.json()
 
+    collected: list[dict[str, Any]] = []
+    for case_path, payload, result in zip(case_paths, payloads, body["results"]):
+        if not result["ok"]:
+            raise RuntimeError(f"Regression case failed ({case_path.name}): {result.get('error')}")
+        metrics = result["response"].get("metrics", {})
+        _verify_metrics(payload.get("project_id", case_path.stem), metrics)
+        collected.append({"case": case_path.name, "metrics": metrics, "ms": result["ms"], "stages": result["stages"]})
+    return collected
+
+
+def run_parallel(case_paths: list[Path], workers: int) -> list[dict[str, Any]]:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_case, case_paths))
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _latency_summary(values: list[float]) -> dict[str, float]:
+    summary = {f"p{pct}_ms": round(_percentile(values, pct), 3) for pct in PERCENTILES}
+    summary["mean_ms"] = round(mean(values), 3) if values else 0.0
+    summary["max_ms"] = round(max(values), 3) if values else 0.0
+    return summary
+
+
+def _stage_summary(collected: list[dict[str, Any]]) -> dict[str, dict[str, float]]:
+    per_stage: dict[str, list[float]] = {}
+    for item in collected:
+        for stage, ms in item["stages"].items():
+            per_stage.setdefault(stage, []).append(ms)
+    return {stage: _latency_summary(values) for stage, values in per_stage.items()}
+
+
+def _latency_regressions(summary: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    # [REAL-LOGIC] relative tolerance plus a small absolute slack keeps tiny cases from flapping
+    regressions: list[str] = []
+
+    def compare(label: str, current: dict[str, float], reference: dict[str, float]) -> None:
+        for key, reference_ms in reference.items():
+            if not key.startswith("p") or key not in current:
+                continue
+            limit = reference_ms * (1.0 + tolerance) + LATENCY_SLACK_MS
+            if current[key] > limit:
+                regressions.append(f"{label} {key} {current[key]:.1f} ms exceeds baseline limit {limit:.1f} ms")
+
+    compare("case", summary["latency"], baseline.get("latency", {}))
+    for stage, reference in baseline.get("stages", {}).items():
+        if stage in summary["stages"]:
+            compare(stage, summary["stages"][stage], reference)
+    return regressions
+
+
+def _load_baseline(path: Path, run_mode: str) -> dict[str, Any]:
+    """Read the latency baseline, refusing one recorded in a different run mode."""
+    baseline = io.read_json(path)
+    if baseline.get("mode") != run_mode:
+        raise RuntimeError(
+            f"Latency baseline {path} was recorded in {baseline.get('mode') or 'an unknown'} mode, not {run_mode}; "
+            "rerun in that mode or pass --update-baseline"
+        )
+    return baseline
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run KIS regression cases")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--batch", action="store_true", help="Submit all cases through /v1/estimate/batch")
+    mode.add_argument("--parallel", type=int, default=0, metavar="N", help="Run cases across N worker processes")
+    parser.add_argument("--workers", type=int, default=4, help="Batch worker count")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Latency baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=LATENCY_TOLERANCE, help="Allowed relative latency regression")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the latency baseline")
+    parser.add_argument("--gate", action="store_true", help="Fail instead of skipping the latency gate when no baseline exists")
+    args = parser.parse_args(argv)
 
-def main() -> None:
     cases_dir = ROOT / "tests" / "regression"
     case_paths = sorted(cases_dir.glob("cases_*.json"))
     if len(case_paths) != 20:
         raise RuntimeError("Expected 20 regression cases")
 
-    collected: list[dict[str, float]] = []
-    for case_path in case_paths:
-        metrics = run_case(case_path)
-        collected.append(metrics)
-
-    fit_scores = [item.get("fit_score", 0.0) for item in collected]
-    balances = [item.get("phase_balance", 0.0) for item in collected]
-    lint_errors = [item.get("lint_errors", 0) for item in collected]
+    if args.batch:
+        run_mode, workers = "batch", args.workers
+    elif args.parallel > 0:
+        run_mode, workers = "process_pool", args.parallel
+    else:
+        run_mode, workers = "sequential", 1
+    baseline = None
+    if not args.update_baseline and args.baseline.exists():
+        baseline = _load_baseline(args.baseline, run_mode)  # fail before the run, not after it
+    elif args.gate and not args.update_baseline:
+        raise RuntimeError(f"No latency baseline at {args.baseline}; record one with --update-baseline in {run_mode} mode")
+
+    started = time.perf_counter()
+    if run_mode == "batch":
+        collected = run_batch(case_paths, workers)
+    elif run_mode == "process_pool":
+        collected = run_parallel(case_paths, workers)
+    else:
+        collected = [run_case(case_path) for case_path in case_paths]
+    wall_ms = (time.perf_counter() - started) * 1000.0
+
+    fit_scores = [item["metrics"].get("fit_score", 0.0) for item in collected]
+    balances = [item["metrics"].get("phase_balance", 0.0) for item in collected]
+    lint_errors = [item["metrics"].get("lint_errors", 0) for item in collected]
 
     summary = {
         "cases": len(collected),
         "fit_score_avg": round(mean(fit_scores), 4),
         "phase_balance_avg": round(mean(balances), 4),
         "lint_zero_count": lint_errors.count(0),
+        "mode": run_mode,
+        "workers": workers,
+        "wall_ms": round(wall_ms, 3),
+        "throughput_per_s": round(len(collected) / (wall_ms / 1000.0), 3) if wall_ms else None,
+        "latency": _latency_summary([item["ms"] for item in collected]),
+        "stages": _stage_summary(collected),
+        "per_case": [{"case": item["case"], "ms": item["ms"], "stages": item["stages"]} for item in collected],
     }
 
-    output_path = ROOT / "Work" / "2025-0001" / "logs" / "regression_metrics.json"
-    io.write_json(output_path, summary)  # [REAL-LOGIC] Persist regression KPIs for release packaging
-
-    print("Regression suite completed: 20/20 cases")
+    regressions: list[str] = []
+    if args.update_baseline:
+        io.write_json(args.baseline, {
+            "generated_at": datetime.utcnow().isoformat() + "Z",
+            "mode": run_mode,
+            "workers": workers,
+            "latency": summary["latency"],
+            "stages": summary["stages"],
+        })
+        print(f"Latency baseline updated: {args.baseline}")
+    elif baseline is not None:
+        regressions = _latency_regressions(summary, baseline, args.tolerance)
+    else:
+        print(f"No latency baseline at {args.baseline}; skipping latency gate")
+    summary["latency_regressions"] = regressions
+
+    io.write_json(METRICS_PATH, summary)  # [REAL-LOGIC] Persist regression KPIs for release packaging
+
+    latency = summary["latency"]
+    print(
+        f"Regression suite completed: {len(collected)}/20 cases ({run_mode}, "
+        f"p50={latency['p50_ms']} ms, p95={latency['p95_ms']} ms, p99={latency['p99_ms']} ms, "
+        f"{summary['throughput_per_s']} cases/s)"
+    )
+    if regressions:
+        raise AssertionError("Latency regression detected:\n" + "\n".join(regressions))
 
 
 if __name__ == "__main__":
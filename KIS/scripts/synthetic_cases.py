@@ -0,0 +1,142 @@
+"""Seeded synthetic estimate requests and enclosure catalogs for scaling runs."""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+import sys
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+PARENT = ROOT.parent
+if str(PARENT) not in sys.path:
+    sys.path.insert(0, str(PARENT))
+
+from KIS.Engine.kis_estimator_core.util import guard, io  # noqa: E402
+
+MIN_LOADS = 10
+MAX_LOADS = 5000
+OUTPUT_DIR = ROOT / "Work" / "bench" / "input"
+
+# Share of loads pinned to each phase; "" leaves the phase to the breaker placer.
+PHASE_MIXES: dict[str, dict[str, float]] = {
+    "balanced": {"A": 1 / 3, "B": 1 / 3, "C": 1 / 3},
+    "skewed": {"A": 0.5, "B": 0.3, "C": 0.2},
+    "unassigned": {"": 1.0},
+    "mixed": {"A": 0.2, "B": 0.2, "C": 0.2, "": 0.4},
+}
+
+WIDTH_UNITS = (0.25, 0.45, 0.5, 1.0)
+IP_RATINGS = ("IP44", "IP54", "IP55", "IP56", "IP65", "IP66")
+CATALOG_COLUMNS = ("model", "W", "H", "D", "ip_rating", "max_heat_w", "slot_unit", "price")
+
+
+def generate_request(
+    n_loads: int,
+    seed: int,
+    phase_mix: str = "mixed",
+    case_id: str = "bench",
+) -> dict[str, Any]:
+    """Return a deterministic estimate request with ``n_loads`` loads."""
+    if not MIN_LOADS <= n_loads <= MAX_LOADS:
+        raise ValueError(f"n_loads must be between {MIN_LOADS} and {MAX_LOADS}")
+    if phase_mix not in PHASE_MIXES:
+        raise ValueError(f"Unknown phase mix '{phase_mix}'")
+
+    rng = random.Random(seed)
+    phases = list(PHASE_MIXES[phase_mix])
+    weights = list(PHASE_MIXES[phase_mix].values())
+    loads: list[dict[str, Any]] = []
+    for idx in range(n_loads):
+        load: dict[str, Any] = {
+            "id": f"L{idx + 1:05d}",
+            "width_unit": rng.choice(WIDTH_UNITS),
+            "heat_w": round(rng.uniform(20.0, 450.0), 1),
+            "kva": round(rng.uniform(1.0, 40.0), 2),
+        }
+        phase = rng.choices(phases, weights)[0]
+        if phase:
+            load["phase"] = phase
+        loads.append(load)
+
+    return {
+        "project_id": f"SYN-{n_loads:05d}-{phase_mix}-{seed}",
+        "case_id": case_id,
+        "site": {"country": "KR", "voltage_class": "LV", "ambient_c": 30},
+        "loads": loads,
+        "enclosure": {
+            "required_w": rng.choice((600, 800, 1000)),
+            "required_h": rng.choice((1800, 2000)),
+            "required_d": rng.choice((350, 400)),
+        },
+        "ip_min": "IP54",
+        "requested_totals": {"currency": "KRW", "granularity": "summary"},
+        "document": {
+            "client": "Synthetic Client",
+            "project_name": f"Synthetic {n_loads} loads",
+            "project_number": f"SYN-{seed:04d}-{n_loads}",
+            "date": "2025-01-01",
+        },
+        "brand": {"primary_color": "003366", "logo_ref": "assets/logo.svg", "font_size": 11},
+    }
+
+
+def generate_catalog(request: dict[str, Any], size: int, seed: int) -> list[dict[str, Any]]:
+    """Return ``size`` enclosure rows scaled to the request, at least one of them feasible."""
+    if size < 1:
+        raise ValueError("Catalog size must be positive")
+    rng = random.Random(seed)
+    total_heat = sum(float(load["heat_w"]) for load in request["loads"])
+    enclosure = request["enclosure"]
+
+    rows: list[dict[str, Any]] = []
+    for idx in range(size):
+        feasible = idx == 0
+        width = enclosure["required_w"] + rng.choice((0, 100, 200, 400)) if feasible else rng.randrange(500, 1700, 100)
+        height = enclosure["required_h"] + rng.choice((0, 200)) if feasible else rng.randrange(1600, 2700, 100)
+        depth = enclosure["required_d"] + rng.choice((0, 50, 100)) if feasible else rng.randrange(300, 850, 50)
+        heat_factor = rng.uniform(1.05, 1.4) if feasible else rng.uniform(0.6, 2.0)
+        rows.append({
+            "model": f"SYN-ENCL-{idx + 1:05d}",
+            "W": width,
+            "H": height,
+            "D": depth,
+            "ip_rating": "IP55" if feasible else rng.choice(IP_RATINGS),
+            "max_heat_w": round(total_heat * heat_factor, 1),
+            "slot_unit": rng.choice((1, 1.2, 1.5, 2.0)),
+            "price": rng.randrange(1_200_000, 4_000_000, 50_000),
+        })
+    return rows
+
+
+def write_catalog(rows: list[dict[str, Any]], path: Path) -> Path:
+    guard.ensure_whitelisted(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=CATALOG_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic estimator cases")
+    parser.add_argument("--loads", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--catalog-size", type=int, default=200)
+    parser.add_argument("--phase-mix", choices=sorted(PHASE_MIXES), default="mixed")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, default=OUTPUT_DIR)
+    args = parser.parse_args(argv)
+
+    for n_loads in args.loads:
+        request = generate_request(n_loads, args.seed, args.phase_mix)
+        stem = f"synthetic_{n_loads:05d}_{args.phase_mix}_{args.seed}"
+        io.write_json(args.out / f"{stem}.json", request, pretty=False)
+        write_catalog(generate_catalog(request, args.catalog_size, args.seed), args.out / f"{stem}_enclosures.csv")
+        print(f"Wrote {stem} ({n_loads} loads, {args.catalog_size} enclosures)")
+
+
+if __name__ == "__main__":
+    main()
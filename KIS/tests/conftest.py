@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import shutil
+import sys
+import uuid
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+KIS_ROOT = Path(__file__).resolve().parents[1]
+if str(KIS_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(KIS_ROOT.parent))
+
+
+@pytest.fixture
+def work_dir() -> Iterator[Path]:
+    """A scratch directory inside the guard sandbox (KIS/Work), removed afterwards."""
+    path = KIS_ROOT / "Work" / f"pytest-{uuid.uuid4().hex[:12]}"
+    path.mkdir(parents=True)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
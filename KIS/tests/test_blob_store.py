@@ -0,0 +1,35 @@
+import os
+import time
+
+from KIS.Engine.kis_estimator_core.util import blob_store
+
+
+def test_reused_blob_gets_a_fresh_grace_window(work_dir):
+    store = blob_store.BlobStore(work_dir / "store")
+    ref = store.put(b"payload", ".json")
+    path = store.blob_path(ref["sha256"], ref["suffix"])
+    stale = time.time() - 2 * blob_store.GC_GRACE_SECONDS
+    os.utime(path, (stale, stale))
+
+    store.put(b"payload", ".json")
+    assert path.stat().st_mtime > stale
+    assert store.gc()["blobs_removed"] == 0
+    assert path.exists()
+
+
+def test_gc_between_put_and_manifest_keeps_committed_blobs(work_dir, monkeypatch):
+    store = blob_store.BlobStore(work_dir / "store")
+    put = store.put
+
+    def put_then_collect(payload, suffix):
+        ref = put(payload, suffix)
+        store.gc(grace_seconds=-60)  # everything unmarked is collectable
+        return ref
+
+    monkeypatch.setattr(store, "put", put_then_collect)
+    store.commit("case-1", "enclosure", "20250101T000000000000", {"enclosure_20250101T000000000000.json": b"{}"})
+
+    blob = store.resolve("case-1", "enclosure_20250101T000000000000.json")
+    assert blob is not None and blob.read_bytes() == b"{}"
+    assert store.gc(grace_seconds=-60)["blobs_removed"] == 0
+    assert store.refcounts() == {(blob.stem, blob.suffix): 1}
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+
+from KIS.Engine.kis_estimator_core.stubs import bundle_expander, evidence
+from KIS.Engine.kis_estimator_core.util import artifact_sink, guard
+
+CATALOG = {
+    "accessories": {
+        "items": [
+            {"id": "MC", "category": "magnet"},
+            {"id": "RELAY", "category": "relay"},
+            {"id": "FUSE", "category": "fuse"},
+            {"id": "PBL", "category": "pbl"},
+        ]
+    }
+}
+BUNDLES = [
+    {
+        "id": "B_MC",
+        "if_item_category": "magnet",
+        "then_add": [{"item_id": "FUSE", "qty_per": 1}, {"item_id": "RELAY", "qty_per": 2}],
+        "labor_add_per_item_won": 100,
+        "class": "MANDATORY",
+        "explanations": ["magnets need fuses and relays"],
+    },
+    {
+        "id": "B_RELAY",
+        "if_item_category": "relay",
+        "then_add": [{"item_id": "PBL", "qty_per": 3, "flags": ["SS_added"]}],
+        "labor_add_per_item_won": 10,
+    },
+]
+
+
+def _index(bundles=BUNDLES):
+    return bundle_expander.BundleIndex({"catalog": CATALOG, "rules": {"bundles": bundles}})
+
+
+def test_expand_aggregates_by_item_and_rule_chain():
+    bom = [{"item_id": "MC", "qty": 2}, {"category": "relay", "qty": 1}, {"item_id": "UNBUNDLED", "qty": 5}]
+    lines, labor = bundle_expander.expand(bom, _index())
+    by_key = {(line["item_id"], tuple(line["chain"])): line for line in lines}
+    assert {key: line["qty"] for key, line in by_key.items()} == {
+        ("FUSE", ("B_MC",)): 2,
+        ("RELAY", ("B_MC",)): 4,
+        ("PBL", ("B_MC", "B_RELAY")): 12,  # 2 magnets x 2 relays x 3 switches
+        ("PBL", ("B_RELAY",)): 3,
+    }
+    assert labor == 2 * (100 + 2 * 10) + 10
+    fuse = by_key[("FUSE", ("B_MC",))]
+    assert (fuse["rule_class"], fuse["trigger_category"], fuse["sources"]) == ("MANDATORY", "magnet", 1)
+    assert fuse["explanations"] == ["B_MC: 2 x FUSE for MC x2", "magnets need fuses and relays"]
+    assert by_key[("PBL", ("B_MC", "B_RELAY"))]["flags"] == ["SS_added"]
+
+
+def test_nested_quantities_multiply_along_the_chain():
+    index = _index(BUNDLES + [{"id": "B_FUSE", "if_item_category": "fuse", "then_add": [{"item_id": "RELAY", "qty_per": 0.5}]}])
+    closure = {(addition.item_id, addition.chain): addition.qty for addition in index.closure("magnet")}
+    assert closure[("RELAY", ("B_MC", "B_FUSE"))] == 0.5
+    assert closure[("PBL", ("B_MC", "B_FUSE", "B_RELAY"))] == 1.5
+    assert closure[("PBL", ("B_MC", "B_RELAY"))] == 6
+
+
+def test_bundle_cycle_is_rejected():
+    cyclic = BUNDLES + [{"id": "B_PBL", "if_item_category": "pbl", "then_add": [{"item_id": "MC"}]}]
+    with pytest.raises(bundle_expander.BundleCycleError, match="magnet -> relay -> pbl -> magnet"):
+        _index(cyclic)
+
+
+def test_expand_bundles_with_shipped_rules(monkeypatch, work_dir):
+    monkeypatch.setattr(evidence, "EVIDENCE_STORE", evidence.STORE_FILES)
+    monkeypatch.setattr(evidence, "SINK", artifact_sink.ArtifactSink(mode=artifact_sink.MODE_SYNC))
+    rules_path = guard.KIS_ROOT / "Rules" / "ai_estimation_core.json"
+
+    report = bundle_expander.expand_bundles([{"item_id": "MAG_MC_9_22", "qty": 2}], case_id=work_dir.name, rules_path=rules_path)
+    payload = report["payload"]
+    assert {line["item_id"]: line["qty"] for line in payload["auxiliary_lines"]} == {
+        "FUSE_HOLDER": 2,
+        "TERMINAL_BLOCK_600V": 6,
+        "DUCT_PVC_40": 4,
+        "CABLE_WIRE": 4,
+    }
+    assert (payload["labor_add_won"], payload["rules_applied"]) == (40000, ["BND_MAGNET_BASE"])
+    assert any(path.endswith(".parquet") for path in report["evidence"])
+
+
+def test_estimate_pipeline_runs_bundle_expansion(work_dir):
+    gateway = pytest.importorskip("KIS.Tools.gateway.fastmcp_gateway", exc_type=ImportError)
+    case = guard.KIS_ROOT / "tests" / "regression" / "cases_01.json"
+    payload = {
+        **json.loads(case.read_text(encoding="utf-8-sig")),
+        "case_id": work_dir.name,
+        "accessories": [{"item_id": "MAG_MC_9_22", "qty": 2}, {"category": "timer_24h", "qty": 1}],
+    }
+    stages = []
+    response = gateway._run_pipeline(gateway.EstimateRequestModel(**payload), lambda stage, ms, metric: stages.append(stage))
+    assert evidence.flush(timeout=30) == []
+    assert stages.index("bundle_expander") == stages.index("breaker_placer") + 1
+    assert "bundle_expander" in [entry["stage"] for entry in response["evidence"]]
+    assert {line["item_id"] for line in response["bundles"]["auxiliary_lines"]} >= {"FUSE_HOLDER", "PBL_ONOFF"}
+    assert response["bundles"]["labor_add_won"] == 40000
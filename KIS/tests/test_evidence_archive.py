@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from KIS.Engine.kis_estimator_core.util import evidence_archive, evidence_retention
+from KIS.scripts import build_release_rc2
+
+STAMP = "20250101T000000000000"
+
+
+def test_read_after_a_rewrite_by_another_process(work_dir):
+    reader = evidence_archive.EvidenceArchive(work_dir)
+    writer = evidence_archive.EvidenceArchive(work_dir)  # a second process's handle on the same case
+    writer.append("drop.json", "enclosure", STAMP, b"x" * 64)
+    writer.append("keep.json", "enclosure", STAMP, b"kept payload")
+    assert reader.lookup("keep.json")["offset"] > 64  # the reader now caches the old offset
+
+    assert writer.rewrite(lambda entry: entry["name"] == "keep.json") > 0
+    assert reader.read("keep.json") == b"kept payload"
+
+
+def test_read_missing_artifact(work_dir):
+    archive = evidence_archive.EvidenceArchive(work_dir)
+    with pytest.raises(FileNotFoundError):
+        archive.read("absent.json")  # no archive file yet
+    archive.append("present.json", "enclosure", STAMP, b"{}")
+    with pytest.raises(FileNotFoundError):
+        archive.read("absent.json")
+
+
+def test_release_hold_goes_through_retention(work_dir, monkeypatch):
+    monkeypatch.setattr(build_release_rc2, "EVIDENCE_DIR", work_dir / "output" / "evidence")
+    hold_path = build_release_rc2.hold_released_evidence()
+    assert hold_path == evidence_retention.WORK_ROOT / work_dir.name / evidence_retention.HOLD_NAME
+    hold = json.loads(hold_path.read_text(encoding="utf-8"))
+    assert (hold["case_id"], hold["reason"]) == (work_dir.name, f"released {build_release_rc2.VERSION}")
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from KIS.Engine.kis_estimator_core.stubs import evidence
+from KIS.Engine.kis_estimator_core.util import artifact_sink, blob_store
+
+
+@pytest.mark.parametrize("mode", [artifact_sink.MODE_SYNC, artifact_sink.MODE_ASYNC])
+@pytest.mark.parametrize("store", [evidence.STORE_FILES, evidence.STORE_ARCHIVE, evidence.STORE_CAS])
+def test_write_stage_persists_on_every_store(monkeypatch, work_dir, store, mode):
+    case_id = work_dir.name
+    monkeypatch.setattr(evidence, "EVIDENCE_STORE", store)
+    monkeypatch.setattr(evidence, "SINK", artifact_sink.ArtifactSink(mode=mode))
+    monkeypatch.setattr(blob_store, "_DEFAULT", blob_store.BlobStore(work_dir / "evidence_store"))
+
+    paths = evidence.write_stage(
+        "enclosure",
+        {"width_mm": 600},
+        case_id=case_id,
+        inputs={"request": {"panels": 2}},
+        tables={"slots": pl.DataFrame({"slot": [1, 2]})},
+    )
+    assert evidence.flush(timeout=10) == []
+
+    json_path, request_path, table_path = (path for path in paths if not path.endswith((".svg", ".png")))
+    assert evidence.read_artifact(json_path) == b'{"width_mm":600}'
+    assert evidence.read_artifact(request_path) == b'{"panels":2}'
+    assert pl.read_parquet(evidence.read_artifact(table_path))["slot"].to_list() == [1, 2]
+    if store != evidence.STORE_FILES:
+        assert {entry["name"] for entry in evidence.list_artifacts(case_id)} >= {p.rsplit("/", 1)[-1] for p in (json_path, table_path)}
+
+
+def test_default_store_and_mode_write_every_path_before_returning(work_dir):
+    assert evidence.EVIDENCE_STORE == evidence.STORE_FILES
+    assert evidence.SINK.mode == artifact_sink.MODE_SYNC
+
+    paths = evidence.write_stage("cover", {"total": 3}, case_id=work_dir.name)
+
+    assert [path.rsplit(".", 1)[-1] for path in paths] == ["json", "svg", "png"]
+    for path in paths:
+        assert Path(path).read_bytes() == evidence.read_artifact(path)
@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import time
+import types
+
+import pytest
+
+from KIS.Engine.kis_estimator_core.util import file_digest, hashing
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    file_digest.clear_cache()
+    yield
+    file_digest.clear_cache()
+
+
+def _rewrite_keeping_mtime(path, payload):
+    stat = path.stat()
+    path.write_bytes(payload)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert path.stat().st_mtime_ns == stat.st_mtime_ns and path.stat().st_size == stat.st_size
+
+
+def test_rewrite_within_the_same_mtime_tick_is_rehashed(tmp_path):
+    path = tmp_path / "artifact.json"
+    path.write_bytes(b"first")
+    assert file_digest.sha256_path(path) == hashlib.sha256(b"first").hexdigest()
+    _rewrite_keeping_mtime(path, b"secnd")
+    assert file_digest.sha256_path(path) == hashlib.sha256(b"secnd").hexdigest()
+    assert file_digest.cache_info()["entries"] == 0  # too fresh to trust its mtime
+
+
+def test_quiet_file_is_cached_until_its_ctime_moves(tmp_path, monkeypatch):
+    path = tmp_path / "artifact.json"
+    path.write_bytes(b"first")
+    later = time.time() + 10 * file_digest.RACY_SECONDS
+    monkeypatch.setattr(file_digest.time, "time", lambda: later)
+    assert file_digest.sha256_path(path) == hashlib.sha256(b"first").hexdigest()
+    assert file_digest.cache_info()["entries"] == 1
+    with monkeypatch.context() as patched:
+        patched.setattr(file_digest, "_digest_handle", lambda *_: pytest.fail("cached digest not reused"))
+        assert file_digest.sha256_path(path) == hashlib.sha256(b"first").hexdigest()
+    # Restoring the mtime after a rewrite still changes ctime, so the stale digest is not served
+    time.sleep(0.01)
+    _rewrite_keeping_mtime(path, b"secnd")
+    assert file_digest.sha256_path(path) == hashlib.sha256(b"secnd").hexdigest()
+
+
+def test_core_and_orchestrator_use_the_shared_digest(tmp_path):
+    from mcp.kis_orchestrator.utils import hashing as orchestrator_hashing
+
+    path = tmp_path / "artifact.json"
+    path.write_bytes(b"x" * (file_digest.MMAP_THRESHOLD + 1))
+    expected = hashlib.sha256(path.read_bytes()).hexdigest()
+    assert hashing._hash_path is file_digest.sha256_path
+    assert orchestrator_hashing.sha256(path) == expected
+    assert orchestrator_hashing._file_digest.__file__ == file_digest.__file__
+
+
+def test_orchestrator_index_skips_files_in_the_racy_window(tmp_path, monkeypatch):
+    from mcp.kis_orchestrator.utils import hashing as orchestrator_hashing
+
+    path = tmp_path / "artifact.json"
+    path.write_bytes(b"first")
+    sha_file = tmp_path / "SHA256SUMS"
+    index_path = tmp_path / "SHA256SUMS.index.json"
+
+    orchestrator_hashing.update_sha_file(sha_file, [path])
+    assert json.loads(index_path.read_text(encoding="utf-8")) == {}  # too fresh to trust by stat
+
+    later = time.time() + file_digest.RACY_SECONDS + 1
+    monkeypatch.setattr(orchestrator_hashing, "time", types.SimpleNamespace(time=lambda: later))
+    orchestrator_hashing.update_sha_file(sha_file, [path])
+    assert set(json.loads(index_path.read_text(encoding="utf-8"))) == {"artifact.json"}
+
+    time.sleep(0.01)
+    _rewrite_keeping_mtime(path, b"secnd")  # same size and mtime; ctime moves
+    orchestrator_hashing.update_sha_file(sha_file, [path])
+    assert sha_file.read_text(encoding="utf-8") == f"{hashlib.sha256(b'secnd').hexdigest()}  artifact.json\n"
@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+gateway = pytest.importorskip("KIS.Tools.gateway.fastmcp_gateway", exc_type=ImportError)
+
+from KIS.Engine.kis_estimator_core.util import guard  # noqa: E402
+
+
+def _request(case_id):
+    case = guard.KIS_ROOT / "tests" / "regression" / "cases_01.json"
+    return gateway.EstimateRequestModel(**{**json.loads(case.read_text(encoding="utf-8-sig")), "case_id": case_id})
+
+
+def test_cases_sharing_a_case_id_get_their_own():
+    requests = gateway._batch_requests([_request("shared"), _request("solo"), _request("shared")])
+    assert [request.case_id for request in requests] == ["shared-0000", "solo", "shared-0002"]
+
+
+def test_batch_warms_shared_tables_before_fan_out(monkeypatch, work_dir):
+    warmed = []
+    monkeypatch.setattr(gateway.pricing, "warm_pricing", lambda: warmed.append("pricing"))
+    monkeypatch.setattr(gateway.bundle_expander, "load_index", lambda: warmed.append("bundles"))
+    monkeypatch.setattr(gateway, "_run_batch_case", lambda index, request: {"ok": True, "ms": 0.0, "case_id": request.case_id})
+    batch = gateway.BatchEstimateRequestModel(requests=[_request(work_dir.name)] * 2, max_workers=1)
+
+    body = gateway.estimate_batch(batch)
+
+    assert warmed == ["pricing", "bundles"]
+    assert body["aggregate"]["catalog_rows"] > 0
+    assert [item["case_id"] for item in body["results"]] == [f"{work_dir.name}-0000", f"{work_dir.name}-0001"]
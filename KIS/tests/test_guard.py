@@ -0,0 +1,54 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from KIS.Engine.kis_estimator_core.util import guard
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlink support")
+
+
+@pytest.fixture
+def outside():
+    path = Path(tempfile.mkdtemp(prefix="kis_guard_outside_"))
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def test_directory_swapped_for_symlink_is_denied_after_a_cached_allow(work_dir, outside):
+    sub = work_dir / "evil_case" / "sub"
+    sub.mkdir(parents=True)
+    target = sub / "x.json"
+    guard.ensure_whitelisted(target)
+
+    shutil.rmtree(sub)
+    sub.symlink_to(outside, target_is_directory=True)
+
+    with pytest.raises(PermissionError):
+        guard.ensure_whitelisted_uncached(target)
+    with pytest.raises(PermissionError):
+        guard.ensure_whitelisted(target)
+
+
+def test_symlink_retargeted_outside_is_denied(work_dir, outside):
+    inside = work_dir / "real"
+    inside.mkdir()
+    link = work_dir / "link"
+    link.symlink_to(inside, target_is_directory=True)
+    guard.ensure_whitelisted(link / "x.json")
+
+    link.unlink()
+    link.symlink_to(outside, target_is_directory=True)
+
+    with pytest.raises(PermissionError):
+        guard.ensure_whitelisted(link / "x.json")
+
+
+def test_repeated_checks_hit_the_directory_cache(work_dir):
+    guard.clear_cache()
+    for index in range(5):
+        guard.ensure_whitelisted(work_dir / f"stage_{index}.json")
+    info = guard._directory_decision.cache_info()
+    assert (info.misses, info.hits) == (1, 4)
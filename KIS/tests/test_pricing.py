@@ -0,0 +1,39 @@
+import polars as pl
+import pytest
+
+from KIS.Engine.kis_estimator_core.stubs import pricing
+
+LOADS = pl.DataFrame({
+    "id": ["L1", "L2", "L3"],
+    "heat_w": [120.0, 130.0, 110.0],
+    "width_unit": [0.4, 0.4, 1.5],
+    "bundle": [None, "B1", None],
+})
+
+
+def test_totals_match_the_cost_tables():
+    breakdown, totals, policy = pricing.price_request({}, LOADS)
+
+    # materials: the formatter's old heat_w*4200 + width_unit*90000, now from cost_tables/material
+    assert totals["materials"] == 360 * 4200 + 2.3 * 90000
+    # coating bands 0.2-0.5 (12000) twice and 1.0-2.0 (18000) once
+    assert breakdown["coating"].to_list() == [12000.0, 12000.0, 18000.0]
+    assert totals == {
+        "materials": 1719000.0,
+        "coating": 42000.0,
+        "labor": 79000.0,  # panel_base 35000 + wiring 3 x 12000 + bundle_apply 8000
+        "overhead": 9480.0,
+        "margin": 147958.4,  # margin_floor 0.08
+        "subtotal": 1997438.4,
+        "vat": 199743.84,
+        "grand_total": 2197182.24,
+    }
+    assert policy["tables"] == {"material": "BASE_V1", "labor": "BASE_V1", "coating": "BASE_V1", "policy": "2025.01"}
+
+
+def test_requested_margin_is_clamped_to_the_policy_band():
+    engine = pricing.warm_pricing()
+    assert engine is pricing.engine()
+    assert engine.margin_rate(0.5) == 0.22
+    assert engine.margin_rate(0.01) == 0.08
+    assert pricing.price_request({"margin_rate": 0.15}, LOADS)[1]["margin"] == pytest.approx(1849480 * 0.15)
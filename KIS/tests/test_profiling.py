@@ -0,0 +1,52 @@
+import json
+import threading
+
+from KIS.Engine.kis_estimator_core.util import profiling
+
+
+def _profiler(trace_path):
+    profiler = profiling.Profiler()
+    profiler.enable(trace_path)
+    return profiler
+
+
+def _run_stage(profiler, name):
+    with profiler.stage(name):
+        pass
+
+
+def test_stage_in_another_thread_keeps_the_running_peak(work_dir):
+    profiler = _profiler(work_dir / "trace.json")
+    try:
+        with profiler.stage("outer"):
+            buffer = bytearray(8 << 20)
+            del buffer
+            worker = threading.Thread(target=_run_stage, args=(profiler, "other"))
+            worker.start()
+            worker.join()
+        events = {event["name"]: event["args"] for event in profiler._events}
+    finally:
+        profiler.disable()
+    assert events["outer"]["tracemalloc_peak_kb"] >= 8 * 1024
+    assert events["other"]["tracemalloc_peak_kb"] < 8 * 1024
+
+
+def test_concurrent_flushes_keep_every_event(work_dir):
+    trace_path = work_dir / "trace.json"
+    profilers = [_profiler(trace_path) for _ in range(8)]
+
+    def record_and_flush(index, profiler):
+        for round_ in range(10):
+            with profiler.stage(f"stage-{index}-{round_}"):
+                pass
+            profiler.flush()
+
+    threads = [threading.Thread(target=record_and_flush, args=pair) for pair in enumerate(profilers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for profiler in profilers:
+        profiler.disable()
+    names = [event["name"] for event in json.loads(trace_path.read_text(encoding="utf-8"))["traceEvents"]]
+    assert sorted(names) == sorted(f"stage-{index}-{round_}" for index in range(8) for round_ in range(10))
@@ -0,0 +1,22 @@
+import pytest
+import yaml
+
+from KIS.Engine.kis_estimator_core.util import guard, rules_snapshot
+
+
+def test_yaml_sources_are_read_with_safe_load():
+    snapshot = rules_snapshot.compile_rules()
+    for name, relative in rules_snapshot.SOURCES.items():
+        if relative.endswith(".yaml"):
+            text = (rules_snapshot.RULES_DIR / relative).read_text(encoding="utf-8-sig")
+            assert snapshot["rules"][name] == yaml.safe_load(text), name
+    assert snapshot["rules"]["policy_tax_margin"]["policies"]["tax_rate_default"] == 0.1
+
+
+def test_guard_admits_only_the_snapshot_pickle(work_dir):
+    guard.ensure_whitelisted(rules_snapshot.SNAPSHOT_PATH)
+    guard.ensure_whitelisted_uncached(rules_snapshot.SNAPSHOT_PATH)
+    with pytest.raises(PermissionError):
+        guard.ensure_whitelisted(work_dir / "other.pkl")
+    with pytest.raises(PermissionError):
+        guard.ensure_whitelisted(rules_snapshot.SNAPSHOT_PATH.with_name("rules_snapshot_copy.pkl"))
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from KIS.Engine.kis_estimator_core.stubs import evidence  # noqa: E402
+from KIS.Engine.kis_estimator_core.util import io  # noqa: E402
+from KIS.scripts import run_regression  # noqa: E402
+
+STAGES = {"enclosure_solver", "breaker_placer", "estimate_formatter", "cover_tab_writer", "doc_lint_guard"}
+
+
+def _cases(work_dir, count=2):
+    """Copy the first regression cases, each with its own case directory inside ``work_dir``."""
+    paths = []
+    for source in sorted((run_regression.ROOT / "tests" / "regression").glob("cases_*.json"))[:count]:
+        payload = json.loads(source.read_text(encoding="utf-8-sig"))
+        payload["case_id"] = f"{work_dir.name}/{source.stem}"
+        path = work_dir / source.name
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_batch_mode_records_stage_timings(work_dir):
+    collected = run_regression.run_batch(_cases(work_dir), max_workers=2)
+    assert evidence.flush(timeout=30) == []
+    for item in collected:
+        assert set(item["stages"]) == STAGES
+        assert all(ms > 0 for ms in item["stages"].values())
+    assert set(run_regression._stage_summary(collected)) == STAGES
+
+
+def test_baseline_from_another_mode_is_refused(work_dir, monkeypatch):
+    baseline = work_dir / "latency_baseline.json"
+    io.write_json(baseline, {"mode": "sequential", "workers": 1, "latency": {"p50_ms": 1.0}, "stages": {}})
+    monkeypatch.setattr(run_regression, "run_batch", lambda *args: pytest.fail("cases ran against a mismatched baseline"))
+    with pytest.raises(RuntimeError, match="recorded in sequential mode, not batch"):
+        run_regression.main(["--batch", "--baseline", str(baseline)])
+    assert run_regression._load_baseline(baseline, "sequential")["mode"] == "sequential"
+
+
+def test_gate_fails_without_a_baseline(work_dir, monkeypatch):
+    missing = work_dir / "latency_baseline.json"
+    monkeypatch.setattr(run_regression, "run_case", lambda *args: pytest.fail("cases ran without a latency baseline"))
+    with pytest.raises(RuntimeError, match="No latency baseline at .*--update-baseline in sequential mode"):
+        run_regression.main(["--gate", "--baseline", str(missing)])
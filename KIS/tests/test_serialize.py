@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from KIS.Engine.kis_estimator_core.util import serialize
+
+PAYLOAD = {"zeta": [1, 2.5, None], "alpha": {"한글": True, "b": "x"}, "big": 2**70}
+
+
+def _backend(name):
+    try:
+        return serialize._BACKENDS[name]()
+    except ImportError:
+        pytest.skip(f"{name} is not installed")
+
+
+@pytest.mark.parametrize("name", sorted(serialize._BACKENDS))
+def test_backends_agree_with_stdlib(name):
+    dumps = _backend(name)
+    for pretty in (False, True):
+        for sort_keys in (False, True):
+            encoded = dumps(PAYLOAD, pretty, sort_keys)
+            assert json.loads(encoded) == PAYLOAD
+            if pretty:
+                assert encoded == serialize._stdlib_dumps(PAYLOAD, pretty, sort_keys)
+
+
+def test_pretty_key_order():
+    assert list(json.loads(serialize.dumps(PAYLOAD, pretty=True))) == ["alpha", "big", "zeta"]
+    unsorted = serialize.dumps(PAYLOAD, pretty=True, sort_keys=False)
+    assert list(json.loads(unsorted)) == ["zeta", "alpha", "big"]
+    assert unsorted.startswith(b'{\n  "zeta": [')
+
+
+def test_orchestrator_shares_the_serializer():
+    from mcp.kis_orchestrator.utils import fs
+
+    assert fs.dumps_json(PAYLOAD) == serialize.dumps(PAYLOAD)
+    assert fs.dumps_json(PAYLOAD, pretty=True) == serialize.dumps(PAYLOAD, pretty=True, sort_keys=False)
+    assert fs.serialize.__file__ == serialize.__file__
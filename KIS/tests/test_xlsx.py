@@ -0,0 +1,108 @@
+import zipfile
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from KIS.Engine.kis_estimator_core.util import xlsx
+
+MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG = "http://schemas.openxmlformats.org/package/2006/relationships"
+TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+SML = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+
+STYLES = f"""<styleSheet xmlns="{MAIN}">
+<numFmts count="3"><numFmt numFmtId="164" formatCode="hh:mm"/><numFmt numFmtId="165" formatCode="&quot;Day&quot; 0"/>\
+<numFmt numFmtId="166" formatCode="[h]:mm"/></numFmts>
+<cellStyleXfs count="1"><xf numFmtId="0"/></cellStyleXfs>
+<cellXfs count="5"><xf numFmtId="0"/><xf numFmtId="14"/><xf numFmtId="164"/><xf numFmtId="165"/><xf numFmtId="166"/></cellXfs>
+</styleSheet>"""
+
+SHARED = f"""<sst xmlns="{MAIN}" count="2" uniqueCount="2">
+<si><t>Panel</t></si>
+<si><r><t>分電</t></r><r><t>盤</t></r><rPh sb="0" eb="2"><t>ブンデン</t></rPh></si>
+</sst>"""
+
+SHEET = f"""<worksheet xmlns="{MAIN}"><sheetData>
+<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c><c r="C1" t="inlineStr"><is><r><t>in</t></r><r><t>line</t></r></is></c></row>
+<row r="2"><c r="A2" s="1"><v>45000</v></c><c r="B2" s="2"><v>0.5</v></c><c r="C2" s="3"><v>7</v></c><c r="D2" s="4"><v>1.5</v></c></row>
+<row r="3"><c r="A3" s="1"><v>59</v></c><c r="B3" s="1"><v>61</v></c><c r="C3"><v>2.5</v></c></row>
+<row r="4"><c r="A4" t="b"><v>1</v></c><c r="B4" t="str"><v>=x</v></c><c r="C4" t="e"><v>#N/A</v></c><c r="D4"/></row>
+</sheetData></worksheet>"""
+
+
+def _workbook(path, date1904=False):
+    workbook_pr = '<workbookPr date1904="1"/>' if date1904 else "<workbookPr/>"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(
+            "[Content_Types].xml",
+            f'<Types xmlns="{TYPES}"><Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            f'<Override PartName="/xl/workbook.xml" ContentType="{SML}.sheet.main+xml"/>'
+            f'<Override PartName="/xl/worksheets/sheet1.xml" ContentType="{SML}.worksheet+xml"/>'
+            f'<Override PartName="/xl/styles.xml" ContentType="{SML}.styles+xml"/>'
+            f'<Override PartName="/xl/sharedStrings.xml" ContentType="{SML}.sharedStrings+xml"/></Types>',
+        )
+        archive.writestr(
+            "_rels/.rels",
+            f'<Relationships xmlns="{PKG}"><Relationship Id="rId1" Type="{REL}/officeDocument" Target="xl/workbook.xml"/></Relationships>',
+        )
+        archive.writestr(
+            "xl/workbook.xml",
+            f'<workbook xmlns="{MAIN}" xmlns:r="{REL}">{workbook_pr}<sheets><sheet name="Data" sheetId="1" r:id="rId1"/></sheets>'
+            "<definedNames><definedName name=\"Panel.Name\">'Data'!$A$1:$C$1</definedName>"
+            '<definedName name="Local" localSheetId="0">Data!$A$2</definedName></definedNames></workbook>',
+        )
+        archive.writestr(
+            "xl/_rels/workbook.xml.rels",
+            f'<Relationships xmlns="{PKG}"><Relationship Id="rId1" Type="{REL}/worksheet" Target="worksheets/sheet1.xml"/></Relationships>',
+        )
+        archive.writestr("xl/styles.xml", STYLES)
+        archive.writestr("xl/sharedStrings.xml", SHARED)
+        archive.writestr("xl/worksheets/sheet1.xml", SHEET)
+    return path
+
+
+def _read(path, refs):
+    with xlsx.XlsxReader(path) as reader:
+        values = reader.read_cells(("Data", ref) for ref in refs)
+    return [values[("Data", ref)] for ref in refs]
+
+
+def test_strings_shared_phonetic_and_inline(tmp_path):
+    assert _read(_workbook(tmp_path / "book.xlsx"), ["A1", "B1", "C1"]) == ["Panel", "分電盤", "inline"]
+
+
+def test_typed_values(tmp_path):
+    book = _workbook(tmp_path / "book.xlsx")
+    assert _read(book, ["C2", "C3", "A4", "B4", "C4", "D4", "Z9"]) == [7, 2.5, True, "=x", "#N/A", None, None]
+
+
+def test_dates_in_the_1900_system(tmp_path):
+    a2, b2, d2, a3, b3 = _read(_workbook(tmp_path / "book.xlsx"), ["A2", "B2", "D2", "A3", "B3"])
+    assert a2 == datetime(2023, 3, 15)
+    assert b2 == time(12, 0)
+    assert d2 == timedelta(days=1.5)
+    assert (a3, b3) == (datetime(1900, 2, 28), datetime(1900, 3, 1))  # serial 60 is Excel's phantom 1900-02-29
+
+
+def test_dates_in_the_1904_system(tmp_path):
+    book = _workbook(tmp_path / "book.xlsx", date1904=True)
+    with xlsx.XlsxReader(book) as reader:
+        assert reader.date1904
+    assert _read(book, ["A2", "A3"]) == [datetime(1904, 1, 1) + timedelta(days=45000), datetime(1904, 2, 29)]
+
+
+def test_named_ranges_skip_sheet_scoped_names(tmp_path):
+    values = xlsx.named_range_values(_workbook(tmp_path / "book.xlsx"))
+    assert values == {"Panel.Name": {"destinations": [["Data", "$A$1:$C$1"]], "values": ["Panel", "分電盤", "inline"]}}
+
+
+def test_matches_openpyxl(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    for date1904 in (False, True):
+        book = _workbook(tmp_path / f"book_{date1904}.xlsx", date1904)
+        workbook = openpyxl.load_workbook(book, read_only=True)
+        refs = ["A1", "C1", "A2", "B2", "C2", "D2", "A3", "B3", "C3", "A4"]
+        expected = [workbook["Data"][ref].value for ref in refs]
+        workbook.close()
+        assert _read(book, refs) == expected
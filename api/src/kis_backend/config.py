@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
 from pydantic import field_validator
@@ -22,6 +23,7 @@ class AppSettings(BaseSettings):
     allowed_origins: str = "http://localhost:3000"
     log_level: str = "INFO"
     tz: str = "UTC"
+    breaker_catalog_path: str = str(Path(__file__).resolve().parents[3] / "KIS" / "Rules" / "breaker_models.json")
 
     @field_validator("database_url", mode="before")
     @classmethod
@@ -27,7 +27,9 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup() -> None:
     from .core.database import init_db
+    from .services.breaker_catalog import init_breaker_catalog
     await init_db()
+    init_breaker_catalog()
 
 
 @app.get("/v1/health")
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import bisect
+import json
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from ..config import get_settings
+from ..core.logging import get_logger
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class BreakerModel:
+    model: str
+    brand: str
+    category: str
+    series: str
+    poles: int
+    frame_af: int
+    capacity_ka: float
+    ampere: int
+    price: float
+    compact: bool
+
+
+@dataclass(frozen=True)
+class BreakerQuery:
+    poles: int
+    ampere: int
+    min_ka: float = 0.0
+    category: Optional[str] = None
+    brand: Optional[str] = None
+
+
+class _Bucket:
+    """Models sharing one composite key, sorted by kA with the cheapest model at or above each position."""
+
+    def __init__(self, models: list[BreakerModel]) -> None:
+        models.sort(key=lambda item: (item.capacity_ka, item.price, item.model))
+        self.ka = [item.capacity_ka for item in models]
+        self.cheapest: list[BreakerModel] = models[:]
+        for index in range(len(models) - 2, -1, -1):
+            if self.cheapest[index + 1].price < self.cheapest[index].price:
+                self.cheapest[index] = self.cheapest[index + 1]
+
+    def at_least(self, min_ka: float) -> Optional[BreakerModel]:
+        index = bisect.bisect_left(self.ka, min_ka)
+        return self.cheapest[index] if index < len(self.cheapest) else None
+
+
+def parse_rating(value: str | int | float | None) -> Optional[int]:
+    """Read "200A", "4P" or 200 as an integer rating."""
+    if value is None:
+        return None
+    match = _NUMBER.search(str(value))
+    return int(float(match.group())) if match else None
+
+
+def _price_tiers(price: Any, amperes: list[int]) -> list[float]:
+    """One price per ampere; a shorter price list splits the sorted ampere list into equal ordered tiers."""
+    prices = [float(item) for item in price] if isinstance(price, list) else [float(price)]
+    if not prices:
+        return []
+    tier = -(-len(amperes) // len(prices))
+    return [prices[min(index // tier, len(prices) - 1)] for index in range(len(amperes))]
+
+
+class BreakerCatalog:
+    """Breaker models indexed by (category, brand, poles, ampere) and (category, frame_AF).
+
+    Category and brand are also indexed as wildcards, so every query is one
+    dict lookup plus a bisect on breaking capacity.
+    """
+
+    def __init__(self, entries: Iterable[dict[str, Any]]) -> None:
+        self.models: list[BreakerModel] = []
+        for entry in entries:
+            amperes = sorted(entry["ampere"] if isinstance(entry["ampere"], list) else [entry["ampere"]])
+            capacity = entry.get("capacity_kA", 0.0)
+            price = entry.get("price", 0)
+            if isinstance(capacity, list) and isinstance(price, list) and len(price) == len(capacity):
+                # one price per breaking-capacity variant
+                variants = [(float(ka), [float(amount)] * len(amperes)) for ka, amount in zip(capacity, price)]
+            else:
+                kas = capacity if isinstance(capacity, list) else [capacity]
+                variants = [(float(ka), _price_tiers(price, amperes)) for ka in kas]
+            for capacity_ka, prices in variants:
+                for ampere, amount in zip(amperes, prices):
+                    self.models.append(
+                        BreakerModel(
+                            model=entry["model"],
+                            brand=entry.get("brand", ""),
+                            category=entry.get("category", ""),
+                            series=entry.get("series", ""),
+                            poles=int(entry["poles"]),
+                            frame_af=int(entry.get("frame_AF", ampere)),
+                            capacity_ka=capacity_ka,
+                            ampere=int(ampere),
+                            price=amount,
+                            compact=bool(entry.get("compact", False)),
+                        )
+                    )
+        grouped: dict[tuple, list[BreakerModel]] = {}
+        frames: dict[tuple[str, int], dict[str, BreakerModel]] = {}
+        ratings: dict[tuple, set[int]] = {}
+        for item in self.models:
+            for category in (item.category, None):
+                for brand in (item.brand, None):
+                    grouped.setdefault((category, brand, item.poles, item.ampere), []).append(item)
+                    ratings.setdefault((category, brand, item.poles), set()).add(item.ampere)
+            cheapest = frames.setdefault((item.category, item.frame_af), {})
+            if item.model not in cheapest or item.price < cheapest[item.model].price:
+                cheapest[item.model] = item
+        self._buckets = {key: _Bucket(models) for key, models in grouped.items()}
+        self._ratings = {key: sorted(values) for key, values in ratings.items()}
+        self._frames = {key: sorted(models.values(), key=lambda item: (item.price, item.model)) for key, models in frames.items()}
+
+    @classmethod
+    def from_path(cls, path: Path) -> "BreakerCatalog":
+        with Path(path).open("r", encoding="utf-8-sig") as fp:
+            return cls(json.load(fp))
+
+    def cheapest(self, query: BreakerQuery) -> Optional[BreakerModel]:
+        """Cheapest model with the exact poles, at least ``min_ka``, at the smallest rating >= ``ampere``."""
+        ratings = self._ratings.get((query.category, query.brand, query.poles), [])
+        for rating in ratings[bisect.bisect_left(ratings, query.ampere):]:
+            found = self._buckets[(query.category, query.brand, query.poles, rating)].at_least(query.min_ka)
+            if found is not None:
+                return found
+        return None
+
+    def cheapest_many(self, queries: Iterable[BreakerQuery]) -> list[Optional[BreakerModel]]:
+        """Answer a whole BOM at once; repeated queries are resolved only once."""
+        answers: dict[BreakerQuery, Optional[BreakerModel]] = {}
+        results = []
+        for query in queries:
+            if query not in answers:
+                answers[query] = self.cheapest(query)
+            results.append(answers[query])
+        return results
+
+    def by_frame(self, category: str, frame_af: int) -> list[BreakerModel]:
+        """Models of one category and frame, cheapest first."""
+        return list(self._frames.get((category, frame_af), []))
+
+
+_CATALOG_LOCK = threading.Lock()
+_CATALOG: Optional[BreakerCatalog] = None
+_LOADED = False
+
+
+def load_breaker_catalog(path: Optional[str | Path] = None) -> Optional[BreakerCatalog]:
+    """Read the configured catalog; None, with a warning, when the file is missing or malformed."""
+    path = Path(path or get_settings().breaker_catalog_path)
+    try:
+        return BreakerCatalog.from_path(path)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning("breaker catalog %s unavailable, pricing breakers from flat rates: %s", path, exc)
+        return None
+
+
+def init_breaker_catalog(path: Optional[str | Path] = None) -> Optional[BreakerCatalog]:
+    """Load the shared catalog; called once at startup, so requests never touch the file."""
+    global _CATALOG, _LOADED
+    catalog = load_breaker_catalog(path)
+    with _CATALOG_LOCK:
+        _CATALOG, _LOADED = catalog, True
+    return catalog
+
+
+def get_breaker_catalog() -> Optional[BreakerCatalog]:
+    """Shared catalog from startup (loaded on first use otherwise); None when unavailable."""
+    global _CATALOG, _LOADED
+    with _CATALOG_LOCK:
+        if not _LOADED:
+            _CATALOG, _LOADED = load_breaker_catalog(), True
+        return _CATALOG
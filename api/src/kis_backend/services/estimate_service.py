@@ -3,6 +3,7 @@ from __future__ import annotations
 import random
 import time
 import uuid
+from dataclasses import replace
 from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,6 +13,7 @@ from ..repositories.estimate_repository import EstimateRepository
 from ..repositories.quote_repository import QuoteRepository
 from ..utils.time import utc_now
 from ..schemas import EstimateItem, EstimateRequest, EstimateResponse, QuoteSnapshot, ValidationIssue, ValidationResponse
+from .breaker_catalog import BreakerModel, BreakerQuery, get_breaker_catalog, parse_rating
 
 
 ENCLOSURE_BASE = {
@@ -38,6 +40,37 @@ ACCESSORY_UNIT_COST = 125000
 TAX_RATE = 0.1
 
 
+def _breaker_query(breaker_type: str, poles: str, capacity: str, brand: Optional[str] = None) -> Optional[BreakerQuery]:
+    pole_count, ampere = parse_rating(poles), parse_rating(capacity)
+    if pole_count is None or ampere is None:
+        return None
+    return BreakerQuery(poles=pole_count, ampere=ampere, category=breaker_type or None, brand=brand or None)
+
+
+def _select_breakers(queries: list[Optional[BreakerQuery]]) -> list[Optional[BreakerModel]]:
+    """Catalog models for a BOM in one batch; a brand with no match falls back to any brand.
+
+    Without a catalog every entry is None and callers use the flat rates.
+    """
+    catalog = get_breaker_catalog()
+    results: list[Optional[BreakerModel]] = [None] * len(queries)
+    if catalog is None:
+        return results
+    present = [i for i, query in enumerate(queries) if query is not None]
+    for i, model in zip(present, catalog.cheapest_many(queries[i] for i in present)):
+        results[i] = model
+    retry = [i for i in present if results[i] is None and queries[i].brand]
+    for i, model in zip(retry, catalog.cheapest_many(replace(queries[i], brand=None) for i in retry)):
+        results[i] = model
+    return results
+
+
+def _breaker_metadata(model: Optional[BreakerModel]) -> dict:
+    if model is None:
+        return {}
+    return {"model": model.model, "series": model.series, "frameAF": model.frame_af, "capacityKA": model.capacity_ka}
+
+
 class EstimateService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -74,8 +107,13 @@ class EstimateService:
             )
         )
 
-        breaker_capacity = snapshot.mainBreakerInfo.capacity or "200A"
-        main_breaker_price = MAIN_BREAKER_BASE.get(breaker_capacity, 450000)
+        main_info = snapshot.mainBreakerInfo
+        breaker_capacity = main_info.capacity or "200A"
+        main_model, *branch_models = _select_breakers(
+            [_breaker_query(main_info.type, main_info.poles, breaker_capacity, main_info.brand)]
+            + [_breaker_query(branch.type, branch.poles, branch.capacity) for branch in snapshot.branchBreakers]
+        )
+        main_breaker_price = main_model.price if main_model else MAIN_BREAKER_BASE.get(breaker_capacity, 450000)
         subtotal += main_breaker_price
         items.append(
             EstimateItem(
@@ -85,12 +123,12 @@ class EstimateService:
                 unitPrice=main_breaker_price,
                 lineTotal=main_breaker_price,
                 category="main_breaker",
-                metadata={"brand": snapshot.mainBreakerInfo.brand},
+                metadata={"brand": main_model.brand if main_model else main_info.brand, **_breaker_metadata(main_model)},
             )
         )
 
-        for branch in snapshot.branchBreakers:
-            unit_price = BRANCH_UNIT_COST
+        for branch, branch_model in zip(snapshot.branchBreakers, branch_models):
+            unit_price = branch_model.price if branch_model else BRANCH_UNIT_COST
             line_total = unit_price * branch.quantity
             subtotal += line_total
             items.append(
@@ -101,6 +139,7 @@ class EstimateService:
                     unitPrice=unit_price,
                     lineTotal=line_total,
                     category="branch_breaker",
+                    metadata={"brand": branch_model.brand, **_breaker_metadata(branch_model)} if branch_model else {},
                 )
             )
 
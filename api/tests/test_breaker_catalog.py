@@ -0,0 +1,33 @@
+from kis_backend.services.breaker_catalog import BreakerCatalog, BreakerQuery, parse_rating
+
+
+MODELS = [
+    {"model": "A-203", "brand": "Sangdo", "category": "MCCB", "poles": 3, "frame_AF": 200, "capacity_kA": 25.0, "price": 42000, "ampere": [150, 200]},
+    {"model": "B-203", "brand": "LS", "category": "MCCB", "poles": 3, "frame_AF": 200, "capacity_kA": [37.0, 50.0], "price": [128700, 132000], "ampere": [200, 250]},
+    {"model": "C-204", "brand": "Sangdo", "category": "MCCB", "poles": 4, "frame_AF": 200, "capacity_kA": 25.0, "price": [53000, 78000], "ampere": [125, 150, 175, 200]},
+    {"model": "E-203", "brand": "Sangdo", "category": "ELB", "poles": 3, "frame_AF": 60, "capacity_kA": 14.0, "price": 56650, "ampere": 60},
+]
+
+
+def test_cheapest_meets_poles_amps_and_breaking_capacity():
+    catalog = BreakerCatalog(MODELS)
+    assert catalog.cheapest(BreakerQuery(poles=3, ampere=200)).model == "A-203"
+    assert catalog.cheapest(BreakerQuery(poles=3, ampere=200, min_ka=40)).price == 132000
+    assert catalog.cheapest(BreakerQuery(poles=3, ampere=210)).model == "B-203"
+    assert catalog.cheapest(BreakerQuery(poles=3, ampere=50, category="ELB")).ampere == 60
+    assert catalog.cheapest(BreakerQuery(poles=3, ampere=200, brand="LS")).model == "B-203"
+    assert catalog.cheapest(BreakerQuery(poles=2, ampere=20)) is None
+
+
+def test_price_list_is_split_into_ampere_tiers():
+    catalog = BreakerCatalog(MODELS)
+    assert catalog.cheapest(BreakerQuery(poles=4, ampere=150)).price == 53000
+    assert catalog.cheapest(BreakerQuery(poles=4, ampere=175)).price == 78000
+
+
+def test_batch_queries_and_frame_index():
+    catalog = BreakerCatalog(MODELS)
+    queries = [BreakerQuery(poles=3, ampere=200), BreakerQuery(poles=2, ampere=20), BreakerQuery(poles=3, ampere=200)]
+    assert [model.model if model else None for model in catalog.cheapest_many(queries)] == ["A-203", None, "A-203"]
+    assert [model.model for model in catalog.by_frame("MCCB", 200)] == ["A-203", "C-204", "B-203"]
+    assert parse_rating("200A") == 200 and parse_rating("4P") == 4 and parse_rating("") is None
@@ -0,0 +1,71 @@
+import logging
+import uuid
+
+import pytest
+
+from kis_backend.config import get_settings
+from kis_backend.schemas import (
+    BranchBreakerInput,
+    CustomerInfo,
+    EnclosureInfo,
+    EstimateRequest,
+    MainBreakerInfo,
+    QuoteSnapshot,
+)
+from kis_backend.services import breaker_catalog
+from kis_backend.services.estimate_service import BRANCH_UNIT_COST, MAIN_BREAKER_BASE, EstimateService
+
+
+class _Session:
+    async def get(self, model, key):
+        return None
+
+
+class _Estimates:
+    async def save_estimate(self, **kwargs):
+        return kwargs
+
+
+def _request() -> EstimateRequest:
+    return EstimateRequest(
+        quoteId=uuid.uuid4(),
+        snapshot=QuoteSnapshot(
+            customerInfo=CustomerInfo(company="ACME"),
+            enclosureInfo=EnclosureInfo(type="indoor", boxType="standard", material="STEEL 1.6T"),
+            mainBreakerInfo=MainBreakerInfo(type="MCCB", poles="3P", capacity="200A"),
+            branchBreakers=[BranchBreakerInput(type="MCCB", poles="2P", capacity="20A", quantity=2)],
+            accessories=[],
+        ),
+    )
+
+
+async def _generate(catalog_path):
+    breaker_catalog.init_breaker_catalog(catalog_path)
+    service = EstimateService(_Session())
+    service.estimates = _Estimates()
+    saved = await service.generate(_request())
+    return {item.category: item for item in saved["items"]}
+
+
+@pytest.fixture(autouse=True)
+def _restore_catalog(monkeypatch):
+    monkeypatch.setattr(breaker_catalog, "_CATALOG", None)
+    monkeypatch.setattr(breaker_catalog, "_LOADED", False)
+
+
+@pytest.mark.asyncio
+async def test_missing_catalog_falls_back_to_flat_prices(tmp_path, caplog):
+    with caplog.at_level(logging.WARNING):
+        items = await _generate(tmp_path / "missing.json")
+    assert items["main_breaker"].unitPrice == MAIN_BREAKER_BASE["200A"]
+    assert items["branch_breaker"].unitPrice == BRANCH_UNIT_COST
+    assert "breaker catalog" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_main_breaker_is_priced_from_the_catalog():
+    items = await _generate(get_settings().breaker_catalog_path)
+    main = items["main_breaker"]
+    # 200A 3P MCCB: cheapest catalog model instead of the 450000 flat rate
+    assert main.unitPrice == 42000
+    assert main.metadata["model"] == "SBS-203"
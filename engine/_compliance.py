@@ -0,0 +1,118 @@
+"""IEC 61439 / KS compliance lookups over the tables in KIS/Rules/compliance.
+
+Clearance and creepage rows are keyed by rated voltage ("50V" .. "1000V") per
+pollution degree. They are loaded once into sorted arrays; a lookup takes the
+first row rated at or above the requested voltage (bisect), or interpolates
+linearly between the bracketing rows when asked. Results are memoized per
+(voltage, pollution degree), so repeated checks cost one dict lookup.
+KS C IEC 61439-1 adopts the IEC table unchanged; the KS tables add the
+installation clearances around the enclosure. The shipped KIS/Rules tables
+come from the compiled rules snapshot; other rules directories are read
+directly.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from _kis_core import load_util
+
+rules_snapshot = load_util("rules_snapshot")
+
+DEFAULT_RULES_DIR = rules_snapshot.RULES_DIR  # KIS/Rules next to the checkout, whatever the cwd
+
+IEC_TABLES = "compliance/IEC61439_tables.json"
+KS_TABLES = "compliance/KS_tables.json"
+DEFAULT_POLLUTION_DEGREE = 3  # industrial switchgear per IEC 61439-1
+
+@dataclass(frozen=True)
+class Clearance:
+    voltage_v: float
+    pollution_degree: int
+    clearance_mm: float
+    creepage_mm: float
+    rated_row_v: float  # table row used; the upper bracket when interpolating
+    beyond_table: bool = False
+
+def _volts(label: Union[str, float]) -> float:
+    """Volts from a number or a label such as "380V", "380 V" or "0.4kV"."""
+    if not isinstance(label, str):
+        return float(label)
+    text = label.strip().upper()
+    if text.endswith("KV"):
+        return float(text[:-2]) * 1000.0
+    return float(text.rstrip("V"))
+
+class ComplianceTables:
+    """Sorted clearance/creepage arrays per pollution degree plus KS installation clearances."""
+    def __init__(self, iec: Dict, ks: Optional[Dict] = None):
+        self.standard = iec.get("meta", {}).get("standard", "IEC 61439")
+        self._rows: Dict[int, Tuple[List[float], List[float], List[float]]] = {}
+        for key, rows in iec["tables"]["clearance_creepage"].items():
+            if not key.startswith("pollution_degree_"):
+                continue
+            ordered = sorted((_volts(label), row["clearance_mm"], row["creepage_mm"]) for label, row in rows.items())
+            self._rows[int(key.rsplit("_", 1)[1])] = tuple(list(column) for column in zip(*ordered))
+        mounting = ((ks or {}).get("tables", {}).get("installation_requirements", {})).get("mounting", {})
+        self.installation: Dict[str, Dict[str, float]] = {kind: dict(values) for kind, values in mounting.items()}
+        self._memo: Dict[Tuple[float, int, bool], Clearance] = {}
+
+    @classmethod
+    def load(cls, rules_dir: Path) -> "ComplianceTables":
+        if Path(rules_dir).resolve() == rules_snapshot.RULES_DIR.resolve():
+            return cls(rules_snapshot.rules("compliance_iec61439"), rules_snapshot.rules("compliance_ks"))
+        with open(rules_dir / IEC_TABLES, encoding="utf-8-sig") as f:
+            iec = json.load(f)
+        ks_path = rules_dir / KS_TABLES
+        ks = None
+        if ks_path.exists():
+            with open(ks_path, encoding="utf-8-sig") as f:
+                ks = json.load(f)
+        return cls(iec, ks)
+
+    @property
+    def pollution_degrees(self) -> List[int]:
+        return sorted(self._rows)
+
+    def clearance(self, voltage_v: Union[str, float], pollution_degree: int = DEFAULT_POLLUTION_DEGREE, interpolate: bool = False) -> Clearance:
+        """Required clearance/creepage for a rated voltage (number or label like "380V").
+
+        Above the last row (1000 V, the limit of IEC 61439) the last row applies
+        and the result is flagged ``beyond_table``; callers report that.
+        """
+        voltage_v = _volts(voltage_v)
+        key = (voltage_v, int(pollution_degree), interpolate)
+        found = self._memo.get(key)
+        if found is not None:
+            return found
+        if int(pollution_degree) not in self._rows:
+            raise KeyError(f"No clearance table for pollution degree {pollution_degree}; have {self.pollution_degrees}")
+        volts, clearances, creepages = self._rows[int(pollution_degree)]
+        index = bisect.bisect_left(volts, voltage_v)
+        if index >= len(volts):
+            found = Clearance(voltage_v, int(pollution_degree), clearances[-1], creepages[-1], volts[-1], True)
+        elif interpolate and index > 0 and volts[index] != voltage_v:
+            share = (voltage_v - volts[index - 1]) / (volts[index] - volts[index - 1])
+            found = Clearance(
+                voltage_v, int(pollution_degree),
+                round(clearances[index - 1] + share * (clearances[index] - clearances[index - 1]), 3),
+                round(creepages[index - 1] + share * (creepages[index] - creepages[index - 1]), 3),
+                volts[index],
+            )
+        else:
+            found = Clearance(voltage_v, int(pollution_degree), clearances[index], creepages[index], volts[index])
+        self._memo[key] = found
+        return found
+
+_TABLES: Dict[str, ComplianceTables] = {}
+
+def compliance_tables(rules_dir: Path) -> ComplianceTables:
+    """Shared tables per rules directory, parsed on first use."""
+    key = str(Path(rules_dir).resolve())
+    if key not in _TABLES:
+        _TABLES[key] = ComplianceTables.load(Path(rules_dir))
+    return _TABLES[key]
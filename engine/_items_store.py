@@ -0,0 +1,159 @@
+"""Columnar line-item store: stream estimate items to their own file with running totals.
+
+Items are written in row groups of ``CHUNK_ROWS`` so only one chunk of
+column buffers is alive at a time, and the totals later stages need are
+accumulated on the way through instead of by re-reading the items. Stage
+JSON then carries ``ItemTotals`` and a reference to the file, not the items.
+
+Parquet is written with pyarrow (one row group per chunk) or polars; without
+either the store falls back to CSV. KIS_ITEMS_FORMAT=csv forces the fallback.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+ITEMS_FORMAT_ENV = "KIS_ITEMS_FORMAT"
+CHUNK_ROWS = 8192
+ITEM_COLUMNS = ("line", "desc", "qty", "unit", "unit_price", "discount", "tax", "total")
+TEXT_COLUMNS = ("desc", "unit")
+NUMBER_COLUMNS = ("qty", "unit_price", "discount", "tax", "total")
+
+def items_format() -> str:
+    """parquet when pyarrow or polars is installed, else csv; KIS_ITEMS_FORMAT forces csv."""
+    requested = os.environ.get(ITEMS_FORMAT_ENV, "").strip().lower()
+    if requested == "csv" or (pa is None and pl is None):
+        return "csv"
+    return "parquet"
+
+@dataclass
+class ItemTotals:
+    """Running sums over the streamed items; ``subtotal`` is the sum of item totals."""
+    rows: int = 0
+    qty: float = 0
+    discount: float = 0
+    tax: float = 0
+    subtotal: float = 0
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.rows += 1
+        self.qty += row["qty"] or 0
+        self.discount += row["discount"] or 0
+        self.tax += row["tax"] or 0
+        self.subtotal += row["total"] or 0
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _rows(items: Iterable[Dict]) -> Iterator[Dict[str, Any]]:
+    for line, item in enumerate(items, 1):
+        row: Dict[str, Any] = {"line": line}
+        for column in TEXT_COLUMNS:
+            value = item.get(column)
+            row[column] = None if value is None else str(value)
+        for column in NUMBER_COLUMNS:
+            row[column] = _number(item.get(column))
+        yield row
+
+def _chunks(rows: Iterator[Dict[str, Any]], totals: ItemTotals) -> Iterator[Dict[str, List[Any]]]:
+    """Yield column buffers of up to CHUNK_ROWS rows, updating ``totals`` as rows pass."""
+    columns: Dict[str, List[Any]] = {column: [] for column in ITEM_COLUMNS}
+    for row in rows:
+        totals.add(row)
+        for column in ITEM_COLUMNS:
+            columns[column].append(row[column])
+        if len(columns["line"]) >= CHUNK_ROWS:
+            yield columns
+            columns = {column: [] for column in ITEM_COLUMNS}
+    if columns["line"] or not totals.rows:
+        yield columns
+
+def _write_pyarrow(tmp: Path, chunks: Iterator[Dict[str, List[Any]]]) -> None:
+    schema = pa.schema([
+        (column, pa.int64() if column == "line" else pa.string() if column in TEXT_COLUMNS else pa.float64())
+        for column in ITEM_COLUMNS
+    ])
+    with pq.ParquetWriter(tmp, schema) as writer:
+        for columns in chunks:
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+
+def _write_polars(tmp: Path, chunks: Iterator[Dict[str, List[Any]]]) -> None:
+    schema = {column: pl.Int64 if column == "line" else pl.Utf8 if column in TEXT_COLUMNS else pl.Float64 for column in ITEM_COLUMNS}
+    # polars has no incremental parquet writer; compact column frames are kept instead of dicts
+    frames = [pl.DataFrame(columns, schema=schema, strict=False) for columns in chunks]
+    pl.concat(frames, rechunk=False).write_parquet(tmp, row_group_size=CHUNK_ROWS)
+
+def _write_csv(tmp: Path, chunks: Iterator[Dict[str, List[Any]]]) -> None:
+    with tmp.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(ITEM_COLUMNS)
+        for columns in chunks:
+            writer.writerows(zip(*(columns[column] for column in ITEM_COLUMNS)))
+
+def write_items(base: Path, items: Iterable[Dict]) -> Dict[str, Any]:
+    """Stream ``items`` to ``base`` + .parquet/.csv and return the reference with totals.
+
+    The file appears atomically; ``path`` in the reference is the file name,
+    relative to the stage JSON written next to it.
+    """
+    fmt = items_format()
+    path = base.with_suffix(f".{fmt}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    totals = ItemTotals()
+    chunks = _chunks(_rows(items), totals)
+    try:
+        if fmt == "csv":
+            _write_csv(tmp, chunks)
+        elif pa is not None:
+            _write_pyarrow(tmp, chunks)
+        else:
+            _write_polars(tmp, chunks)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return {"path": path.name, "format": fmt, "columns": list(ITEM_COLUMNS), "totals": asdict(totals)}
+
+def iter_items(path: Path) -> Iterator[Dict[str, Any]]:
+    """Read items back chunk by chunk from a file written by ``write_items``."""
+    if path.suffix == ".csv":
+        with path.open(encoding="utf-8", newline="") as handle:
+            for row in csv.DictReader(handle):
+                yield {
+                    column: (int(value) if column == "line" else value if column in TEXT_COLUMNS else _number(value))
+                    if value != "" else None
+                    for column, value in row.items()
+                }
+    elif pq is not None:
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=CHUNK_ROWS):
+            yield from batch.to_pylist()
+    elif pl is not None:
+        frame = pl.scan_parquet(path)
+        rows = frame.select(pl.len()).collect().item()
+        for offset in range(0, rows, CHUNK_ROWS):
+            yield from frame.slice(offset, CHUNK_ROWS).collect().iter_rows(named=True)
+    else:
+        raise RuntimeError(f"Reading {path.name} needs pyarrow or polars")
@@ -0,0 +1,31 @@
+"""Load standalone modules of kis_estimator_core.util from their files.
+
+Engine scripts, the orchestrator and the MCP gateway cannot import the KIS
+package (its __init__ pulls in the solver stack). The util modules loaded
+here only use the standard library, so every tool shares one
+implementation with the estimator core instead of keeping copies. This is
+the only copy of the loader: the other tools add engine/ to sys.path and
+import it from here.
+"""
+import importlib
+import sys
+import types
+from pathlib import Path
+
+UTIL_DIR = Path(__file__).resolve().parents[1] / "KIS" / "Engine" / "kis_estimator_core" / "util"
+PACKAGE = "_kis_core_util"
+
+def _package():
+    # A bare package over UTIL_DIR: relative imports between util modules
+    # (profiling -> guard) resolve without running util/__init__.py.
+    package = sys.modules.get(PACKAGE)
+    if package is None:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [str(UTIL_DIR)]
+        sys.modules[PACKAGE] = package
+    return package
+
+def load_util(name):
+    """Return kis_estimator_core.util.<name>, loaded once from its file."""
+    _package()
+    return importlib.import_module(f"{PACKAGE}.{name}")
@@ -1,82 +1,179 @@
 #!/usr/bin/env python3
 import json, os, argparse, pathlib, time, sys
+import threading
 from pathlib import Path
 from contextlib import contextmanager
 from datetime import datetime
 
+from _kis_core import load_util
+
+serialize = load_util("serialize")
+profiling = load_util("profiling")
+
+PROFILE_ENV = profiling.PROFILE_ENV
+CPROFILE_ENV = profiling.CPROFILE_ENV
+DEFAULT_TRACE_PATH = profiling.DEFAULT_TRACE_PATH
+_TRUTHY = ("1", "true", "yes", "on")
+FSYNC_ENV = "KIS_IO_FSYNC"
+
+FSYNC = os.environ.get(FSYNC_ENV, "").strip().lower() in _TRUTHY
+_BATCH = threading.local()
+
+def dumps(obj, pretty=False) -> bytes:
+    """UTF-8 JSON via the shared serializer; indented output keeps insertion order."""
+    return serialize.dumps(obj, pretty=pretty, sort_keys=False)
+
+loads = serialize.loads
+
+def _trace_target(profile):
+    """Map a --profile value or KIS_PROFILE setting to a trace path (None = off)."""
+    value = str(profile).strip() if profile is not None else ""
+    if not value or value.lower() in ("0", "false", "no", "off"):
+        return None
+    return DEFAULT_TRACE_PATH if value.lower() in _TRUTHY else Path(value)
+
 class MetricsCollector:
-    def __init__(self):
+    """Step timings for .meta/metrics.json; spans go through the core profiler."""
+    def __init__(self, profile=None):
         self.metrics = {"steps": {}, "total_ms": 0, "errors": []}
+        self.trace_path = _trace_target(profile if profile is not None else os.environ.get(PROFILE_ENV))
+        self.profiler = profiling.Profiler()
+        if self.trace_path is not None:
+            cprofile = os.environ.get(CPROFILE_ENV, "").strip().lower() in _TRUTHY
+            self.profiler.enable(self.trace_path, cprofile=cprofile)
     
     @contextmanager
     def timer(self, step_name):
-        start = time.time()
+        cpu_start = time.process_time_ns()
+        start = time.perf_counter_ns()
+        span = {}
         try:
-            yield
-            elapsed_ms = int((time.time() - start) * 1000)
-            self.metrics["steps"][step_name] = {"ms": elapsed_ms, "status": "OK"}
+            with self.profiler.stage(step_name, category="engine") as span:
+                yield
         except Exception as e:
-            elapsed_ms = int((time.time() - start) * 1000)
-            self.metrics["steps"][step_name] = {"ms": elapsed_ms, "status": "FAIL", "error": str(e)}
+            self._record(step_name, start, cpu_start, span, "FAIL", str(e))
             self.metrics["errors"].append({"step": step_name, "error": str(e)})
             raise
+        self._record(step_name, start, cpu_start, span, "OK")
+
+    def _record(self, step_name, start, cpu_start, span, status, error=None):
+        elapsed_ns = time.perf_counter_ns() - start
+        cpu_ns = time.process_time_ns() - cpu_start
+        step = {"ms": round(elapsed_ns / 1e6, 3), "cpu_ms": round(cpu_ns / 1e6, 3), "status": status}
+        if error is not None:
+            step["error"] = error
+        # memory and cProfile figures from the profiler span, when tracing
+        step.update((k, v) for k, v in span.items() if k not in ("status", "wall_ms", "cpu_ms"))
+        self.metrics["steps"][step_name] = step
     
     def save(self, path=".meta/metrics.json"):
-        Path(path).parent.mkdir(parents=True, exist_ok=True)
-        self.metrics["total_ms"] = sum(s.get("ms", 0) for s in self.metrics["steps"].values())
+        self.metrics["total_ms"] = round(sum(s.get("ms", 0) for s in self.metrics["steps"].values()), 3)
         self.metrics["timestamp"] = datetime.now().isoformat()
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self.metrics, f, indent=2, ensure_ascii=False)
+        write_bytes(Path(path), dumps(self.metrics, pretty=True))
+        self.save_trace()
+
+    def save_trace(self):
+        """Merge collected spans into the shared trace file under the profiler's file lock."""
+        return self.profiler.flush()
 
 def ensure_dir(p: Path):
     p.mkdir(parents=True, exist_ok=True)
 
-def write_json(p: Path, obj: dict):
+def _fsync(path: Path, directory=False):
+    if directory and os.name == "nt":  # Windows cannot open a directory for fsync
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+@contextmanager
+def group_commit():
+    """Fsync each directory touched by durable writes once at exit instead of per file."""
+    if getattr(_BATCH, "dirs", None) is not None:
+        yield  # nested: the outermost batch commits
+        return
+    _BATCH.dirs = set()
+    try:
+        yield
+    finally:
+        dirs, _BATCH.dirs = _BATCH.dirs, None
+        for d in sorted(dirs):
+            _fsync(d, directory=True)
+
+def write_bytes(p: Path, data: bytes, fsync=None):
+    """Write to a sibling temp file and rename it over ``p``, so readers never see a partial file.
+
+    With ``fsync`` (default KIS_IO_FSYNC) the data is synced before the rename and the
+    directory after it, or once per ``group_commit`` batch.
+    """
+    durable = FSYNC if fsync is None else fsync
     ensure_dir(p.parent)
-    p.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp = p.with_name(f".{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        if durable:
+            _fsync(tmp)
+        os.replace(tmp, p)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if durable:
+        pending = getattr(_BATCH, "dirs", None)
+        if pending is None:
+            _fsync(p.parent, directory=True)
+        else:
+            pending.add(p.parent)
+
+def write_json(p: Path, obj: dict, pretty=True):
+    """Write JSON, indented unless ``pretty=False``."""
+    write_bytes(p, dumps(obj, pretty=pretty))
 
 def read_json(p: Path) -> dict:
     if p.exists():
-        return json.loads(p.read_text(encoding="utf-8"))
+        return loads(p.read_bytes())
     return {}
 
 def write_text(p: Path, text: str):
-    ensure_dir(p.parent)
-    p.write_text(text, encoding="utf-8")
+    write_bytes(p, text.encode("utf-8"))
 
 def make_evidence(base: Path, data=None, kind="svg"):
     """Generate evidence files with actual data visualization"""
-    if kind == "svg":
-        if data and isinstance(data, dict):
-            # Create data-driven SVG
-            svg_parts = ['<svg xmlns="http://www.w3.org/2000/svg" width="400" height="300">']
-            svg_parts.append('<rect width="100%" height="100%" fill="#f8f9fa"/>')
-            svg_parts.append('<text x="10" y="20" font-size="14" font-weight="bold">Evidence: {}</text>'.format(base.name))
+    with group_commit():  # the visual and its JSON land in one directory fsync
+        if kind == "svg":
+            if data and isinstance(data, dict):
+                # Create data-driven SVG
+                svg_parts = ['<svg xmlns="http://www.w3.org/2000/svg" width="400" height="300">']
+                svg_parts.append('<rect width="100%" height="100%" fill="#f8f9fa"/>')
+                svg_parts.append('<text x="10" y="20" font-size="14" font-weight="bold">Evidence: {}</text>'.format(base.name))
             
-            y_pos = 50
-            for key, value in list(data.items())[:8]:  # Show first 8 items
-                svg_parts.append(f'<text x="20" y="{y_pos}" font-size="12">{key}: {value}</text>')
-                y_pos += 20
+                y_pos = 50
+                for key, value in list(data.items())[:8]:  # Show first 8 items
+                    svg_parts.append(f'<text x="20" y="{y_pos}" font-size="12">{key}: {value}</text>')
+                    y_pos += 20
             
-            svg_parts.append('</svg>')
-            svg = ''.join(svg_parts)
+                svg_parts.append('</svg>')
+                svg = ''.join(svg_parts)
+            else:
+                svg = f'<svg xmlns="http://www.w3.org/2000/svg" width="320" height="160"><rect width="100%" height="100%" fill="#e8f4f8"/><text x="10" y="80" font-size="14">Evidence for {base.name}</text></svg>'
+            write_text(base.with_suffix(".svg"), svg)
         else:
-            svg = f'<svg xmlns="http://www.w3.org/2000/svg" width="320" height="160"><rect width="100%" height="100%" fill="#e8f4f8"/><text x="10" y="80" font-size="14">Evidence for {base.name}</text></svg>'
-        write_text(base.with_suffix(".svg"), svg)
-    else:
-        # PNG placeholder
-        write_text(base.with_suffix(".png"), "")
+            # PNG placeholder
+            write_text(base.with_suffix(".png"), "")
     
-    evidence_data = {"ok": True, "target": base.name, "timestamp": datetime.now().isoformat()}
-    if data:
-        evidence_data["summary"] = data
-    write_json(base.parent / (base.stem + "_evidence.json"), evidence_data)
+        evidence_data = {"ok": True, "target": base.name, "timestamp": datetime.now().isoformat()}
+        if data:
+            evidence_data["summary"] = data
+        write_json(base.parent / (base.stem + "_evidence.json"), evidence_data)
 
 def arg_parser():
     ap = argparse.ArgumentParser()
     ap.add_argument("--work", default="KIS/Work/current")
     ap.add_argument("--templates", default="KIS/Templates")
     ap.add_argument("--rules", default="KIS/Rules")
+    ap.add_argument("--profile", nargs="?", const="1", default=None,
+                    help=f"Write stage spans to a Chrome trace under KIS/Work (default {DEFAULT_TRACE_PATH}; env {PROFILE_ENV})")
     return ap
 
 def log(msg, level="INFO"):
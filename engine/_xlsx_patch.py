@@ -0,0 +1,304 @@
+"""Template-patch xlsx writer: copy the zip and rewrite only the cells, rows and names that change.
+
+Every other part of the template (styles, theme, column widths, untouched
+cells) is copied byte for byte. New text is written as inline strings, the
+same way the shipped templates store theirs, so sharedStrings.xml is never
+rewritten. Line items are generated lazily and streamed into the sheet
+entry, so a 5,000-line estimate never exists as one XML string.
+
+When there are more items than template rows, rows below the items block
+move down together with defined names, merged cells and the sheet
+dimension that point at them; names on the last template item row (such
+as ``BOM.End``) follow the last written item. Formula text is not rewritten; the estimate
+templates carry computed values, not formulas.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import os
+import re
+import zipfile
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape, unescape
+
+from _xlsx_read import XlsxReader, column_index, column_letters, parse_destinations
+
+CellKey = Tuple[str, str]  # (sheet name, "B3")
+
+_ROW = re.compile(r"<row\b([^>]*?)(?:/>|>(.*?)</row>)", re.S)
+_CELL = re.compile(r"<c\b([^>]*?)(?:/>|>(.*?)</c>)", re.S)
+_ATTR_R = re.compile(r'\br="([A-Z]*)(\d+)"')
+_ATTR_S = re.compile(r'\bs="(\d+)"')
+_REF = re.compile(r"(\$?)([A-Z]{1,3})(\$?)(\d+)")
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_SHEET_DATA = re.compile(r"<sheetData\s*/>|<sheetData>(.*)</sheetData>", re.S)
+_DEFINED_NAMES = re.compile(r"<definedNames>.*?</definedNames>|<definedNames\s*/>", re.S)
+_DEFINED_NAME = re.compile(r"<definedName\b([^>]*)>(.*?)</definedName>", re.S)
+_XML_ENTITIES = {"&apos;": "'", "&quot;": '"'}
+
+
+@dataclass
+class ItemsBlock:
+    """Line items streamed into ``sheet`` from ``first_row``.
+
+    Rows ``first_row..last_row`` are the template's item rows; their cell
+    styles are reused, and the ``last_row`` styles also apply to overflow
+    rows. ``columns`` names the column of each value in a row tuple;
+    ``count`` sizes the block up front and caps how many rows are taken.
+    """
+
+    sheet: str
+    first_row: int
+    last_row: int
+    columns: Sequence[str]
+    rows: Iterable[Sequence[Any]]
+    count: int
+
+
+def _cell_xml(ref: str, value: Any, style: Optional[str]) -> str:
+    style_attr = f' s="{style}"' if style else ""
+    if value is None or value == "":
+        return f'<c r="{ref}"{style_attr}/>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{style_attr} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)) and not (isinstance(value, float) and not math.isfinite(value)):
+        return f'<c r="{ref}"{style_attr}><v>{value!r}</v></c>'
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    text = escape(_ILLEGAL_XML.sub("", str(value)))
+    return f'<c r="{ref}"{style_attr} t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _shift_ref(ref: str, after_row: int, shift: int, inclusive: bool = False) -> str:
+    """Move every cell reference in ``ref`` below ``after_row`` (or on it, if ``inclusive``) down by ``shift`` rows."""
+    if not shift:
+        return ref
+
+    def move(match: "re.Match[str]") -> str:
+        row = int(match.group(4))
+        if row > after_row or (inclusive and row == after_row):
+            row += shift
+        return f"{match.group(1)}{match.group(2)}{match.group(3)}{row}"
+
+    return _REF.sub(move, ref)
+
+
+def _split_cells(body: str) -> Dict[int, Tuple[str, Optional[str]]]:
+    """Map column index -> (cell XML, style) for one row's cells."""
+    cells: Dict[int, Tuple[str, Optional[str]]] = {}
+    for match in _CELL.finditer(body or ""):
+        ref = _ATTR_R.search(match.group(1))
+        if ref is None:
+            continue
+        style = _ATTR_S.search(match.group(1))
+        cells[column_index(ref.group(1))] = (match.group(0), style.group(1) if style else None)
+    return cells
+
+
+def _row_xml(row: int, attrs: str, cells: Dict[int, Tuple[str, Optional[str]]]) -> str:
+    attrs = _ATTR_R.sub(f'r="{row}"', attrs) if _ATTR_R.search(attrs) else f' r="{row}"{attrs}'
+    attrs = re.sub(r'\s*\bspans="[^"]*"', "", attrs)  # spans is an optional hint; drop it rather than recompute
+    if not cells:
+        return f"<row{attrs}/>"
+    return f"<row{attrs}>" + "".join(xml for _, (xml, _) in sorted(cells.items())) + "</row>"
+
+
+def _patch_row(row: int, attrs: str, body: str, source_row: int, shift: int, after_row: int, overrides: Dict[int, Any]) -> str:
+    cells = _split_cells(body)
+    if shift and source_row > after_row:
+        cells = {
+            col: (_ATTR_R.sub(lambda m: f'r="{m.group(1)}{row}"', xml, count=1), style)
+            for col, (xml, style) in cells.items()
+        }
+    for col, value in overrides.items():
+        style = cells.get(col, (None, None))[1]
+        cells[col] = (_cell_xml(f"{column_letters(col)}{row}", value, style), style)
+    return _row_xml(row, attrs, cells)
+
+
+def _sheet_chunks(xml: str, overrides: Dict[int, Dict[int, Any]], items: Optional[ItemsBlock]) -> Iterator[str]:
+    """Yield the patched sheet XML in pieces; overrides are keyed by template row."""
+    match = _SHEET_DATA.search(xml)
+    if match is None:
+        yield xml
+        return
+    rows = {int(_ATTR_R.search(m.group(1)).group(2)): (m.group(1), m.group(2) or "") for m in _ROW.finditer(match.group(1) or "")}
+    shift, after_row = 0, 0
+    if items is not None:
+        capacity = items.last_row - items.first_row + 1
+        shift, after_row = max(0, items.count - capacity), items.last_row
+
+    head = xml[: match.start()]
+    if shift:
+        head = re.sub(r'(<dimension ref=")([^"]*)(")', lambda m: m.group(1) + _shift_ref(m.group(2), after_row, shift) + m.group(3), head)
+    yield head + "<sheetData>"
+
+    pending = dict(overrides)
+    for row in sorted(set(rows) | set(pending) | ({items.first_row} if items is not None else set())):
+        if items is not None and row == items.first_row:
+            yield from _item_rows(items, rows, pending)
+        if items is not None and items.first_row <= row <= items.last_row:
+            continue
+        attrs, body = rows.get(row, ("", ""))
+        target = row + shift if row > after_row else row
+        yield _patch_row(target, attrs, body, row, shift, after_row, pending.pop(row, {}))
+
+    yield "</sheetData>"
+    tail = xml[match.end():]
+    if shift:
+        tail = re.sub(r'(<mergeCell ref=")([^"]*)(")', lambda m: m.group(1) + _shift_ref(m.group(2), after_row, shift) + m.group(3), tail)
+    yield tail
+
+
+def _item_rows(items: ItemsBlock, rows: Dict[int, Tuple[str, str]], pending: Dict[int, Dict[int, Any]]) -> Iterator[str]:
+    columns = [column_index(col) for col in items.columns]
+    last_attrs, last_body = rows.get(items.last_row, ("", ""))
+    overflow_styles = {col: style for col, (_, style) in _split_cells(last_body).items()}
+    written = 0
+    for offset, values in enumerate(itertools.islice(items.rows, items.count)):
+        row = items.first_row + offset
+        attrs, body = rows.get(row, (last_attrs, "")) if row <= items.last_row else (last_attrs, "")
+        styles = {col: style for col, (_, style) in _split_cells(body).items()} if row <= items.last_row else overflow_styles
+        cells = {col: (_cell_xml(f"{column_letters(col)}{row}", None, style), style) for col, style in styles.items()}
+        for col, value in zip(columns, values):
+            style = styles.get(col)
+            cells[col] = (_cell_xml(f"{column_letters(col)}{row}", value, style), style)
+        # overrides are in template rows, so overflow rows must not consume the ones below the block
+        for col, value in (pending.pop(row, {}) if row <= items.last_row else {}).items():
+            style = styles.get(col)
+            cells[col] = (_cell_xml(f"{column_letters(col)}{row}", value, style), style)
+        yield _row_xml(row, attrs, cells)
+        written += 1
+    # Unused template item rows keep their styles but lose any sample values
+    for row in range(items.first_row + written, items.last_row + 1):
+        attrs, body = rows.get(row, ("", ""))
+        styles = {col: style for col, (_, style) in _split_cells(body).items()}
+        cells = {col: (_cell_xml(f"{column_letters(col)}{row}", None, style), style) for col, style in styles.items()}
+        for col, value in pending.pop(row, {}).items():
+            cells[col] = (_cell_xml(f"{column_letters(col)}{row}", value, styles.get(col)), styles.get(col))
+        if cells or row in rows:
+            yield _row_xml(row, attrs, cells)
+
+
+def _quote_sheet(sheet: str) -> str:
+    return "'" + sheet.replace("'", "''") + "'"
+
+
+def _absolute(ref: str) -> str:
+    return _REF.sub(lambda m: f"${m.group(2)}${m.group(4)}", ref)
+
+
+def _patch_workbook(xml: str, names: Optional[Dict[str, Tuple[str, str]]], sheet: Optional[str], after_row: int, shift: int) -> str:
+    """Replace the defined names (when given), then move names that point below the items block."""
+    if names is not None:
+        block = "<definedNames>" + "".join(
+            f'<definedName name="{escape(name)}">{escape(f"{_quote_sheet(target)}!{_absolute(ref)}")}</definedName>'
+            for name, (target, ref) in names.items()
+        ) + "</definedNames>" if names else ""
+        if _DEFINED_NAMES.search(xml):
+            xml = _DEFINED_NAMES.sub(block, xml, count=1)
+        else:
+            # CT_Workbook order: definedNames comes right before calcPr and the optional tail elements
+            anchor = next((tag for tag in ("<calcPr", "<oleSize", "<customWorkbookViews", "<pivotCaches") if tag in xml), "</workbook>")
+            xml = xml.replace(anchor, block + anchor, 1)
+    if not shift:
+        return xml
+
+    def move(match: "re.Match[str]") -> str:
+        areas = parse_destinations(unescape(match.group(2).strip(), _XML_ENTITIES))
+        if not areas or "localSheetId" in match.group(1):
+            return match.group(0)
+        text = ",".join(
+            f"{_quote_sheet(area_sheet)}!{_shift_ref(ref, after_row, shift, inclusive=True) if area_sheet == sheet else ref}"
+            for area_sheet, ref in areas
+        )
+        return f"<definedName{match.group(1)}>{escape(text)}</definedName>"
+
+    return _DEFINED_NAME.sub(move, xml)
+
+
+def _force_full_calc(xml: str) -> str:
+    """Make Excel recalculate on open; needed once calcChain.xml is dropped."""
+    if re.search(r'<calcPr\b[^>]*\bfullCalcOnLoad="', xml):
+        return re.sub(r'(<calcPr\b[^>]*\bfullCalcOnLoad=")[^"]*(")', r"\g<1>1\2", xml, count=1)
+    if "<calcPr" in xml:
+        return re.sub(r"<calcPr\b", '<calcPr fullCalcOnLoad="1"', xml, count=1)
+    # CT_Workbook order: calcPr follows definedNames and precedes the optional tail elements
+    tail = ("<oleSize", "<customWorkbookViews", "<pivotCaches", "<smartTagPr", "<smartTagTypes", "<webPublishing",
+            "<fileRecoveryPr", "<webPublishObjects", "<extLst", "</workbook>")
+    anchor = next(tag for tag in tail if tag in xml)
+    return xml.replace(anchor, '<calcPr fullCalcOnLoad="1"/>' + anchor, 1)
+
+
+def patch_xlsx(
+    template: Path,
+    output: Path,
+    cells: Optional[Dict[CellKey, Any]] = None,
+    names: Optional[Dict[str, Tuple[str, str]]] = None,
+    items: Optional[ItemsBlock] = None,
+) -> Dict[str, Any]:
+    """Write ``output`` as a copy of ``template`` with cells, names and line items patched in.
+
+    ``cells`` and ``names`` use template coordinates; when items overflow
+    the template rows, both move down with the rows below the items block.
+    ``names=None`` keeps the template's defined names. Cells on sheets the
+    template lacks are reported in ``skipped``. The output is written to a
+    temp file and renamed into place.
+    """
+    cells = cells or {}
+    by_sheet: Dict[str, Dict[int, Dict[int, Any]]] = {}
+    skipped: List[str] = []
+    shift = 0
+    if items is not None:
+        shift = max(0, items.count - (items.last_row - items.first_row + 1))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    try:
+        with zipfile.ZipFile(template) as source, zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as target:
+            with XlsxReader(template) as reader:
+                sheets = reader.sheet_paths
+            for (sheet, ref), value in cells.items():
+                match = _REF.fullmatch(ref.replace("$", ""))
+                if sheet not in sheets or match is None:
+                    skipped.append(f"{sheet}!{ref}")
+                    continue
+                by_sheet.setdefault(sheet, {}).setdefault(int(match.group(4)), {})[column_index(match.group(2))] = value
+            patched = {sheets[sheet] for sheet in by_sheet}
+            if items is not None and items.sheet in sheets:
+                patched.add(sheets[items.sheet])
+            member_sheet = {member: sheet for sheet, member in sheets.items()}
+            drop_calc_chain = bool(patched) and "xl/calcChain.xml" in source.namelist()
+            for info in source.infolist():
+                name = info.filename
+                if name == "xl/calcChain.xml" and drop_calc_chain:
+                    continue  # stale once values change; Excel rebuilds it on load
+                if name in patched:
+                    sheet = member_sheet[name]
+                    block = items if items is not None and items.sheet == sheet else None
+                    entry = zipfile.ZipInfo(name, date_time=info.date_time)
+                    entry.compress_type = zipfile.ZIP_DEFLATED
+                    with target.open(entry, "w") as handle:
+                        for chunk in _sheet_chunks(source.read(name).decode("utf-8"), by_sheet.get(sheet, {}), block):
+                            handle.write(chunk.encode("utf-8"))
+                elif name == "xl/workbook.xml" and (names is not None or shift or drop_calc_chain):
+                    xml = _patch_workbook(source.read(name).decode("utf-8"), names, items.sheet if items else None,
+                                          items.last_row if items else 0, shift)
+                    if drop_calc_chain:
+                        xml = _force_full_calc(xml)
+                    target.writestr(info, xml.encode("utf-8"))
+                elif drop_calc_chain and name in ("[Content_Types].xml", "xl/_rels/workbook.xml.rels"):
+                    xml = source.read(name).decode("utf-8")
+                    xml = re.sub(r'<(?:Override|Relationship)\b[^>]*calcChain[^>]*/>', "", xml)
+                    target.writestr(info, xml.encode("utf-8"))
+                else:
+                    target.writestr(info, source.read(name))
+        os.replace(tmp, output)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return {"output": str(output), "rows_shifted": shift, "skipped": skipped}
@@ -0,0 +1,14 @@
+"""Engine access to the shared xlsx reader in kis_estimator_core.util.xlsx."""
+from _kis_core import load_util
+
+_xlsx = load_util("xlsx")
+
+XlsxReader = _xlsx.XlsxReader
+column_index = _xlsx.column_index
+column_letters = _xlsx.column_letters
+defined_names = _xlsx.defined_names
+expand = _xlsx.expand
+named_range_values = _xlsx.named_range_values
+parse_destinations = _xlsx.parse_destinations
+
+__all__ = ["XlsxReader", "column_index", "column_letters", "defined_names", "expand", "named_range_values", "parse_destinations"]
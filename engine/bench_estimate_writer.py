@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Benchmark the template-patch estimate writer against an openpyxl round trip.
+
+Writes 50/500/5,000-line estimates (``--sizes``) into a copy of the estimate
+template with both writers and reports wall time and Python peak memory.
+The openpyxl baseline is skipped when openpyxl is not installed.
+"""
+import argparse
+import importlib.util
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from _util_io import write_json, log
+from _xlsx_patch import ItemsBlock, patch_xlsx
+
+HAS_OPENPYXL = importlib.util.find_spec("openpyxl") is not None
+COLUMNS = "ABCDEFGH"
+SHEET = "Estimate"
+FIRST_ROW, LAST_ROW = 11, 49  # Estimate.xlsx: header on BOM.Start row 10, items through BOM.End row 49
+TOTALS = {"Totals.Net": "H52", "Totals.VAT": "H53", "Totals.Total": "H54"}
+
+def _rows(count):
+    return ((i + 1, f"Line item {i + 1}", i % 12 + 1, "EA", 10000 + i, 0, 0, (i % 12 + 1) * (10000 + i)) for i in range(count))
+
+def _patch(template: Path, output: Path, count: int):
+    patch_xlsx(
+        template, output,
+        cells={(SHEET, ref): 1000 * n for n, ref in enumerate(TOTALS.values(), 1)},
+        names={name: (SHEET, ref) for name, ref in TOTALS.items()},
+        items=ItemsBlock(SHEET, FIRST_ROW, LAST_ROW, COLUMNS, _rows(count), count),
+    )
+
+def _openpyxl(template: Path, output: Path, count: int):
+    """The previous approach: load, replace names, set cells one by one, save."""
+    import openpyxl
+    from openpyxl.workbook.defined_name import DefinedName
+
+    wb = openpyxl.load_workbook(template)
+    ws = wb[SHEET]
+    overflow = max(0, count - (LAST_ROW - FIRST_ROW + 1))
+    if overflow:
+        ws.insert_rows(LAST_ROW + 1, overflow)
+    for name in list(wb.defined_names):
+        del wb.defined_names[name]
+    for n, (name, ref) in enumerate(TOTALS.items(), 1):
+        col, row = ref[0], int(ref[1:]) + overflow
+        wb.defined_names[name] = DefinedName(name, attr_text=f"'{SHEET}'!${col}${row}")
+        ws[f"{col}{row}"] = 1000 * n
+    for offset, values in enumerate(_rows(count)):
+        for col, value in zip(COLUMNS, values):
+            ws[f"{col}{FIRST_ROW + offset}"] = value
+    wb.save(output)
+    wb.close()
+
+def _measure(writer, template: Path, output: Path, count: int, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        writer(template, output, count)
+        timings.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    writer(template, output, count)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "best_ms": round(min(timings), 2),
+        "mean_ms": round(sum(timings) / len(timings), 2),
+        "peak_kib": round(peak / 1024, 1),
+        "bytes": output.stat().st_size,
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--template", default="KIS/Templates/Estimate.xlsx")
+    ap.add_argument("--sizes", default="50,500,5000", help="Comma-separated line-item counts")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--label", default="local")
+    ap.add_argument("--out", default="KIS/Work/bench/logs", help="Directory for the JSON report")
+    args = ap.parse_args()
+
+    template = Path(args.template)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    results = []
+    scratch = Path(tempfile.mkdtemp(prefix="bench_estimate_writer_"))
+    try:
+        for count in sizes:
+            row = {"lines": count, "patch": _measure(_patch, template, scratch / f"patch_{count}.xlsx", count, args.repeat)}
+            if HAS_OPENPYXL:
+                row["openpyxl"] = _measure(_openpyxl, template, scratch / f"openpyxl_{count}.xlsx", count, args.repeat)
+                row["speedup"] = round(row["openpyxl"]["best_ms"] / row["patch"]["best_ms"], 1)
+            results.append(row)
+            baseline = f", openpyxl {row['openpyxl']['best_ms']} ms ({row['speedup']}x)" if HAS_OPENPYXL else ""
+            log(f"{count:>6} lines: patch {row['patch']['best_ms']} ms{baseline}")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        "label": args.label,
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "template": str(template),
+        "openpyxl_available": HAS_OPENPYXL,
+        "results": results,
+    }
+    out = Path(args.out) / f"bench_estimate_writer_{args.label}.json"
+    write_json(out, report, pretty=True)
+    log(f"Benchmark results written to {out}")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -192,7 +192,7 @@ def main():
     args = ap.parse_args()
     work = Path(args.work) if hasattr(args, 'work') else Path("KIS/Work/current")
 
-    metrics = MetricsCollector()
+    metrics = MetricsCollector(profile=args.profile)
 
     with metrics.timer("breaker_critic"):
         result = critique_placement(work)
@@ -333,7 +333,7 @@ def main():
     args = ap.parse_args()
     work = Path(args.work) if hasattr(args, 'work') else Path("KIS/Work/current")
 
-    metrics = MetricsCollector()
+    metrics = MetricsCollector(profile=args.profile)
 
     with metrics.timer("breaker_placer"):
         result = optimize_placement(work)
@@ -96,7 +96,7 @@ def main() -> None:
     work = Path(args.work)
     templates = Path(getattr(args, "templates", "."))  # 유지: CLI 시그니처 불변
 
-    metrics = MetricsCollector()
+    metrics = MetricsCollector(profile=args.profile)
     with metrics.timer("cover_tab_writer"):
         payload = _build_cover_payload(work)
         out = work / "cover" / "cover_tab.json"
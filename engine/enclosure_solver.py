@@ -69,7 +69,7 @@ def main():
     work = Path(args.work)
     rules = Path(args.rules if hasattr(args, 'rules') else "KIS/Rules")
     
-    metrics = MetricsCollector()
+    metrics = MetricsCollector(profile=args.profile)
     
     with metrics.timer("enclosure_solver"):
         result = calculate_enclosure(work, rules)
@@ -1,19 +1,18 @@
 #!/usr/bin/env python3
+import importlib.util
 import json
+import os
+import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Callable, Dict, List, Tuple, Optional
 from _util_io import write_json, read_json, make_evidence, log, write_text, arg_parser, MetricsCollector
+from _xlsx_read import column_index, column_letters, defined_names
+from _xlsx_patch import ItemsBlock, patch_xlsx
+from _items_store import write_items
 
-# Try to import openpyxl for Excel manipulation
-try:
-    import openpyxl
-    from openpyxl.workbook.defined_name import DefinedName
-    from openpyxl.utils import quote_sheetname, absolute_coordinate
-    HAS_OPENPYXL = True
-except ImportError:
-    HAS_OPENPYXL = False
-    log("WARNING: openpyxl not available, using fallback formatting", "WARN")
+# Workbooks are written by _xlsx_patch without openpyxl; its availability is still reported
+HAS_OPENPYXL = importlib.util.find_spec("openpyxl") is not None
 
 # Named range specification
 class NamedRangeSpec:
@@ -23,6 +22,7 @@ class NamedRangeSpec:
         self.sheet = data.get("sheet", "Cover")
         self.ref = data.get("ref", "A1")
         self.value = data.get("value", None)
+        self.source = data.get("source") or _RANGE_FIELDS.get(self.name)  # dotted path into estimate data
 
 def _load_named_ranges(templates_dir: Path) -> List[NamedRangeSpec]:
     """Load named range specifications from YAML or fallback."""
@@ -64,64 +64,121 @@ def _load_named_ranges(templates_dir: Path) -> List[NamedRangeSpec]:
 
     return ranges
 
-def _apply_named_ranges_with_openpyxl(
-    workbook_path: Path, range_specs: List[NamedRangeSpec], estimate_data: Dict
-) -> Tuple[int, List[str]]:
-    """Apply named ranges using openpyxl library."""
-    if not HAS_OPENPYXL or not workbook_path.exists():
-        return 0, [spec.name for spec in range_specs]
+# Named ranges filled from estimate fields when NamedRanges.yaml gives no ``source``
+_RANGE_FIELDS = {
+    "Project.Name": "project_name",
+    "Project.Client": "client",
+    "Totals.Net": "subtotal",
+    "Totals.VAT": "vat",
+    "Totals.Total": "total",
+}
+_ITEM_FIELDS = ("desc", "qty", "unit", "unit_price", "discount", "tax", "total")
 
-    failed = []
-    applied = 0
+RACY_SECONDS = 2.0  # a YAML saved this recently may change again within one mtime tick
 
-    try:
-        wb = openpyxl.load_workbook(workbook_path)
-
-        # Remove existing named ranges
-        for named_range in list(wb.defined_names):
-            del wb.defined_names[named_range]
+def _extractor(path: str) -> Callable[[Any], Any]:
+    """Compile ``a.b.0`` into a getter over nested dicts/lists that yields None when a step is missing."""
+    steps = [int(part) if part.isdigit() else part for part in path.split(".")]
 
-        # Add new named ranges
-        for spec in range_specs:
+    def extract(data: Any) -> Any:
+        for step in steps:
             try:
-                # Create fully qualified reference
-                ref = f"{quote_sheetname(spec.sheet)}!{absolute_coordinate(spec.ref)}"
-
-                # Create defined name
-                defined_name = DefinedName(spec.name, attr_text=ref)
-                wb.defined_names.append(defined_name)
-                applied += 1
-
-                # Set cell value if specified
-                if spec.value and spec.sheet in wb.sheetnames:
-                    ws = wb[spec.sheet]
-                    cell = ws[spec.ref]
-
-                    # Map values from estimate_data
-                    if spec.name == "Project.Name":
-                        cell.value = estimate_data.get("project_name", "")
-                    elif spec.name == "Project.Client":
-                        cell.value = estimate_data.get("client", "")
-                    elif spec.name == "Totals.Net":
-                        cell.value = estimate_data.get("subtotal", 0)
-                    elif spec.name == "Totals.VAT":
-                        cell.value = estimate_data.get("vat", 0)
-                    elif spec.name == "Totals.Total":
-                        cell.value = estimate_data.get("total", 0)
-
-            except Exception as e:
-                log(f"Failed to apply range {spec.name}: {e}", "WARN")
-                failed.append(spec.name)
-
-        # Save workbook
-        wb.save(workbook_path)
-        wb.close()
+                data = data[step]
+            except (KeyError, IndexError, TypeError):
+                return None
+        return data
+
+    return extract
+
+class RangeTable:
+    """Named-range specs compiled once: name -> (sheet, ref) and, per sheet, cell -> extractor."""
+    def __init__(self, specs: List[NamedRangeSpec]):
+        self.specs = specs
+        self.names = {spec.name: (spec.sheet, spec.ref) for spec in specs}
+        self.by_sheet: Dict[str, List[Tuple[str, Callable[[Any], Any]]]] = {}
+        for spec in specs:
+            if spec.source:
+                getter = _extractor(spec.source)
+            elif spec.value is not None:
+                getter = lambda _data, value=spec.value: value
+            else:
+                continue
+            self.by_sheet.setdefault(spec.sheet, []).append((spec.ref.replace("$", ""), getter))
+
+    def cells(self, data: Dict) -> Dict[Tuple[str, str], Any]:
+        """Resolve every mapped range against ``data`` in one pass per sheet; None values are skipped."""
+        cells = {}
+        for sheet, getters in self.by_sheet.items():
+            for ref, getter in getters:
+                value = getter(data)
+                if value is not None:
+                    cells[(sheet, ref)] = value
+        return cells
+
+# resolved NamedRanges.yaml path -> ((size, mtime_ns) or None, compiled table)
+_RANGE_TABLES: Dict[str, Tuple[Optional[Tuple[int, int]], RangeTable]] = {}
+_RANGE_TABLES_LOCK = threading.Lock()
+
+def range_table(templates_dir: Path) -> RangeTable:
+    """Return the compiled range table, recompiling only when NamedRanges.yaml changes."""
+    yaml_path = (templates_dir / "NamedRanges.yaml").resolve()
+    try:
+        stat = os.stat(yaml_path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+    except FileNotFoundError:
+        stat, signature = None, None
+    key = str(yaml_path)
+    with _RANGE_TABLES_LOCK:
+        cached = _RANGE_TABLES.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    table = RangeTable(_load_named_ranges(templates_dir))
+    if stat is None or time.time() - stat.st_mtime > RACY_SECONDS:
+        with _RANGE_TABLES_LOCK:
+            _RANGE_TABLES[key] = (signature, table)
+    return table
+
+def _cell(ref: str) -> Tuple[str, int]:
+    col = "".join(ch for ch in ref if ch.isalpha())
+    return col, int(ref[len(col):].replace("$", "") or 0)
+
+def _items_block(range_specs: List[NamedRangeSpec], items: List[Dict]) -> Optional[ItemsBlock]:
+    """Stream items below the BOM.Start header row, over the BOM.Start..BOM.End columns."""
+    specs = {spec.name: spec for spec in range_specs}
+    start, end = specs.get("BOM.Start"), specs.get("BOM.End")
+    if not start or not end or start.sheet != end.sheet:
+        return None
+    (first_col, header_row), (last_col, last_row) = _cell(start.ref.replace("$", "")), _cell(end.ref.replace("$", ""))
+    columns = [column_letters(i) for i in range(column_index(first_col), column_index(last_col) + 1)]
+    rows = ((idx, *(item.get(field) for field in _ITEM_FIELDS)) for idx, item in enumerate(items, 1))
+    return ItemsBlock(start.sheet, header_row + 1, last_row, columns, rows, len(items))
+
+def _write_estimate_workbook(
+    template_path: Path, output_path: Path, table: RangeTable, estimate_data: Dict
+) -> Tuple[int, List[str]]:
+    """Patch a copy of the template with named ranges, mapped values and streamed line items.
+
+    The template itself is never modified. Applied names are counted by reading
+    the written workbook back, so a name that did not land is reported as failed.
+    """
+    range_specs = table.specs
+    if not template_path.exists():
+        return 0, [spec.name for spec in range_specs]
 
+    try:
+        report = patch_xlsx(
+            template_path, output_path, cells=table.cells(estimate_data), names=table.names,
+            items=_items_block(range_specs, estimate_data.get("items", [])),
+        )
+        for ref in report["skipped"]:
+            log(f"Template has no sheet for {ref}; value not written", "WARN")
+        written = defined_names(output_path)
     except Exception as e:
         log(f"Workbook operation failed: {e}", "ERROR")
         return 0, [spec.name for spec in range_specs]
 
-    return applied, failed
+    failed = [spec.name for spec in range_specs if not written.get(spec.name)]
+    return len(range_specs) - len(failed), failed
 
 def _map_ranges(range_specs: List[NamedRangeSpec], workbook_state: Dict) -> Tuple[int, List[str]]:
     """Fallback named range mapping without openpyxl."""
@@ -195,13 +252,14 @@ def format_estimate(work_dir, templates_dir=None) -> dict:
         }
 
     # Load named range specifications
-    range_specs = _load_named_ranges(templates_path)
+    table = range_table(templates_path)
+    range_specs = table.specs
 
-    # Try to apply to actual Excel file if exists
+    # Write a patched copy of the Excel template if it exists
     excel_file = templates_path / "EstimateTemplate.xlsx"
-    if excel_file.exists() and HAS_OPENPYXL:
-        applied_count, failed_ranges = _apply_named_ranges_with_openpyxl(
-            excel_file, range_specs, estimate_data
+    if excel_file.exists():
+        applied_count, failed_ranges = _write_estimate_workbook(
+            excel_file, work_path / "format" / "estimate.xlsx", table, estimate_data
         )
     else:
         # Fallback simulation
@@ -223,8 +281,12 @@ def format_estimate(work_dir, templates_dir=None) -> dict:
     errors = []
     warnings = []
 
+    # Stream line items to a columnar file; totals are accumulated on the way through
+    items_ref = write_items(work_path / "format" / "estimate_items", estimate_data.get("items", []))
+    header = {key: value for key, value in estimate_data.items() if key != "items"}
+
     # Check totals calculation
-    calculated_total = sum(item.get("total", 0) for item in estimate_data.get("items", []))
+    calculated_total = items_ref["totals"]["subtotal"]
     if abs(calculated_total - estimate_data.get("subtotal", 0)) > 1:
         errors.append(f"Subtotal mismatch: calculated {calculated_total} vs stated {estimate_data.get('subtotal')}")
 
@@ -247,7 +309,8 @@ def format_estimate(work_dir, templates_dir=None) -> dict:
 
     result = {
         "ts": int(time.time()),
-        "estimate_data": estimate_data,
+        "estimate_data": header,
+        "items": items_ref,
         "named_ranges": {
             "total": ranges_total,
             "applied": ranges_injected,
@@ -328,7 +391,7 @@ def main():
     work = Path(args.work) if hasattr(args, 'work') else Path("KIS/Work/current")
     templates = Path(args.templates) if hasattr(args, 'templates') else Path("KIS/Templates")
 
-    metrics = MetricsCollector()
+    metrics = MetricsCollector(profile=args.profile)
 
     with metrics.timer("estimate_formatter"):
         result = format_estimate(work, templates)
@@ -3,12 +3,14 @@ import json
 import time
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
-from _util_io import ensure_dir, write_json, write_text, make_evidence, log, arg_parser
+from _util_io import ensure_dir, write_json, write_text, make_evidence, log, arg_parser, MetricsCollector
+from _compliance import DEFAULT_POLLUTION_DEGREE, DEFAULT_RULES_DIR, compliance_tables
 
 # Parameterized thresholds
 PANEL_PITCH_MM = 45  # Standard panel rail pitch
 VERTICAL_CLEARANCE_MM = 600  # Min vertical clearance for service
-HORIZONTAL_CLEARANCE_MM = 50  # Min horizontal clearance
+HORIZONTAL_CLEARANCE_MM = 50  # Min mechanical horizontal gap; covers every IEC 61439 clearance up to 1000 V
+DEFAULT_RATED_VOLTAGE_V = 380  # KR low-voltage distribution
 SERVICE_DEPTH_MM = 200  # Service access depth
 PANEL_WIDTH_MM = 600
 PANEL_HEIGHT_MM = 1200
@@ -39,20 +41,22 @@ class BreakerVolume:
                          other.origin.z + other.depth + clearance <= self.origin.z)
         return x_overlap and y_overlap and z_overlap
 
-def _check_clearances(volumes: List[BreakerVolume]) -> Tuple[int, List[Dict]]:
-    """Check clearance violations between breaker volumes."""
+def _check_clearances(volumes: List[BreakerVolume], required: Optional[List[float]] = None) -> Tuple[int, List[Dict]]:
+    """Check clearance violations between breaker volumes; a pair needs the larger of its two required gaps."""
     violations = []
     violation_count = 0
+    required = required or [HORIZONTAL_CLEARANCE_MM] * len(volumes)
 
     for i, vol1 in enumerate(volumes):
         for j, vol2 in enumerate(volumes[i+1:], start=i+1):
             # Check horizontal clearance
-            if vol1.intersects(vol2, HORIZONTAL_CLEARANCE_MM):
+            gap = max(required[i], required[j])
+            if vol1.intersects(vol2, gap):
                 violation_count += 1
                 violations.append({
                     "type": "horizontal_clearance",
                     "breakers": [i, j],
-                    "required_mm": HORIZONTAL_CLEARANCE_MM,
+                    "required_mm": gap,
                     "position_1": (vol1.origin.x, vol1.origin.y, vol1.origin.z),
                     "position_2": (vol2.origin.x, vol2.origin.y, vol2.origin.z)
                 })
@@ -115,9 +119,10 @@ def _check_panel_boundaries(volumes: List[BreakerVolume]) -> Tuple[int, List[Dic
 
     return violation_count, violations
 
-def spatial_check(work_dir) -> Dict:
+def spatial_check(work_dir, rules_dir=None) -> Dict:
     """Perform 2.5D spatial validation of breaker placement."""
     work_path = Path(work_dir)
+    tables = compliance_tables(Path(rules_dir) if rules_dir else DEFAULT_RULES_DIR)
 
     # Load placement data
     placement_file = work_path / "placement" / "breaker_placement.json"
@@ -136,9 +141,14 @@ def spatial_check(work_dir) -> Dict:
             ]
         }
 
-    # Convert slots to 3D volumes
+    # Convert slots to 3D volumes, each with the clearance its voltage class requires
+    panel_voltage = placement_data.get("rated_voltage_v", DEFAULT_RATED_VOLTAGE_V)
+    pollution_degree = placement_data.get("pollution_degree", DEFAULT_POLLUTION_DEGREE)
     volumes = []
-    for slot in placement_data.get("slots", []):
+    required = []
+    electrical = {}
+    voltage_details = []
+    for i, slot in enumerate(placement_data.get("slots", [])):
         pos = slot.get("position", {})
         dims = slot.get("dimensions", {"width": 18, "height": 90, "depth": 65})
 
@@ -151,8 +161,22 @@ def spatial_check(work_dir) -> Dict:
         volume = BreakerVolume(origin, dims["width"], dims["height"], dims["depth"])
         volumes.append(volume)
 
+        entry = tables.clearance(slot.get("voltage_v", panel_voltage), pollution_degree)
+        electrical[entry.voltage_v if entry.beyond_table else entry.rated_row_v] = entry
+        required.append(max(HORIZONTAL_CLEARANCE_MM, entry.clearance_mm))
+        if entry.beyond_table:
+            # Above the table the last row's clearance is only a lower bound; not an LV assembly any more
+            voltage_details.append({
+                "type": "voltage_beyond_table",
+                "breaker": i,
+                "breaker_id": slot.get("breaker_id"),
+                "voltage_v": entry.voltage_v,
+                "table_max_v": entry.rated_row_v,
+                "standard": tables.standard
+            })
+
     # Perform checks
-    clearance_violations, clearance_details = _check_clearances(volumes)
+    clearance_violations, clearance_details = _check_clearances(volumes, required)
     service_ok, service_issues = _check_service_access(volumes)
     boundary_violations, boundary_details = _check_panel_boundaries(volumes)
 
@@ -179,6 +203,8 @@ def spatial_check(work_dir) -> Dict:
         "service_issues": service_issues[:3],
         "boundary_violations": boundary_violations,
         "boundary_details": boundary_details[:3],
+        "voltage_violations": len(voltage_details),
+        "voltage_details": voltage_details[:5],
         "collisions": 0,  # Simplified - actual collision is clearance with 0 gap
         "thresholds": {
             "horizontal_clearance_mm": HORIZONTAL_CLEARANCE_MM,
@@ -186,12 +212,21 @@ def spatial_check(work_dir) -> Dict:
             "service_depth_mm": SERVICE_DEPTH_MM,
             "panel_pitch_mm": PANEL_PITCH_MM
         },
+        "compliance": {
+            "standard": tables.standard,
+            "pollution_degree": pollution_degree,
+            "voltage_classes": [
+                {"rated_v": row, "clearance_mm": entry.clearance_mm, "creepage_mm": entry.creepage_mm,
+                 "beyond_table": entry.beyond_table}
+                for row, entry in sorted(electrical.items())
+            ]
+        },
         "uncertainty": {
             "position_accuracy_mm": position_uncertainty_mm,
             "measurement_error_pct": measurement_uncertainty_pct,
             "confidence_level": 0.95
         },
-        "pass": clearance_violations == 0 and boundary_violations == 0,
+        "pass": clearance_violations == 0 and boundary_violations == 0 and not voltage_details,
         "breakers_checked": len(volumes)
     }
 
@@ -217,7 +252,7 @@ def _generate_spatial_svg(result: Dict) -> str:
         if "position_1" in violation:
             x, y, z = violation["position_1"]
             svg_parts.append(
-                f'<rect x="{x-5}" y="{y-5}" width="{HORIZONTAL_CLEARANCE_MM+10}" '
+                f'<rect x="{x-5}" y="{y-5}" width="{violation.get("required_mm", HORIZONTAL_CLEARANCE_MM)+10}" '
                 f'height="100" fill="red" opacity="0.2" stroke="red" stroke-width="2"/>'
             )
 
@@ -241,6 +276,10 @@ def _generate_spatial_svg(result: Dict) -> str:
         f'<text x="10" y="{y_pos}" font-size="12">Boundary Violations: {result["boundary_violations"]}</text>'
     )
     y_pos += 20
+    svg_parts.append(
+        f'<text x="10" y="{y_pos}" font-size="12">Voltage Violations: {result["voltage_violations"]}</text>'
+    )
+    y_pos += 20
     svg_parts.append(
         f'<text x="10" y="{y_pos}" font-size="12">Breakers Checked: {result["breakers_checked"]}</text>'
     )
@@ -254,8 +293,11 @@ def main():
     args = ap.parse_args()
     work = Path(args.work) if hasattr(args, 'work') else Path("KIS/Work/current")
 
+    metrics = MetricsCollector(profile=args.profile)
+
     # Perform spatial analysis
-    result = spatial_check(work)
+    with metrics.timer("spatial_assistant"):
+        result = spatial_check(work, args.rules)
 
     # Save results
     out = work / "spatial" / "spatial_report.json"
@@ -265,6 +307,7 @@ def main():
     evidence_data = {
         "clearance_violations": result["clearance_violations"],
         "boundary_violations": result["boundary_violations"],
+        "voltage_violations": result["voltage_violations"],
         "collisions": result["collisions"],
         "service_access": "OK" if result["service_access_ok"] else "ISSUES",
         "status": "PASS" if result["pass"] else "FAIL"
@@ -282,7 +325,11 @@ def main():
         log(f"OK spatial-assistant (violations=0)")
     else:
         log(f"WARN spatial-assistant: {result['clearance_violations']} clearance violations", "WARN")
+    for detail in result["voltage_details"]:
+        log(f"WARN spatial-assistant: {detail['breaker_id'] or detail['breaker']} rated {detail['voltage_v']:g} V "
+            f"exceeds the {detail['standard']} table ({detail['table_max_v']:g} V)", "WARN")
 
+    metrics.save()
     return 0
 
 if __name__ == "__main__":
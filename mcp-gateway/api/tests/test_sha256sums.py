@@ -0,0 +1,57 @@
+"""
+Test incremental SHA256SUMS maintenance
+"""
+import asyncio
+import hashlib
+import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from api.utils import SHA256SUMS_INDEX, update_sha256sums
+
+
+def _artifact(root, name, text):
+    path = root / "dist" / "test_artifacts" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _listed(root):
+    return sorted(line.split("  ", 1)[1] for line in (root / "SHA256SUMS.txt").read_text(encoding="utf-8").splitlines())
+
+
+def test_missing_index_falls_back_to_full_walk(tmp_path):
+    """Test that a lost index re-lists every artifact instead of only the changed ones"""
+    _artifact(tmp_path, "a.json", "{}")
+    asyncio.run(update_sha256sums(str(tmp_path)))
+    (tmp_path / SHA256SUMS_INDEX).unlink()
+
+    added = _artifact(tmp_path, "b.json", "[]")
+    asyncio.run(update_sha256sums(str(tmp_path), changed=[str(added)]))
+
+    assert _listed(tmp_path) == ["dist/test_artifacts/a.json", "dist/test_artifacts/b.json"]
+
+
+def test_removing_last_artifact_clears_sums(tmp_path):
+    """Test that deleting the last artifact leaves no stale checksum behind"""
+    only = _artifact(tmp_path, "a.json", "{}")
+    asyncio.run(update_sha256sums(str(tmp_path)))
+    assert _listed(tmp_path) == ["dist/test_artifacts/a.json"]
+
+    only.unlink()
+    asyncio.run(update_sha256sums(str(tmp_path)))
+
+    assert not (tmp_path / "SHA256SUMS.txt").exists()
+    assert not (tmp_path / SHA256SUMS_INDEX).exists()
+
+
+def test_file_hash_uses_the_shared_digest(tmp_path):
+    """Test that the gateway hashes through the estimator core's digest cache"""
+    from api import utils
+
+    path = _artifact(tmp_path, "a.json", "{}")
+    assert utils.sha256sum_file_sync(str(path)) == hashlib.sha256(b"{}").hexdigest()
+    assert utils._file_digest.__file__.endswith(os.path.join("kis_estimator_core", "util", "file_digest.py"))
@@ -2,13 +2,28 @@
 MCP Gateway Utilities
 Helper functions for common operations
 """
-import hashlib
+import asyncio
+import json
 import os
+import sys
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+# engine/_kis_core.py loads the standard-library-only kis_estimator_core util
+# modules without importing the KIS package
+ENGINE_DIR = str(Path(__file__).resolve().parents[2] / "engine")
+if ENGINE_DIR not in sys.path:
+    sys.path.append(ENGINE_DIR)
+from _kis_core import load_util  # noqa: E402
+
+SHA256SUMS_INDEX = "SHA256SUMS.index.json"
+
+_file_digest = load_util("file_digest")
+_hash_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="sha256")
+
 def utc_iso() -> str:
     """Get current UTC timestamp in ISO format"""
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -17,14 +32,14 @@ def generate_trace_id() -> str:
     """Generate unique trace ID for request tracking"""
     return f"mcp_{uuid.uuid4().hex[:12]}_{int(datetime.now(timezone.utc).timestamp())}"
 
+def sha256sum_file_sync(filepath: str) -> str:
+    """Blocking SHA256 of a file; digests are reused while its stat signature is unchanged"""
+    return _file_digest.sha256_path(filepath)
+
 async def sha256sum_file(filepath: str) -> str:
-    """Calculate SHA256 hash of a file"""
-    sha256_hash = hashlib.sha256()
+    """Calculate SHA256 hash of a file on the hashing pool, off the event loop"""
     try:
-        with open(filepath, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        return await asyncio.get_running_loop().run_in_executor(_hash_pool, sha256sum_file_sync, filepath)
     except Exception as e:
         return f"error:{str(e)}"
 
@@ -49,30 +64,87 @@ async def write_artifact_local(filename: str, content: str, append: bool = False
         print(f"Error writing artifact: {str(e)}")
         return None
 
-async def update_sha256sums(directory: str = ".") -> None:
-    """Update SHA256SUMS.txt file with all artifact hashes"""
+def _atomic_write_text(path: Path, text: str) -> None:
+    """Replace a file via temp file + rename so readers never see a partial manifest"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+async def update_sha256sums(directory: str = ".", changed: Optional[list] = None) -> None:
+    """Update SHA256SUMS.txt incrementally, re-hashing only new or modified artifacts
+
+    SHA256SUMS.index.json remembers each artifact's digest and (size, mtime, inode).
+    Without ``changed`` the artifacts tree is walked and stat-compared, which also
+    drops deleted files. With ``changed`` (paths just written) only those are checked,
+    so adding one artifact to a large release costs one stat and one hash. A missing
+    or unreadable index falls back to the full walk, so no checksum is ever dropped.
+    """
     try:
-        sha256_file = Path(directory) / "SHA256SUMS.txt"
-        artifacts_dir = Path(directory) / "dist" / "test_artifacts"
+        root = Path(directory)
+        sha256_file = root / "SHA256SUMS.txt"
+        index_file = root / SHA256SUMS_INDEX
+        artifacts_dir = root / "dist" / "test_artifacts"
 
         if not artifacts_dir.exists():
             return
 
-        hashes = []
-
-        # Walk through all artifacts
-        for root, _, files in os.walk(artifacts_dir):
-            for file in files:
-                if file != "SHA256SUMS.txt":
-                    filepath = Path(root) / file
-                    file_hash = await sha256sum_file(str(filepath))
-                    relative_path = filepath.relative_to(Path(directory))
-                    hashes.append(f"{file_hash}  {relative_path.as_posix()}")
-
-        # Write SHA256SUMS.txt
-        if hashes:
-            with open(sha256_file, "w", encoding="utf-8") as f:
-                f.write("\n".join(sorted(hashes)) + "\n")
+        index = None
+        if sha256_file.exists() and index_file.exists():
+            try:
+                index = json.loads(index_file.read_text(encoding="utf-8"))
+            except ValueError:
+                index = None
+        if not isinstance(index, dict):
+            index = {}
+            changed = None  # nothing to build on; re-list every artifact
+
+        if changed is None:
+            candidates = [
+                Path(dirpath) / file
+                for dirpath, _, files in os.walk(artifacts_dir)
+                for file in files
+                if file != "SHA256SUMS.txt"
+            ]
+        else:
+            candidates = [Path(path) for path in changed]
+
+        seen = set()
+        stale = []
+        for filepath in candidates:
+            relative_path = Path(os.path.relpath(filepath, root)).as_posix()
+            try:
+                stat = filepath.stat()
+            except FileNotFoundError:
+                index.pop(relative_path, None)
+                continue
+            seen.add(relative_path)
+            signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+            if index.get(relative_path, {}).get("stat") != signature:
+                stale.append((relative_path, filepath, signature))
+
+        removed = [path for path in index if path not in seen] if changed is None else []
+        for relative_path in removed:
+            del index[relative_path]
+        if not stale and not removed and sha256_file.exists():
+            return
+
+        digests = await asyncio.gather(*(sha256sum_file(str(filepath)) for _, filepath, _ in stale))
+        for (relative_path, _, signature), file_hash in zip(stale, digests):
+            if file_hash.startswith("error:"):
+                index.pop(relative_path, None)
+                continue
+            index[relative_path] = {"sha256": file_hash, "stat": signature}
+
+        # Write SHA256SUMS.txt, then its index; a stale index only costs re-hashing
+        if index:
+            hashes = sorted(f"{entry['sha256']}  {path}" for path, entry in index.items())
+            _atomic_write_text(sha256_file, "\n".join(hashes) + "\n")
+            _atomic_write_text(index_file, json.dumps(index, separators=(",", ":")))
+        else:
+            # the last artifact is gone; leave no stale checksums behind
+            for path in (sha256_file, index_file):
+                if path.exists():
+                    path.unlink()
 
     except Exception as e:
         print(f"Error updating SHA256SUMS: {str(e)}")
@@ -18,7 +18,7 @@ def evaluate(*, job_id: str, artifacts_dir: str | Path) -> dict[str, Any]:
             "checks": {},
         }
         output_path = artifacts_path / f"gate_result_{job_id}.json"
-        write_json(output_path, result)
+        write_json(output_path, result, pretty=False)
         return result
     metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
     checks = {check: bool(metrics.get(check, False)) for check in metrics.get("checks", metrics)}
@@ -30,5 +30,5 @@ def evaluate(*, job_id: str, artifacts_dir: str | Path) -> dict[str, Any]:
         "details": metrics.get("details", {}),
     }
     output_path = artifacts_path / f"gate_result_{job_id}.json"
-    write_json(output_path, result)
+    write_json(output_path, result, pretty=False)
     return result
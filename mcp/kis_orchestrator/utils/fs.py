@@ -1,15 +1,27 @@
 ﻿"""Filesystem helpers for orchestrator."""
 from __future__ import annotations
 
-import json
+import os
+import sys
 from pathlib import Path
 from typing import Any, Iterable
 
 from .timez import utc_iso
 
+# engine/_kis_core.py is the one loader for the standalone kis_estimator_core
+# util modules; the orchestrator cannot import the KIS package itself.
+_ENGINE_DIR = str(Path(__file__).resolve().parents[3] / "engine")
+if _ENGINE_DIR not in sys.path:
+    sys.path.append(_ENGINE_DIR)
+from _kis_core import load_util  # noqa: E402
+
+serialize = load_util("serialize")
+
 __all__ = [
     "ensure_dir",
+    "replace_bytes",
     "write_text",
+    "dumps_json",
     "write_json",
     "append_jsonl",
     "list_files",
@@ -21,22 +33,32 @@ def ensure_dir(path: str | Path) -> Path:
     target.mkdir(parents=True, exist_ok=True)
     return target
 
+def replace_bytes(path: str | Path, data: bytes) -> None:
+    """Write via a sibling temp file and rename, so readers never see a partial file."""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, target)
+
 def write_text(path: str | Path, text: str) -> None:
-    Path(path).parent.mkdir(parents=True, exist_ok=True)
-    Path(path).write_text(text, encoding="utf-8")
+    replace_bytes(path, text.encode("utf-8"))
 
 def touch(path: str | Path) -> None:
     Path(path).parent.mkdir(parents=True, exist_ok=True)
     Path(path).touch()
 
-def write_json(path: str | Path, data: Any) -> None:
-    Path(path).parent.mkdir(parents=True, exist_ok=True)
-    Path(path).write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+def dumps_json(data: Any, pretty: bool = False) -> bytes:
+    """Encode as UTF-8 JSON via the shared serializer; ``pretty`` indents by two spaces."""
+    return serialize.dumps(data, pretty=pretty, sort_keys=False)
+
+def write_json(path: str | Path, data: Any, pretty: bool = True) -> None:
+    replace_bytes(path, dumps_json(data, pretty=pretty) + b"\n")
 
 def append_jsonl(path: str | Path, data: dict[str, Any]) -> None:
     Path(path).parent.mkdir(parents=True, exist_ok=True)
-    with Path(path).open("a", encoding="utf-8") as fp:
-        fp.write(json.dumps(data, ensure_ascii=False) + "\n")
+    with Path(path).open("ab") as fp:
+        fp.write(dumps_json(data) + b"\n")
 
 def list_files(path: str | Path, patterns: Iterable[str] | None = None) -> list[Path]:
     target = Path(path)
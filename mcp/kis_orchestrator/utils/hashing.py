@@ -1,35 +1,83 @@
 ﻿"""Hash utilities."""
 from __future__ import annotations
 
-import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterable
 
-from .fs import ensure_dir
+from .fs import load_util, write_json, write_text
 
-__all__ = ["sha256", "update_sha_file"]
+__all__ = ["sha256", "sha256_many", "update_sha_file"]
+
+INDEX_SUFFIX = ".index.json"
+
+_file_digest = load_util("file_digest")
 
 def sha256(path: str | Path) -> str:
-    digest = hashlib.sha256()
-    with Path(path).open("rb") as fp:
-        for chunk in iter(lambda: fp.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+    """Hash a file, reusing the digest while its stat signature is unchanged."""
+    return _file_digest.sha256_path(path)
+
+def sha256_many(paths: Iterable[str | Path], max_workers: int | None = None) -> list[str]:
+    """Hash files in parallel threads; digests come back in input order."""
+    targets = list(paths)
+    if len(targets) < 2:
+        return [sha256(path) for path in targets]
+    with ThreadPoolExecutor(max_workers=max_workers or min(8, os.cpu_count() or 1)) as pool:
+        return list(pool.map(sha256, targets))
+
+def _stat_signature(path: Path) -> list[int]:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino, stat.st_ctime_ns]
+
+def _settled(signature: list[int], now: float) -> bool:
+    """True once the file has been quiet for RACY_SECONDS before ``now`` (see file_digest)."""
+    return now - max(signature[1], signature[3]) / 1e9 > _file_digest.RACY_SECONDS
 
 def update_sha_file(sha_file: str | Path, files: Iterable[str | Path]) -> None:
-    lines = []
+    """Merge digests for ``files`` into ``sha_file``, re-hashing only new or changed files.
+
+    A sidecar ``<sha_file>.index.json`` remembers each entry's path and stat
+    signature. Entries are keyed by file name, so re-adding a file replaces its
+    line instead of duplicating it; the manifest and index are replaced atomically.
+    Files modified within RACY_SECONDS of the index write are left out of the
+    index, since a later write in the same mtime tick would keep their signature.
+    """
+    sha_path = Path(sha_file)
+    index_path = sha_path.with_name(sha_path.name + INDEX_SUFFIX)
+    index: dict[str, dict] = {}
+    if sha_path.exists() and index_path.exists():
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+        except ValueError:
+            index = {}
+    manifest: dict[str, str] = {}
+    if sha_path.exists():
+        for line in sha_path.read_text(encoding="utf-8").splitlines():
+            digest, _, name = line.partition("  ")
+            if name:
+                manifest[name] = digest
+    stale: list[tuple[Path, list[int]]] = []
     for file in files:
         file_path = Path(file)
         if not file_path.is_file():
             continue
-        digest = sha256(file_path)
-        lines.append(f"{digest}  {file_path.name}")
-    if not lines:
+        signature = _stat_signature(file_path)
+        known = index.get(file_path.name)
+        if known and known["path"] == str(file_path) and known["stat"] == signature and file_path.name in manifest:
+            continue
+        stale.append((file_path, signature))
+    if not stale:
         return
-    sha_path = Path(sha_file)
-    ensure_dir(sha_path.parent)
-    existing = []
-    if sha_path.exists():
-        existing = sha_path.read_text(encoding="utf-8").splitlines()
-    merged = existing + lines
-    sha_path.write_text("\n".join(merged) + "\n", encoding="utf-8")
+    digests = sha256_many(path for path, _ in stale)
+    now = time.time()
+    for (file_path, signature), digest in zip(stale, digests):
+        manifest[file_path.name] = digest
+        if _settled(signature, now) and _stat_signature(file_path) == signature:
+            index[file_path.name] = {"path": str(file_path), "stat": signature, "sha256": digest}
+        else:
+            index.pop(file_path.name, None)  # re-hashed next time instead of trusted by stat
+    write_text(sha_path, "".join(f"{digest}  {name}\n" for name, digest in manifest.items()))
+    write_json(index_path, index, pretty=False)
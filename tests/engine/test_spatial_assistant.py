@@ -0,0 +1,77 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+import spatial_assistant
+from _compliance import compliance_tables
+
+RULES_DIR = Path(__file__).resolve().parents[2] / "KIS" / "Rules"
+
+
+def _check(tmp_path, rated_voltage, slot_voltages):
+    slots = [
+        {"id": index + 1, "breaker_id": f"CB{index + 1:02d}", "position": {"row": 0, "col": index * 4},
+         "dimensions": {"width": 18, "height": 90, "depth": 65}, **({"voltage_v": volts} if volts is not None else {})}
+        for index, volts in enumerate(slot_voltages)
+    ]
+    placement = tmp_path / "placement" / "breaker_placement.json"
+    placement.parent.mkdir(parents=True)
+    placement.write_text(json.dumps({"rated_voltage_v": rated_voltage, "slots": slots}), encoding="utf-8")
+    return spatial_assistant.spatial_check(tmp_path, RULES_DIR)
+
+
+@pytest.mark.parametrize("label", ["380V", "380 v", " 380V ", "0.38kV", 380, 380.0])
+def test_voltage_labels_match_numbers(label):
+    tables = compliance_tables(RULES_DIR)
+    assert tables.clearance(label) == tables.clearance(380)
+
+
+def test_string_voltages_are_checked(tmp_path):
+    result = _check(tmp_path, "380V", [None, "220V"])
+    assert result["pass"]
+    assert result["voltage_violations"] == 0
+    assert [row["rated_v"] for row in result["compliance"]["voltage_classes"]] == [250.0, 500.0]
+
+
+def test_voltage_above_the_table_fails_the_check(tmp_path):
+    result = _check(tmp_path, "380V", [None, "1500V"])
+    assert not result["pass"]
+    assert result["clearance_violations"] == result["boundary_violations"] == 0
+    assert result["voltage_violations"] == 1
+    detail = result["voltage_details"][0]
+    assert (detail["type"], detail["breaker"], detail["breaker_id"]) == ("voltage_beyond_table", 1, "CB02")
+    assert (detail["voltage_v"], detail["table_max_v"]) == (1500.0, 1000.0)
+
+
+def test_shipped_tables_come_from_the_rules_snapshot(tmp_path, monkeypatch):
+    import _compliance
+
+    read = []
+    rules = _compliance.rules_snapshot.rules
+    monkeypatch.setattr(_compliance.rules_snapshot, "rules", lambda name: read.append(name) or rules(name))
+    shipped = _compliance.ComplianceTables.load(RULES_DIR)
+    assert read == ["compliance_iec61439", "compliance_ks"]
+
+    (tmp_path / "compliance").mkdir()
+    for name in (_compliance.IEC_TABLES, _compliance.KS_TABLES):
+        shutil.copy(RULES_DIR / name, tmp_path / name)
+    direct = _compliance.ComplianceTables.load(tmp_path)
+    assert read == ["compliance_iec61439", "compliance_ks"]
+    assert direct.clearance(380) == shipped.clearance(380)
+    assert direct.installation == shipped.installation
+
+
+def test_default_rules_dir_does_not_depend_on_the_cwd(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result = spatial_assistant.spatial_check(tmp_path)
+    assert [row["rated_v"] for row in result["compliance"]["voltage_classes"]] == [500.0]
+
+
+def test_mechanical_gap_covers_every_tabled_clearance():
+    # Below 1000 V the IEC clearance never exceeds the mechanical gap, so it
+    # does not change a result; it only reports the voltage class.
+    tables = compliance_tables(RULES_DIR)
+    for degree in tables.pollution_degrees:
+        assert tables.clearance(1000, degree).clearance_mm < spatial_assistant.HORIZONTAL_CLEARANCE_MM
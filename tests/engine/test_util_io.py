@@ -0,0 +1,52 @@
+import json
+import shutil
+import uuid
+from pathlib import Path
+
+import pytest
+
+import _util_io
+from _kis_core import load_util
+
+
+def test_write_json_is_indented_by_default(tmp_path):
+    target = tmp_path / "stage.json"
+    _util_io.write_json(target, {"b": "한", "a": [1]})
+    assert target.read_text(encoding="utf-8") == '{\n  "b": "한",\n  "a": [\n    1\n  ]\n}'
+    _util_io.write_json(target, {"b": 1, "a": 2}, pretty=False)
+    assert target.read_bytes() == b'{"b":1,"a":2}'
+
+
+def test_uses_the_shared_serializer():
+    serialize = load_util("serialize")
+    assert _util_io.serialize is serialize
+    assert _util_io.dumps({"x": [1]}) == serialize.dumps({"x": [1]})
+    assert json.loads(_util_io.dumps({"x": 2**70}, pretty=True)) == {"x": 2**70}
+
+
+def test_metrics_collector_traces_through_the_core_profiler(tmp_path):
+    trace_dir = Path(_util_io.DEFAULT_TRACE_PATH).parent / f"pytest-{uuid.uuid4().hex[:12]}"
+    trace_path = trace_dir / "trace.json"
+    first = _util_io.MetricsCollector(profile=str(trace_path))
+    second = _util_io.MetricsCollector(profile=str(trace_path))
+    try:
+        assert first.profiler.__class__ is load_util("profiling").Profiler
+        with first.timer("place"):
+            pass
+        with pytest.raises(ValueError):
+            with second.timer("check"):
+                raise ValueError("boom")
+        first.save(tmp_path / "metrics.json")
+        second.save(tmp_path / "metrics2.json")
+
+        step = first.metrics["steps"]["place"]
+        assert step["status"] == "OK"
+        assert step["max_rss_growth_kb"] is None or step["max_rss_growth_kb"] >= 0
+        assert "peak_rss_kb" not in step
+        assert second.metrics["steps"]["check"]["status"] == "FAIL"
+        events = json.loads(trace_path.read_text(encoding="utf-8"))["traceEvents"]
+        assert sorted((event["name"], event["cat"]) for event in events) == [("check", "engine"), ("place", "engine")]
+    finally:
+        first.profiler.disable()
+        second.profiler.disable()
+        shutil.rmtree(trace_dir, ignore_errors=True)
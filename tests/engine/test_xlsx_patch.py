@@ -0,0 +1,119 @@
+import re
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+from _xlsx_patch import ItemsBlock, patch_xlsx
+from _xlsx_read import XlsxReader
+
+TEMPLATE = Path(__file__).resolve().parents[2] / "KIS" / "Templates" / "Estimate.xlsx"
+SHEET = "Estimate"
+FIRST_ROW, LAST_ROW = 11, 49  # BOM.Start header on row 10, BOM.End on row 49
+MERGES = '<mergeCells count="2"><mergeCell ref="A11:B11"/><mergeCell ref="A52:F52"/></mergeCells>'
+CALC_CHAIN = '<calcChain xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><c r="H52" i="1"/></calcChain>'
+
+
+def _template(tmp_path, calc_chain=False):
+    """Estimate.xlsx plus merged cells (and optionally a calcChain without fullCalcOnLoad)."""
+    path = tmp_path / "template.xlsx"
+    with zipfile.ZipFile(TEMPLATE) as source, zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as target:
+        for info in source.infolist():
+            data = source.read(info.filename).decode("utf-8")
+            if info.filename == "xl/worksheets/sheet1.xml":
+                data = data.replace("</sheetData>", "</sheetData>" + MERGES, 1)
+            elif calc_chain and info.filename == "xl/workbook.xml":
+                data = data.replace(' fullCalcOnLoad="1"', "")
+            elif calc_chain and info.filename == "[Content_Types].xml":
+                data = data.replace("</Types>", '<Override PartName="/xl/calcChain.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.calcChain+xml"/></Types>')
+            elif calc_chain and info.filename == "xl/_rels/workbook.xml.rels":
+                data = data.replace("</Relationships>", '<Relationship Id="rId99" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/calcChain" Target="calcChain.xml"/></Relationships>')
+            target.writestr(info, data)
+        if calc_chain:
+            target.writestr("xl/calcChain.xml", CALC_CHAIN)
+    return path
+
+
+def _rows(count):
+    return ((index, f"Line {index}", 2, "EA", 100, 0, 0, 200) for index in range(1, count + 1))
+
+
+def _assert_parses(path):
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        for name in archive.namelist():
+            if name.endswith((".xml", ".rels")):
+                ElementTree.fromstring(archive.read(name))
+    openpyxl = pytest.importorskip("openpyxl")
+    openpyxl.load_workbook(path).close()
+
+
+def _sheet_xml(path):
+    with zipfile.ZipFile(path) as archive:
+        return archive.read("xl/worksheets/sheet1.xml").decode("utf-8")
+
+
+def test_items_within_template_rows(tmp_path):
+    output = tmp_path / "out.xlsx"
+    report = patch_xlsx(
+        _template(tmp_path), output,
+        cells={(SHEET, "H52"): 999, (SHEET, "B7"): "MCCB <Panel> & Co", ("Missing", "A1"): 1},
+        items=ItemsBlock(SHEET, FIRST_ROW, LAST_ROW, "ABCDEFGH", _rows(3), 3),
+    )
+    assert report["rows_shifted"] == 0 and report["skipped"] == ["Missing!A1"]
+    _assert_parses(output)
+
+    with XlsxReader(output) as reader:
+        assert reader.names["Totals.Net"] == [(SHEET, "$H$52")]
+        assert reader.names["BOM.End"] == [(SHEET, "$H$49")]
+        values = reader.read_cells([(SHEET, ref) for ref in ("A11", "B13", "H13", "B14", "E14", "H52", "G52", "B7")])
+    assert values == {
+        (SHEET, "A11"): 1, (SHEET, "B13"): "Line 3", (SHEET, "H13"): 200,
+        (SHEET, "B14"): None, (SHEET, "E14"): None,
+        (SHEET, "H52"): 999, (SHEET, "G52"): "Net:", (SHEET, "B7"): "MCCB <Panel> & Co",
+    }
+    sheet = _sheet_xml(output)
+    assert re.findall(r'<mergeCell ref="([^"]+)"', sheet) == ["A11:B11", "A52:F52"]
+    assert '<dimension ref="A10:H56"/>' in sheet
+
+
+def test_overflow_shifts_rows_names_and_merges(tmp_path):
+    output = tmp_path / "out.xlsx"
+    count = LAST_ROW - FIRST_ROW + 1 + 6
+    report = patch_xlsx(
+        _template(tmp_path), output,
+        cells={(SHEET, "H52"): 999},
+        names={"Totals.Net": (SHEET, "H52"), "BOM.End": (SHEET, "H49"), "Enclosure.Model": (SHEET, "B7")},
+        items=ItemsBlock(SHEET, FIRST_ROW, LAST_ROW, "ABCDEFGH", _rows(count), count),
+    )
+    assert report["rows_shifted"] == 6
+    _assert_parses(output)
+
+    with XlsxReader(output) as reader:
+        assert reader.names == {
+            "Totals.Net": [(SHEET, "$H$58")],
+            "BOM.End": [(SHEET, "$H$55")],
+            "Enclosure.Model": [(SHEET, "$B$7")],
+        }
+        values = reader.read_cells([(SHEET, ref) for ref in ("A55", "B55", "H55", "H58", "G58", "G62", "H62")])
+    assert values == {
+        (SHEET, "A55"): count, (SHEET, "B55"): f"Line {count}", (SHEET, "H55"): 200,
+        (SHEET, "H58"): 999, (SHEET, "G58"): "Net:", (SHEET, "G62"): "Total:", (SHEET, "H62"): 1210000,
+    }
+    sheet = _sheet_xml(output)
+    assert re.findall(r'<mergeCell ref="([^"]+)"', sheet) == ["A11:B11", "A58:F58"]
+    assert '<dimension ref="A10:H62"/>' in sheet
+    rows = [int(row) for row in re.findall(r'<row r="(\d+)"', sheet)]
+    assert rows == sorted(set(rows)) and rows[-1] == 62
+
+
+def test_dropping_calc_chain_forces_recalculation(tmp_path):
+    output = tmp_path / "out.xlsx"
+    patch_xlsx(_template(tmp_path, calc_chain=True), output, cells={(SHEET, "H52"): 1})
+    _assert_parses(output)
+    with zipfile.ZipFile(output) as archive:
+        assert "xl/calcChain.xml" not in archive.namelist()
+        assert 'fullCalcOnLoad="1"' in archive.read("xl/workbook.xml").decode("utf-8")
+        assert b"calcChain" not in archive.read("[Content_Types].xml")
+        assert b"calcChain" not in archive.read("xl/_rels/workbook.xml.rels")